@@ -1,82 +1,87 @@
 import argparse
-import json
-import os
 import platform
 import random
-import time
 import warnings
 from datetime import datetime
-from urllib.request import urlopen
+from functools import partial
 
 import numpy as np
 import pandas as pd
 from tqdm import tqdm
 
-from get_milb_schedule import load_milb_schedule
+from get_milb_schedule import load_milb_schedule, read_schedule_csv
+from milb_cache import (
+    add_cache_arguments,
+    configure_cache_from_args,
+    get_cache,
+    get_or_fetch,
+    print_cache_summary
+)
+from milb_feed import (
+    PBP_PROJECTION,
+    get_game_feed,
+    is_game_settled,
+    set_lean_requests
+)
+from milb_frames import (
+    build_frame,
+    get_cached_frame,
+    get_or_parse,
+    parse_payload,
+    set_reparse
+)
+from milb_http import (
+    MAX_CONCURRENCY,
+    FailureManifest,
+    add_rate_limit_arguments,
+    configure_rate_limits_from_args,
+    fetch_concurrently,
+    get_payload,
+    print_transfer_summary,
+    raise_for_offline_misses,
+    reset_offline_misses
+)
 
 warnings.filterwarnings("ignore", category=FutureWarning)
 
-
-def get_milb_game_pbp(game_id: int, cache_data=False, cache_dir=""):
+# Bump this whenever the output of `_parse_milb_game_pbp()` changes,
+# so cached PBP frames are parsed again.
+PBP_PARSER_VERSION = 2
+PBP_FRAMES_NAMESPACE = "pbp_frames"
+
+# Index of each fielding position in `away_fielders` and `home_fielders`.
+FIELDER_INDEXES = {
+    "P": 0,
+    "C": 1,
+    "1B": 2,
+    "2B": 3,
+    "3B": 4,
+    "SS": 5,
+    "LF": 6,
+    "CF": 7,
+    "RF": 8,
+}
+
+
+def _get_milb_game_pbp_json(game_id: int, cache_data=False, cache_dir=""):
     """
-    Retrieves and parses the play-by-play (PBP) data from a valid
-    MiLB game ID.
-
-    Parameters
-    ----------
-    `game_id`: (int, mandatory):
-        The MiLB game ID you want PBP data from.
-
-    `cache_data`: (bool, optional) = `False`:
-        Optional boolean flag.
-        If set to `True`, data downloaded by this function will be cached to
-        a folder named `./milb/`.
-        This folder will either be located in the user's home directory,
-        or in a existing directory
-        specified by the optional argument `cache_dir`.
-
-    `cache_dir`: (str, optional) = `""`:
-        Optional string. If not set to `""` or `None`,
-        this will be the directory used to cache data
-        if `cache_data` is set to `True`.
-        This directory must exist prior to running this function!
+    Retrieves the raw lineups and `feed/live` JSON data
+    used to build the PBP data for a MiLB game ID.
+    See `get_milb_game_pbp()` for a description of the parameters.
 
     Returns
     ----------
-    A pandas `DataFrame` object containing PBP data from
-    the MiLB game ID.
+    A tuple containing the lineups JSON data
+    (or `None` if the lineups could not be retrieved,
+    or weren't needed since the box score has the starting lineups),
+    and the `feed/live` JSON data for the MiLB game ID.
     """
-    has_lineups = False
-    if cache_data is True \
-            and (cache_dir == "" or cache_dir is None):
-        home_dir = os.path.expanduser("~")
-
-        try:
-            os.mkdir(f"{home_dir}/.milb/")
-        except Exception:
-            pass
-
-        try:
-            os.mkdir(f"{home_dir}/.milb/pbp/")
-            os.mkdir(f"{home_dir}/.milb/lineups/")
-        except Exception:
-            pass
-
-    elif cache_data is True \
-            and (cache_dir != "" or cache_dir is not None):
-        try:
-            os.mkdir(f"{cache_dir}/.milb/")
-        except Exception:
-            pass
+    cache = get_cache(cache_data=cache_data, cache_dir=cache_dir)
+    json_data = get_game_feed(game_id, PBP_PROJECTION, cache=cache)
 
-        try:
-            os.mkdir(f"{cache_dir}/.milb/pbp/")
-            os.mkdir(f"{cache_dir}/.milb/lineups/")
-        except Exception:
-            pass
+    if _get_boxscore_fielders(json_data) is not None:
+        return None, json_data
 
-    game_df = pd.DataFrame()
-    play_df = pd.DataFrame()
     lineups_url = "https://statsapi.mlb.com/api/v1/schedule" +\
         f"?gamePk={game_id}&language=en&hydrate=story,xrefId," +\
         "lineups,broadcasts(all),probablePitcher(note),game(tickets)" + \
@@ -86,276 +91,139 @@ def get_milb_game_pbp(game_id: int, cache_data=False, cache_dir=""):
         "lineups,homePlayers,awayPlayers,useName,lastName," +\
         "primaryPosition,abbreviation,dates,games," +\
         "xrefIds,xrefId,xrefType,story"
-    game_url = f"https://statsapi.mlb.com/api/v1.1/game/{game_id}/feed/live?"
 
-    # Baseball Positions
-    ##########################################################################
-    # 1 = Pitcher
-    # 2 = Catcher
-    # 3 = 1B
-    # 4 = 2B
-    # 5 = 3B
-    # 6 = SS
-    # 7 = LF
-    # 8 = CF
-    # 9 = RF
+    try:
+        lineups_data = get_or_fetch(
+            cache, "lineups", game_id, partial(get_payload, lineups_url)
+        )
+    except ValueError:
+        # The lineups endpoint didn't return valid JSON.
+        lineups_data = None
 
-    # away_fielders = [1, 2, 3, 4, 5, 6, 7, 8, 9]
-    # home_fielders = [1, 2, 3, 4, 5, 6, 7, 8, 9]
-    away_fielders = [None, None, None, None, None, None, None, None, None]
-    home_fielders = [None, None, None, None, None, None, None, None, None]
+    return lineups_data, json_data
 
-    away_score = 0
-    home_score = 0
 
-    if cache_data is True and (cache_dir == "" or cache_dir is None):
-        # Cached files, default directory
-        try:
-            with open(f"{home_dir}/.milb/lineups/{game_id}.json", "r") as f:
-                json_string = f.read()
+def _set_fielder(fielders: list, player_id: int, player_pos: str):
+    """
+    Places a starting player in `fielders` by their position.
+    """
+    if player_pos == "DH":
+        # The designated hitter is not a fielder.
+        # Thus, we can skip this player.
+        return
+    elif player_pos not in FIELDER_INDEXES:
+        raise ValueError(
+            "Unhandled starting player position:" +
+            f"\n\t{player_pos}"
+        )
 
-            json_data = json.loads(json_string)
-            has_lineups = True
+    fielders[FIELDER_INDEXES[player_pos]] = player_id
 
-            del json_string
-        except Exception:
-            response = urlopen(lineups_url)
-            time.sleep(1)
 
-            if response.code == 200:
-                pass
-            elif response.code == 403:
-                raise ConnectionRefusedError(
-                    "The MiLB API is actively refusing your connection." +
-                    "\nHTTP Error Code:\t403"
-                )
-            else:
-                raise ConnectionError(
-                    "Could not establish a connection to the MiLB API." +
-                    f"\nHTTP Error Code:\t{response.code}"
+def _get_boxscore_fielders(json_data: dict):
+    """
+    Returns a tuple containing the starting fielders
+    of the away and home teams, read from the box score
+    in the `feed/live` JSON data,
+    or `None` if the box score has no starting lineups.
+    """
+    lineups = []
+
+    try:
+        teams = json_data["liveData"]["boxscore"]["teams"]
+
+        for side in ("away", "home"):
+            fielders = [None, None, None, None, None, None, None, None, None]
+
+            for player in teams[side]["players"].values():
+                # Starters bat 100, 200, ..., 900,
+                # and their substitutes 101, 102, and so on.
+                if not player.get("battingOrder", "").endswith("00"):
+                    continue
+
+                positions = player.get("allPositions") or \
+                    [player["position"]]
+                _set_fielder(
+                    fielders,
+                    player["person"]["id"],
+                    positions[0]["abbreviation"]
                 )
 
-            json_data = json.loads(response.read())
-            try:
-                with open(
-                    f"{home_dir}/.milb/lineups/{game_id}.json", "w+"
-                ) as f:
-                    f.write(json.dumps(json_data, indent=2))
-                has_lineups = True
-            except Exception:
-                has_lineups = False
+            if len(teams[side].get("pitchers", [])) > 0:
+                fielders[0] = teams[side]["pitchers"][0]
 
-    elif cache_data is True and (cache_dir != "" or cache_dir is not None):
-        # Cached files, custom directory
-        try:
-            with open(f"{cache_dir}/.milb/lineups/{game_id}.json", "r") as f:
-                json_string = f.read()
+            if all(player_id is None for player_id in fielders[1:]):
+                return None
 
-            json_data = json.loads(json_string)
-            del json_string
-            has_lineups = True
+            lineups.append(fielders)
+    except Exception:
+        return None
 
-        except Exception:
-            response = urlopen(lineups_url)
-            time.sleep(1)
+    return tuple(lineups)
 
-            if response.code == 200:
-                pass
-            elif response.code == 403:
-                raise ConnectionRefusedError(
-                    "The MiLB API is actively refusing your connection." +
-                    "\nHTTP Error Code:\t403"
-                )
-            else:
-                raise ConnectionError(
-                    "Could not establish a connection to the MiLB API." +
-                    f"\nHTTP Error Code:\t{response.code}"
-                )
 
-            try:
-                json_data = json.loads(response.read())
-                with open(
-                    f"{cache_dir}/.milb/lineups/{game_id}.json", "w+"
-                ) as f:
-                    f.write(json.dumps(json_data, indent=2))
+def _get_lineups_fielders(lineups_data: dict):
+    """
+    Returns a tuple containing the starting fielders
+    of the away and home teams, read from the lineups JSON data,
+    or `None` if the lineups JSON data has no starting lineups.
+    """
+    lineups = []
 
-                has_lineups = True
-            except Exception:
-                has_lineups = False
+    try:
+        lineups_data = lineups_data["dates"][0]["games"][0]["lineups"]
 
-    else:
-        # No cached files used.
-        response = urlopen(lineups_url)
-        time.sleep(1)
+        for side in ("awayPlayers", "homePlayers"):
+            fielders = [None, None, None, None, None, None, None, None, None]
 
-        try:
-            if response.code == 200:
-                pass
-            elif response.code == 403:
-                raise ConnectionRefusedError(
-                    "The MiLB API is actively refusing your connection." +
-                    "\nHTTP Error Code:\t403"
+            for i in lineups_data[side]:
+                _set_fielder(
+                    fielders, i["id"], i["primaryPosition"]["abbreviation"]
                 )
-            else:
-                raise ConnectionError(
-                    "Could not establish a connection to the MiLB API." +
-                    f"\nHTTP Error Code:\t{response.code}"
-                )
-
-            json_data = json.loads(response.read())
-            has_lineups = True
-        except Exception:
-            has_lineups = False
 
-    if has_lineups is True:
-        try:
-            json_data = json_data["dates"][0]["games"][0]["lineups"]
-
-            for i in json_data["awayPlayers"]:
-                player_id = i["id"]
-                player_pos = i["primaryPosition"]["abbreviation"]
-
-                match player_pos:
-                    case "DH":
-                        # The designated hitter is not a fielder.
-                        # Thus, we can skip this player.
-                        continue
-                    case "P":
-                        away_fielders[0] = player_id
-                    case "C":
-                        away_fielders[1] = player_id
-                    case "1B":
-                        away_fielders[2] = player_id
-                    case "2B":
-                        away_fielders[3] = player_id
-                    case "3B":
-                        away_fielders[4] = player_id
-                    case "SS":
-                        away_fielders[5] = player_id
-                    case "LF":
-                        away_fielders[6] = player_id
-                    case "CF":
-                        away_fielders[7] = player_id
-                    case "RF":
-                        away_fielders[8] = player_id
-                    case _:
-                        raise ValueError(
-                            "Unhandled starting player position:" +
-                            f"\n\t{player_pos}"
-                        )
-
-            for i in json_data["homePlayers"]:
-                player_id = i["id"]
-                player_pos = i["primaryPosition"]["abbreviation"]
-
-                match player_pos:
-                    case "DH":
-                        # The designated hitter is not a fielder.
-                        # Thus, we can skip this player.
-                        continue
-                    case "P":
-                        away_fielders[0] = player_id
-                    case "C":
-                        home_fielders[1] = player_id
-                    case "1B":
-                        home_fielders[2] = player_id
-                    case "2B":
-                        home_fielders[3] = player_id
-                    case "3B":
-                        home_fielders[4] = player_id
-                    case "SS":
-                        home_fielders[5] = player_id
-                    case "LF":
-                        home_fielders[6] = player_id
-                    case "CF":
-                        home_fielders[7] = player_id
-                    case "RF":
-                        home_fielders[8] = player_id
-                    case _:
-                        raise ValueError(
-                            "Unhandled starting player position:" +
-                            f"\n\t{player_pos}"
-                        )
-        except Exception:
-            print(f"Lineups data not found for {game_id}")
-
-    else:
-        print(f"Lineups data not found for {game_id}")
+            lineups.append(fielders)
+    except Exception:
+        return None
 
-    if cache_data is True and (cache_dir == "" or cache_dir is None):
-        # Cached files, default directory
-        try:
-            with open(f"{home_dir}/.milb/pbp/{game_id}.json", "r") as f:
-                json_string = f.read()
+    return tuple(lineups)
 
-            json_data = json.loads(json_string)
-        except Exception:
-            response = urlopen(game_url)
-            time.sleep(1)
 
-            if response.code == 200:
-                pass
-            elif response.code == 403:
-                raise ConnectionRefusedError(
-                    "The MiLB API is actively refusing your connection." +
-                    "\nHTTP Error Code:\t403"
-                )
-            else:
-                raise ConnectionError(
-                    "Could not establish a connection to the MiLB API." +
-                    f"\nHTTP Error Code:\t{response.code}"
-                )
+def _parse_milb_game_pbp(game_id: int, lineups_data, json_data):
+    """
+    Parses the raw JSON data returned by `_get_milb_game_pbp_json()`
+    into a pandas `DataFrame` object containing PBP data.
+    """
+    play_rows = []
 
-            json_data = json.loads(response.read())
-            with open(f"{home_dir}/.milb/pbp/{game_id}.json", "w+") as f:
-                f.write(json.dumps(json_data, indent=2))
+    # Baseball Positions
+    ##########################################################################
+    # 1 = Pitcher
+    # 2 = Catcher
+    # 3 = 1B
+    # 4 = 2B
+    # 5 = 3B
+    # 6 = SS
+    # 7 = LF
+    # 8 = CF
+    # 9 = RF
 
-    elif cache_data is True and (cache_dir != "" or cache_dir is not None):
-        try:
-            with open(f"{cache_dir}/.milb/pbp/{game_id}.json", "r") as f:
-                json_string = f.read()
+    # away_fielders = [1, 2, 3, 4, 5, 6, 7, 8, 9]
+    # home_fielders = [1, 2, 3, 4, 5, 6, 7, 8, 9]
+    away_fielders = [None, None, None, None, None, None, None, None, None]
+    home_fielders = [None, None, None, None, None, None, None, None, None]
 
-            json_data = json.loads(json_string)
-        except Exception:
-            response = urlopen(game_url)
-            time.sleep(1)
+    away_score = 0
+    home_score = 0
 
-            if response.code == 200:
-                pass
-            elif response.code == 403:
-                raise ConnectionRefusedError(
-                    "The MiLB API is actively refusing your connection." +
-                    "\nHTTP Error Code:\t403"
-                )
-            else:
-                raise ConnectionError(
-                    "Could not establish a connection to the MiLB API." +
-                    f"\nHTTP Error Code:\t{response.code}"
-                )
+    fielders = _get_boxscore_fielders(json_data)
 
-            json_data = json.loads(response.read())
-            with open(f"{cache_dir}/.milb/pbp/{game_id}.json", "w+") as f:
-                f.write(json.dumps(json_data, indent=2))
+    if fielders is None and lineups_data is not None:
+        fielders = _get_lineups_fielders(lineups_data)
 
+    if fielders is not None:
+        away_fielders, home_fielders = fielders
     else:
-        # No cached files used.
-        response = urlopen(game_url)
-        time.sleep(1)
-
-        if response.code == 200:
-            pass
-        elif response.code == 403:
-            raise ConnectionRefusedError(
-                "The MiLB API is actively refusing your connection." +
-                "\nHTTP Error Code:\t403"
-            )
-        else:
-            raise ConnectionError(
-                "Could not establish a connection to the MiLB API." +
-                f"\nHTTP Error Code:\t{response.code}"
-            )
-
-        json_data = json.loads(response.read())
+        print(f"Lineups data not found for {game_id}")
 
     # json_data = json.loads(response.read())
     if len(json_data) == 0:
@@ -782,7 +650,7 @@ def get_milb_game_pbp(game_id: int, cache_data=False, cache_dir=""):
                     hit_x = None
                     hit_y = None
 
-                play_df = pd.DataFrame(
+                play_rows.append(
                     {
                         "play_start_datetime": play_start_datetime,
                         "play_end_datetime": play_end_datetime,
@@ -887,8 +755,7 @@ def get_milb_game_pbp(game_id: int, cache_data=False, cache_dir=""):
                         "away_team_org_name": away_team_org_name,
                         "home_team_org_id": home_team_org_id,
                         "home_team_org_name": home_team_org_name,
-                    },
-                    index=[0],
+                    }
                 )
 
                 del (
@@ -938,9 +805,6 @@ def get_milb_game_pbp(game_id: int, cache_data=False, cache_dir=""):
                     fielder_9,
                 )
 
-                game_df.fillna(value=np.nan, inplace=True)
-                game_df = pd.concat([game_df, play_df], ignore_index=True)
-
             del is_pitch
 
         del (
@@ -963,7 +827,78 @@ def get_milb_game_pbp(game_id: int, cache_data=False, cache_dir=""):
         away_score = post_away_score
         del post_home_score, post_away_score
 
-    return game_df
+    # Built once per game, since concatenating a one-row `DataFrame`
+    # for every pitch takes quadratic time.
+    return build_frame(play_rows)
+
+
+def get_milb_game_pbp(game_id: int, cache_data=False, cache_dir=""):
+    """
+    Retrieves and parses the play-by-play (PBP) data from a valid
+    MiLB game ID.
+
+    Parameters
+    ----------
+    `game_id`: (int, mandatory):
+        The MiLB game ID you want PBP data from.
+
+    `cache_data`: (bool, optional) = `False`:
+        Optional boolean flag.
+        If set to `True`, data downloaded by this function will be cached to
+        a folder named `./milb/`.
+        This folder will either be located in the user's home directory,
+        or in a existing directory
+        specified by the optional argument `cache_dir`.
+
+    `cache_dir`: (str, optional) = `""`:
+        Optional string. If not set to `""` or `None`,
+        this will be the directory used to cache data
+        if `cache_data` is set to `True`.
+        This directory must exist prior to running this function!
+
+    Returns
+    ----------
+    A pandas `DataFrame` object containing PBP data from
+    the MiLB game ID.
+    """
+    cache = get_cache(cache_data=cache_data, cache_dir=cache_dir)
+
+    return get_or_parse(
+        cache,
+        PBP_FRAMES_NAMESPACE,
+        game_id,
+        PBP_PARSER_VERSION,
+        partial(
+            _get_milb_game_pbp_json,
+            game_id=game_id,
+            cache_data=cache_data,
+            cache_dir=cache_dir
+        ),
+        lambda payload: _parse_milb_game_pbp(game_id, *payload),
+        lambda payload: is_game_settled(payload[1])
+    )
+
+
+def _get_milb_game_pbp_frame_or_json(
+    game_id: int, cache_data=False, cache_dir=""
+):
+    """
+    Returns a tuple containing the cached PBP frame of a game
+    (or `None` if it isn't cached),
+    and the output of `_get_milb_game_pbp_json()`
+    (or `None` if the frame is cached).
+    """
+    cache = get_cache(cache_data=cache_data, cache_dir=cache_dir)
+    df = get_cached_frame(
+        cache, PBP_FRAMES_NAMESPACE, game_id, PBP_PARSER_VERSION
+    )
+
+    if df is not None:
+        return df, None
+
+    return None, _get_milb_game_pbp_json(
+        game_id, cache_data=cache_data, cache_dir=cache_dir
+    )
 
 
 def get_month_milb_pbp(
@@ -972,11 +907,12 @@ def get_month_milb_pbp(
     level="AAA",
     cache_data=False,
     cache_dir="",
-    save=True
+    save=True,
+    max_concurrency=MAX_CONCURRENCY
 ):
     """ """
+    reset_offline_misses()
 
-    game_df = pd.DataFrame()
     pbp_df = pd.DataFrame()
     sched_df = pd.DataFrame()
 
@@ -992,10 +928,7 @@ def get_month_milb_pbp(
         or (level.lower() == "double a")
     ):
         if season == 2010:
-            sched_df = pd.read_csv(
-                "https://github.com/armstjc/milb-data-repository/" +
-                f"releases/download/schedule/{season}_aa_schedule.csv"
-            )
+            sched_df = read_schedule_csv(season, "aa")
         else:
             sched_df = load_milb_schedule(season, "AA")
     elif (
@@ -1004,10 +937,7 @@ def get_month_milb_pbp(
         or (level.lower() == "high a")
     ):
         if season == 2011:
-            sched_df = pd.read_csv(
-                "https://github.com/armstjc/milb-data-repository/" +
-                f"releases/download/schedule/{season}_a+_schedule.csv"
-            )
+            sched_df = read_schedule_csv(season, "a+")
         else:
             sched_df = load_milb_schedule(season, "A+")
     elif (
@@ -1016,10 +946,7 @@ def get_month_milb_pbp(
         or (level.lower() == "single-a")
     ):
         if season == 2010 or season == 2013 or season == 2014:
-            sched_df = pd.read_csv(
-                "https://github.com/armstjc/milb-data-repository/" +
-                f"releases/download/schedule/{season}_a_schedule.csv"
-            )
+            sched_df = read_schedule_csv(season, "a")
         else:
             sched_df = load_milb_schedule(season, "A")
     elif (
@@ -1071,18 +998,65 @@ def get_month_milb_pbp(
             "\nPlease cache this data in the future to avoid severe data loss!"
         )
 
-    for game_id in tqdm(game_ids_arr):
+    cache = get_cache(cache_data=cache_data, cache_dir=cache_dir)
+    game_dfs = {}
+    failures = FailureManifest()
+    progress = tqdm(total=len(game_ids_arr))
+
+    def parse_game(game_id, payload, error):
+        # Downloads happen in the background while each finished game
+        # is parsed here, one at a time.
+        progress.update(1)
+
+        if error is not None:
+            print(f"Unhandled use case. Error Details:\n{error}")
+            failures.add(game_id, error)
+            return
+
+        df, payload = payload
+
+        if df is not None:
+            game_dfs[game_id] = df
+            return
+
         try:
-            game_df = get_milb_game_pbp(
-                game_id=game_id, cache_data=cache_data, cache_dir=cache_dir
+            game_dfs[game_id] = parse_payload(
+                cache,
+                PBP_FRAMES_NAMESPACE,
+                game_id,
+                PBP_PARSER_VERSION,
+                payload,
+                lambda payload: _parse_milb_game_pbp(game_id, *payload),
+                lambda payload: is_game_settled(payload[1])
             )
-            pbp_df = pd.concat([pbp_df, game_df], ignore_index=True)
         except Exception as e:
             print(f"Unhandled use case. Error Details:\n{e}")
-
-        # game_df = get_milb_game_pbp(
-        #     game_id=game_id, cache_data=cache_data, cache_dir=cache_dir)
-        pbp_df = pd.concat([pbp_df, game_df], ignore_index=True)
+            failures.add(game_id, e)
+
+    fetch_concurrently(
+        game_ids_arr,
+        partial(
+            _get_milb_game_pbp_frame_or_json,
+            cache_data=cache_data,
+            cache_dir=cache_dir
+        ),
+        parse_game,
+        max_concurrency=max_concurrency
+    )
+    progress.close()
+
+    # Keep the games in schedule order,
+    # regardless of the order they finished downloading.
+    game_dfs = [
+        game_dfs[game_id] for game_id in game_ids_arr if game_id in game_dfs
+    ]
+
+    if len(game_dfs) > 0:
+        pbp_df = pd.concat(game_dfs, ignore_index=True)
+
+    # While offline, runs with missing payloads fail
+    # instead of saving incomplete files.
+    raise_for_offline_misses()
 
     if save is True and len(pbp_df) > 0:
         pbp_df.to_csv(
@@ -1090,6 +1064,19 @@ def get_month_milb_pbp(
             index=False
         )
 
+    if save is True and len(failures) > 0:
+        print(
+            f"\nCould not get PBP data for {len(failures)} game(s). " +
+            "These game IDs have been saved to " +
+            f"`pbp/{game_year}_{month}_{level.lower()}_pbp_failures.json`."
+        )
+        failures.save(
+            f"pbp/{game_year}_{month}_{level.lower()}_pbp_failures.json"
+        )
+
+    print_transfer_summary()
+    print_cache_summary()
+
     return pbp_df
 
 
@@ -1107,7 +1094,41 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     # parser.add_argument("--season", type=int, required=True)
     parser.add_argument("--level", type=str, required=True)
+    parser.add_argument(
+        "--max_concurrency",
+        type=int,
+        required=False,
+        default=MAX_CONCURRENCY,
+        help="The maximum number of games downloaded at the same time.",
+    )
+    parser.add_argument(
+        "--full_feed",
+        action="store_true",
+        help="Download the full `feed/live` document for each game, "
+        + "instead of only the parts used by this script."
+    )
+    parser.add_argument(
+        "--reparse",
+        action="store_true",
+        help="Parse every game again, instead of loading cached PBP frames."
+    )
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        required=False,
+        help="Cache downloaded data in this folder. "
+        + "Data is always cached in `D:/` on Windows.",
+    )
+    add_rate_limit_arguments(parser)
+    add_cache_arguments(parser)
     args = parser.parse_args()
+    configure_rate_limits_from_args(args)
+    configure_cache_from_args(args)
+    set_lean_requests(not args.full_feed)
+    set_reparse(args.reparse)
+
+    if args.cache_dir is not None:
+        c_dir = args.cache_dir
 
     season = now.year
 
@@ -1144,20 +1165,30 @@ if __name__ == "__main__":
     lg_level = args.level
     # lg_level = "AAA"
     for i in range(start_month, end_month):
-        if platform.system() == "Windows":
+        if platform.system() == "Windows" or args.cache_dir is not None:
             print(
                 f"Getting {i}/{season} PBP data " +
                 f"in the {lg_level} level of MiLB."
             )
             df = get_month_milb_pbp(
-                season, i, level=lg_level, cache_data=True, cache_dir=c_dir
+                season,
+                i,
+                level=lg_level,
+                cache_data=True,
+                cache_dir=c_dir,
+                max_concurrency=args.max_concurrency
             )
         else:
             print(
                 f"Getting {i}/{season} PBP data " +
                 f"in the {lg_level} level of MiLB."
             )
-            df = get_month_milb_pbp(season, i, level=lg_level)
+            df = get_month_milb_pbp(
+                season,
+                i,
+                level=lg_level,
+                max_concurrency=args.max_concurrency
+            )
         # get_month_milb_pbp(season, i, level=lg_level)
 
     if len(df) == 0:
@@ -1170,7 +1201,7 @@ if __name__ == "__main__":
         game_date = schedule_df["official_date"].iloc[random_int]
         game_month = int(game_date.split("-")[1])
 
-        if platform.system() == "Windows":
+        if platform.system() == "Windows" or args.cache_dir is not None:
             print(
                 f"Getting {game_month}/{season} PBP data " +
                 f"in the {lg_level} level of MiLB."
@@ -1180,7 +1211,8 @@ if __name__ == "__main__":
                 game_month,
                 level=lg_level,
                 cache_data=True,
-                cache_dir=c_dir
+                cache_dir=c_dir,
+                max_concurrency=args.max_concurrency
             )
         else:
             print(
@@ -1190,7 +1222,8 @@ if __name__ == "__main__":
             df = get_month_milb_pbp(
                 season,
                 game_month,
-                level=lg_level
+                level=lg_level,
+                max_concurrency=args.max_concurrency
             )
     # for i in range(start_month, end_month):
     #     get_month_milb_pbp(
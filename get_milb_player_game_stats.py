@@ -1,16 +1,47 @@
 import argparse
-import json
-import os
 import platform
 import random
-import time
 from datetime import datetime
-from urllib.request import urlopen
+from functools import partial
 
 import pandas as pd
 from tqdm import tqdm
 
 from get_milb_schedule import load_milb_schedule
+from milb_cache import (
+    add_cache_arguments,
+    configure_cache_from_args,
+    get_cache,
+    print_cache_summary
+)
+from milb_feed import (
+    BOXSCORE_PROJECTION,
+    get_game_feed,
+    is_game_settled,
+    set_lean_requests
+)
+from milb_frames import (
+    build_frame,
+    get_cached_frame,
+    get_or_parse,
+    parse_payload,
+    set_reparse
+)
+from milb_http import (
+    MAX_CONCURRENCY,
+    FailureManifest,
+    add_rate_limit_arguments,
+    configure_rate_limits_from_args,
+    fetch_concurrently,
+    print_transfer_summary,
+    raise_for_offline_misses,
+    reset_offline_misses
+)
+
+# Bump this whenever the output of `_parse_milb_player_game_stats()` changes,
+# so cached player game stats frames are parsed again.
+PLAYER_GAME_STATS_PARSER_VERSION = 1
+PLAYER_GAME_STATS_FRAMES_NAMESPACE = "player_game_stats_frames"
 
 
 def get_milb_player_game_stats(game_id: int, cache_data=False, cache_dir=""):
@@ -42,110 +73,25 @@ def get_milb_player_game_stats(game_id: int, cache_data=False, cache_dir=""):
     A pandas `DataFrame` object containing player game box score stats from
     the MiLB game ID.
     """
-    if cache_data is True and (cache_dir == "" or cache_dir is None):
-        home_dir = os.path.expanduser("~")
+    cache = get_cache(cache_data=cache_data, cache_dir=cache_dir)
 
-        try:
-            os.mkdir(f"{home_dir}/.milb/")
-        except Exception:
-            pass
-
-        try:
-            os.mkdir(f"{home_dir}/.milb/pbp/")
-            os.mkdir(f"{home_dir}/.milb/lineups/")
-        except Exception:
-            pass
-
-    elif cache_data is True and (cache_dir != "" or cache_dir is not None):
-        try:
-            os.mkdir(f"{cache_dir}/.milb/")
-        except Exception:
-            pass
-
-        try:
-            os.mkdir(f"{cache_dir}/.milb/pbp/")
-            os.mkdir(f"{cache_dir}/.milb/lineups/")
-        except Exception:
-            pass
+    return get_or_parse(
+        cache,
+        PLAYER_GAME_STATS_FRAMES_NAMESPACE,
+        game_id,
+        PLAYER_GAME_STATS_PARSER_VERSION,
+        partial(get_game_feed, game_id, BOXSCORE_PROJECTION, cache=cache),
+        partial(_parse_milb_player_game_stats, game_id),
+        is_game_settled
+    )
 
-    game_df = pd.DataFrame()
-    row_df = pd.DataFrame()
-    game_url = f"https://statsapi.mlb.com/api/v1.1/game/{game_id}/feed/live?"
 
-    if cache_data is True and (cache_dir == "" or cache_dir is None):
-        # Cached files, default directory
-        try:
-            with open(f"{home_dir}/.milb/pbp/{game_id}.json", "r") as f:
-                json_string = f.read()
-
-            json_data = json.loads(json_string)
-        except Exception:
-            response = urlopen(game_url, timeout=30)
-            time.sleep(1)
-
-            if response.code == 200:
-                pass
-            elif response.code == 403:
-                raise ConnectionRefusedError(
-                    "The MiLB API is actively refusing your connection."
-                    + "\nHTTP Error Code:\t403"
-                )
-            else:
-                raise ConnectionError(
-                    "Could not establish a connection to the MiLB API."
-                    + f"\nHTTP Error Code:\t{response.code}"
-                )
-
-            json_data = json.loads(response.read())
-            with open(f"{home_dir}/.milb/pbp/{game_id}.json", "w+") as f:
-                f.write(json.dumps(json_data, indent=2))
-
-    elif cache_data is True and (cache_dir != "" or cache_dir is not None):
-        try:
-            with open(f"{cache_dir}/.milb/pbp/{game_id}.json", "r") as f:
-                json_string = f.read()
-
-            json_data = json.loads(json_string)
-        except Exception:
-            response = urlopen(game_url)
-            time.sleep(1)
-
-            if response.code == 200:
-                pass
-            elif response.code == 403:
-                raise ConnectionRefusedError(
-                    "The MiLB API is actively refusing your connection."
-                    + "\nHTTP Error Code:\t403"
-                )
-            else:
-                raise ConnectionError(
-                    "Could not establish a connection to the MiLB API."
-                    + f"\nHTTP Error Code:\t{response.code}"
-                )
-
-            json_data = json.loads(response.read())
-            with open(f"{cache_dir}/.milb/pbp/{game_id}.json", "w+") as f:
-                f.write(json.dumps(json_data, indent=2))
-
-    else:
-        # No cached files used.
-        response = urlopen(game_url)
-        time.sleep(1)
-
-        if response.code == 200:
-            pass
-        elif response.code == 403:
-            raise ConnectionRefusedError(
-                "The MiLB API is actively refusing your connection."
-                + "\nHTTP Error Code:\t403"
-            )
-        else:
-            raise ConnectionError(
-                "Could not establish a connection to the MiLB API."
-                + f"\nHTTP Error Code:\t{response.code}"
-            )
-
-        json_data = json.loads(response.read())
+def _parse_milb_player_game_stats(game_id: int, json_data: dict):
+    """
+    Parses the player game box score stats of a MiLB game ID
+    from its `feed/live` JSON data.
+    """
+    player_rows = []
 
     # json_data = json.loads(response.read())
     if len(json_data) == 0:
@@ -271,132 +217,129 @@ def get_milb_player_game_stats(game_id: int, cache_data=False, cache_dir=""):
         except Exception:
             player_batting_order = None
 
-        row_df = pd.DataFrame(
-            {
-                "season": game_date.year,
-                "game_id": game_id,
-                "game_date": game_date,
-                "game_type": game_type,
-                "league_id": league_id,
-                "league_name": league_name,
-                "league_level_id": league_level_id,
-                "league_level_name": league_level_name,
-                "team_org_id": away_team_org_id,
-                "team_org_name": away_team_org_name,
-                "team_id": away_team_id,
-                "team_abv": away_team_abv,
-                "team_name": away_team_name,
-                "loc": loc,
-                "opp_org_id": home_team_org_id,
-                "opp_org_name": home_team_org_name,
-                "opp_id": home_team_id,
-                "opp_abv": home_team_abv,
-                "opp_name": home_team_name,
-                "team_runs": away_runs,
-                "opp_runs": home_runs,
-                "score": final_score_str,
-                "player_id": player_id,
-                "player_jersey_number": player_jersey_number,
-                "player_full_name": player_full_name,
-                "player_position": player_pos,
-                "player_batting_order": player_batting_order,
-            },
-            index=[0],
-        )
+        row = {
+            "season": game_date.year,
+            "game_id": game_id,
+            "game_date": game_date,
+            "game_type": game_type,
+            "league_id": league_id,
+            "league_name": league_name,
+            "league_level_id": league_level_id,
+            "league_level_name": league_level_name,
+            "team_org_id": away_team_org_id,
+            "team_org_name": away_team_org_name,
+            "team_id": away_team_id,
+            "team_abv": away_team_abv,
+            "team_name": away_team_name,
+            "loc": loc,
+            "opp_org_id": home_team_org_id,
+            "opp_org_name": home_team_org_name,
+            "opp_id": home_team_id,
+            "opp_abv": home_team_abv,
+            "opp_name": home_team_name,
+            "team_runs": away_runs,
+            "opp_runs": home_runs,
+            "score": final_score_str,
+            "player_id": player_id,
+            "player_jersey_number": player_jersey_number,
+            "player_full_name": player_full_name,
+            "player_position": player_pos,
+            "player_batting_order": player_batting_order,
+        }
 
         player_data = value["stats"]
 
         if len(player_data["batting"]) > 0:
-            row_df["batting_G"] = player_data["batting"]["gamesPlayed"]
-            row_df["batting_PA"] = player_data["batting"]["plateAppearances"]
-            row_df["batting_AB"] = player_data["batting"]["atBats"]
-            row_df["batting_R"] = player_data["batting"]["runs"]
-            row_df["batting_H"] = player_data["batting"]["hits"]
-            row_df["batting_2B"] = player_data["batting"]["doubles"]
-            row_df["batting_3B"] = player_data["batting"]["triples"]
-            row_df["batting_HR"] = player_data["batting"]["homeRuns"]
-            row_df["batting_RBI"] = player_data["batting"]["rbi"]
-            row_df["batting_SB"] = player_data["batting"]["stolenBases"]
-            row_df["batting_CS"] = player_data["batting"]["caughtStealing"]
-            row_df["batting_BB"] = player_data["batting"]["baseOnBalls"]
-            row_df["batting_IBB"] = player_data["batting"]["intentionalWalks"]
-            row_df["batting_SO"] = player_data["batting"]["strikeOuts"]
-            row_df["batting_TB"] = player_data["batting"]["totalBases"]
-            row_df["batting_GiDP"] = player_data[
+            row["batting_G"] = player_data["batting"]["gamesPlayed"]
+            row["batting_PA"] = player_data["batting"]["plateAppearances"]
+            row["batting_AB"] = player_data["batting"]["atBats"]
+            row["batting_R"] = player_data["batting"]["runs"]
+            row["batting_H"] = player_data["batting"]["hits"]
+            row["batting_2B"] = player_data["batting"]["doubles"]
+            row["batting_3B"] = player_data["batting"]["triples"]
+            row["batting_HR"] = player_data["batting"]["homeRuns"]
+            row["batting_RBI"] = player_data["batting"]["rbi"]
+            row["batting_SB"] = player_data["batting"]["stolenBases"]
+            row["batting_CS"] = player_data["batting"]["caughtStealing"]
+            row["batting_BB"] = player_data["batting"]["baseOnBalls"]
+            row["batting_IBB"] = player_data["batting"]["intentionalWalks"]
+            row["batting_SO"] = player_data["batting"]["strikeOuts"]
+            row["batting_TB"] = player_data["batting"]["totalBases"]
+            row["batting_GiDP"] = player_data[
                 "batting"]["groundIntoDoublePlay"]
-            row_df["batting_GiTP"] = player_data[
+            row["batting_GiTP"] = player_data[
                 "batting"]["groundIntoTriplePlay"]
-            row_df["batting_HBP"] = player_data["batting"]["hitByPitch"]
-            row_df["batting_SH"] = player_data["batting"]["sacBunts"]
-            row_df["batting_SF"] = player_data["batting"]["sacFlies"]
-            row_df["batting_CI"] = player_data[
+            row["batting_HBP"] = player_data["batting"]["hitByPitch"]
+            row["batting_SH"] = player_data["batting"]["sacBunts"]
+            row["batting_SF"] = player_data["batting"]["sacFlies"]
+            row["batting_CI"] = player_data[
                 "batting"]["catchersInterference"]
-            row_df["batting_FO"] = player_data["batting"]["flyOuts"]
-            row_df["batting_GO"] = player_data["batting"]["groundOuts"]
-            row_df["batting_LOB"] = player_data["batting"]["leftOnBase"]
+            row["batting_FO"] = player_data["batting"]["flyOuts"]
+            row["batting_GO"] = player_data["batting"]["groundOuts"]
+            row["batting_LOB"] = player_data["batting"]["leftOnBase"]
 
         if len(player_data["pitching"]) > 0:
-            row_df["batting_G"] = player_data["pitching"]["gamesPlayed"]
-            row_df["pitching_G"] = player_data["pitching"]["gamesPitched"]
-            row_df["pitching_GS"] = player_data["pitching"]["gamesStarted"]
-            row_df["pitching_GF"] = player_data["pitching"]["gamesFinished"]
-            row_df["pitching_CG"] = player_data["pitching"]["completeGames"]
-            row_df["pitching_SHO"] = player_data["pitching"]["shutouts"]
+            row["batting_G"] = player_data["pitching"]["gamesPlayed"]
+            row["pitching_G"] = player_data["pitching"]["gamesPitched"]
+            row["pitching_GS"] = player_data["pitching"]["gamesStarted"]
+            row["pitching_GF"] = player_data["pitching"]["gamesFinished"]
+            row["pitching_CG"] = player_data["pitching"]["completeGames"]
+            row["pitching_SHO"] = player_data["pitching"]["shutouts"]
 
-            row_df["pitching_W"] = player_data["pitching"]["wins"]
-            row_df["pitching_L"] = player_data["pitching"]["losses"]
+            row["pitching_W"] = player_data["pitching"]["wins"]
+            row["pitching_L"] = player_data["pitching"]["losses"]
 
-            row_df["pitching_SVO"] = player_data[
+            row["pitching_SVO"] = player_data[
                 "pitching"]["saveOpportunities"]
-            row_df["pitching_SV"] = player_data["pitching"]["saves"]
-            row_df["pitching_BS"] = player_data["pitching"]["blownSaves"]
-            row_df["pitching_HLD"] = player_data["pitching"]["holds"]
+            row["pitching_SV"] = player_data["pitching"]["saves"]
+            row["pitching_BS"] = player_data["pitching"]["blownSaves"]
+            row["pitching_HLD"] = player_data["pitching"]["holds"]
 
-            row_df["pitching_IP"] = round(
+            row["pitching_IP"] = round(
                 player_data["pitching"]["outs"] / 3, 3
             )
-            row_df["pitching_IP_str"] = str(
+            row["pitching_IP_str"] = str(
                 player_data["pitching"]["inningsPitched"]
             )
 
-            row_df["pitching_R"] = player_data["pitching"]["runs"]
-            row_df["pitching_ER"] = player_data["pitching"]["earnedRuns"]
-            row_df["pitching_BF"] = player_data["pitching"]["battersFaced"]
-            row_df["pitching_AB"] = player_data["pitching"]["atBats"]
-            row_df["pitching_H"] = player_data["pitching"]["hits"]
-            row_df["pitching_2B"] = player_data["pitching"]["doubles"]
-            row_df["pitching_3B"] = player_data["pitching"]["triples"]
-            row_df["pitching_HR"] = player_data["pitching"]["homeRuns"]
-            row_df["pitching_RBI"] = player_data["pitching"]["rbi"]
-            row_df["pitching_BB"] = player_data["pitching"]["baseOnBalls"]
-            row_df["pitching_IBB"] = player_data[
+            row["pitching_R"] = player_data["pitching"]["runs"]
+            row["pitching_ER"] = player_data["pitching"]["earnedRuns"]
+            row["pitching_BF"] = player_data["pitching"]["battersFaced"]
+            row["pitching_AB"] = player_data["pitching"]["atBats"]
+            row["pitching_H"] = player_data["pitching"]["hits"]
+            row["pitching_2B"] = player_data["pitching"]["doubles"]
+            row["pitching_3B"] = player_data["pitching"]["triples"]
+            row["pitching_HR"] = player_data["pitching"]["homeRuns"]
+            row["pitching_RBI"] = player_data["pitching"]["rbi"]
+            row["pitching_BB"] = player_data["pitching"]["baseOnBalls"]
+            row["pitching_IBB"] = player_data[
                 "pitching"]["intentionalWalks"]
-            row_df["pitching_SO"] = player_data["pitching"]["strikeOuts"]
-            row_df["pitching_HBP"] = player_data["pitching"]["hitByPitch"]
-            row_df["pitching_BK"] = player_data["pitching"]["balks"]
-            row_df["pitching_WP"] = player_data["pitching"]["wildPitches"]
-
-            row_df["pitching_GO"] = player_data["pitching"]["groundOuts"]
-            row_df["pitching_AO"] = player_data["pitching"]["airOuts"]
-            row_df["pitching_SB"] = player_data["pitching"]["stolenBases"]
-            row_df["pitching_CS"] = player_data["pitching"]["caughtStealing"]
-
-            row_df["pitching_SH"] = player_data["pitching"]["sacBunts"]
-            row_df["pitching_SF"] = player_data["pitching"]["sacFlies"]
-            row_df["pitching_CI"] = player_data[
+            row["pitching_SO"] = player_data["pitching"]["strikeOuts"]
+            row["pitching_HBP"] = player_data["pitching"]["hitByPitch"]
+            row["pitching_BK"] = player_data["pitching"]["balks"]
+            row["pitching_WP"] = player_data["pitching"]["wildPitches"]
+
+            row["pitching_GO"] = player_data["pitching"]["groundOuts"]
+            row["pitching_AO"] = player_data["pitching"]["airOuts"]
+            row["pitching_SB"] = player_data["pitching"]["stolenBases"]
+            row["pitching_CS"] = player_data["pitching"]["caughtStealing"]
+
+            row["pitching_SH"] = player_data["pitching"]["sacBunts"]
+            row["pitching_SF"] = player_data["pitching"]["sacFlies"]
+            row["pitching_CI"] = player_data[
                 "pitching"]["catchersInterference"]
-            row_df["pitching_PB"] = player_data["pitching"]["passedBall"]
-            row_df["pitching_PK"] = player_data["pitching"]["pickoffs"]
+            row["pitching_PB"] = player_data["pitching"]["passedBall"]
+            row["pitching_PK"] = player_data["pitching"]["pickoffs"]
 
-            row_df["pitching_IR"] = player_data["pitching"]["inheritedRunners"]
-            row_df["pitching_IRS"] = player_data[
+            row["pitching_IR"] = player_data["pitching"]["inheritedRunners"]
+            row["pitching_IRS"] = player_data[
                 "pitching"]["inheritedRunnersScored"]
 
-            row_df["pitching_PI"] = player_data["pitching"]["numberOfPitches"]
-            row_df["pitching_PI_strikes"] = player_data["pitching"]["strikes"]
-            row_df["pitching_PI_balls"] = player_data["pitching"]["balls"]
+            row["pitching_PI"] = player_data["pitching"]["numberOfPitches"]
+            row["pitching_PI_strikes"] = player_data["pitching"]["strikes"]
+            row["pitching_PI_balls"] = player_data["pitching"]["balls"]
 
-        game_df = pd.concat([game_df, row_df], ignore_index=True)
+        player_rows.append(row)
 
     for key, value in home_player_stats.items():
         loc = "H"
@@ -440,134 +383,156 @@ def get_milb_player_game_stats(game_id: int, cache_data=False, cache_dir=""):
         except Exception:
             player_batting_order = None
 
-        row_df = pd.DataFrame(
-            {
-                "season": game_date.year,
-                "game_id": game_id,
-                "game_date": game_date,
-                "game_type": game_type,
-                "league_id": league_id,
-                "league_name": league_name,
-                "league_level_id": league_level_id,
-                "league_level_name": league_level_name,
-                "team_org_id": home_team_org_id,
-                "team_org_name": home_team_org_name,
-                "team_id": home_team_id,
-                "team_abv": home_team_abv,
-                "team_name": home_team_name,
-                "loc": loc,
-                "opp_org_id": away_team_org_id,
-                "opp_org_name": away_team_org_name,
-                "opp_id": away_team_id,
-                "opp_abv": away_team_abv,
-                "opp_name": away_team_name,
-                "team_runs": home_runs,
-                "opp_runs": away_runs,
-                "score": final_score_str,
-                "player_id": player_id,
-                "player_jersey_number": player_jersey_number,
-                "player_full_name": player_full_name,
-                "player_position": player_pos,
-                "player_batting_order": player_batting_order,
-            },
-            index=[0],
-        )
+        row = {
+            "season": game_date.year,
+            "game_id": game_id,
+            "game_date": game_date,
+            "game_type": game_type,
+            "league_id": league_id,
+            "league_name": league_name,
+            "league_level_id": league_level_id,
+            "league_level_name": league_level_name,
+            "team_org_id": home_team_org_id,
+            "team_org_name": home_team_org_name,
+            "team_id": home_team_id,
+            "team_abv": home_team_abv,
+            "team_name": home_team_name,
+            "loc": loc,
+            "opp_org_id": away_team_org_id,
+            "opp_org_name": away_team_org_name,
+            "opp_id": away_team_id,
+            "opp_abv": away_team_abv,
+            "opp_name": away_team_name,
+            "team_runs": home_runs,
+            "opp_runs": away_runs,
+            "score": final_score_str,
+            "player_id": player_id,
+            "player_jersey_number": player_jersey_number,
+            "player_full_name": player_full_name,
+            "player_position": player_pos,
+            "player_batting_order": player_batting_order,
+        }
 
         player_data = value["stats"]
 
         if len(player_data["batting"]) > 0:
-            row_df["batting_G"] = player_data["batting"]["gamesPlayed"]
-            row_df["batting_PA"] = player_data["batting"]["plateAppearances"]
-            row_df["batting_AB"] = player_data["batting"]["atBats"]
-            row_df["batting_R"] = player_data["batting"]["runs"]
-            row_df["batting_H"] = player_data["batting"]["hits"]
-            row_df["batting_2B"] = player_data["batting"]["doubles"]
-            row_df["batting_3B"] = player_data["batting"]["triples"]
-            row_df["batting_HR"] = player_data["batting"]["homeRuns"]
-            row_df["batting_RBI"] = player_data["batting"]["rbi"]
-            row_df["batting_SB"] = player_data["batting"]["stolenBases"]
-            row_df["batting_CS"] = player_data["batting"]["caughtStealing"]
-            row_df["batting_BB"] = player_data["batting"]["baseOnBalls"]
-            row_df["batting_IBB"] = player_data["batting"]["intentionalWalks"]
-            row_df["batting_SO"] = player_data["batting"]["strikeOuts"]
-            row_df["batting_TB"] = player_data["batting"]["totalBases"]
-            row_df["batting_GiDP"] = player_data[
+            row["batting_G"] = player_data["batting"]["gamesPlayed"]
+            row["batting_PA"] = player_data["batting"]["plateAppearances"]
+            row["batting_AB"] = player_data["batting"]["atBats"]
+            row["batting_R"] = player_data["batting"]["runs"]
+            row["batting_H"] = player_data["batting"]["hits"]
+            row["batting_2B"] = player_data["batting"]["doubles"]
+            row["batting_3B"] = player_data["batting"]["triples"]
+            row["batting_HR"] = player_data["batting"]["homeRuns"]
+            row["batting_RBI"] = player_data["batting"]["rbi"]
+            row["batting_SB"] = player_data["batting"]["stolenBases"]
+            row["batting_CS"] = player_data["batting"]["caughtStealing"]
+            row["batting_BB"] = player_data["batting"]["baseOnBalls"]
+            row["batting_IBB"] = player_data["batting"]["intentionalWalks"]
+            row["batting_SO"] = player_data["batting"]["strikeOuts"]
+            row["batting_TB"] = player_data["batting"]["totalBases"]
+            row["batting_GiDP"] = player_data[
                 "batting"]["groundIntoDoublePlay"]
-            row_df["batting_GiTP"] = player_data[
+            row["batting_GiTP"] = player_data[
                 "batting"]["groundIntoTriplePlay"]
-            row_df["batting_HBP"] = player_data["batting"]["hitByPitch"]
-            row_df["batting_SH"] = player_data["batting"]["sacBunts"]
-            row_df["batting_SF"] = player_data["batting"]["sacFlies"]
-            row_df["batting_CI"] = player_data[
+            row["batting_HBP"] = player_data["batting"]["hitByPitch"]
+            row["batting_SH"] = player_data["batting"]["sacBunts"]
+            row["batting_SF"] = player_data["batting"]["sacFlies"]
+            row["batting_CI"] = player_data[
                 "batting"]["catchersInterference"]
-            row_df["batting_FO"] = player_data["batting"]["flyOuts"]
-            row_df["batting_GO"] = player_data["batting"]["groundOuts"]
-            row_df["batting_LOB"] = player_data["batting"]["leftOnBase"]
+            row["batting_FO"] = player_data["batting"]["flyOuts"]
+            row["batting_GO"] = player_data["batting"]["groundOuts"]
+            row["batting_LOB"] = player_data["batting"]["leftOnBase"]
 
         if len(player_data["pitching"]) > 0:
-            row_df["batting_G"] = player_data["pitching"]["gamesPlayed"]
-            row_df["pitching_G"] = player_data["pitching"]["gamesPitched"]
-            row_df["pitching_GS"] = player_data["pitching"]["gamesStarted"]
-            row_df["pitching_GF"] = player_data["pitching"]["gamesFinished"]
-            row_df["pitching_CG"] = player_data["pitching"]["completeGames"]
-            row_df["pitching_SHO"] = player_data["pitching"]["shutouts"]
+            row["batting_G"] = player_data["pitching"]["gamesPlayed"]
+            row["pitching_G"] = player_data["pitching"]["gamesPitched"]
+            row["pitching_GS"] = player_data["pitching"]["gamesStarted"]
+            row["pitching_GF"] = player_data["pitching"]["gamesFinished"]
+            row["pitching_CG"] = player_data["pitching"]["completeGames"]
+            row["pitching_SHO"] = player_data["pitching"]["shutouts"]
 
-            row_df["pitching_W"] = player_data["pitching"]["wins"]
-            row_df["pitching_L"] = player_data["pitching"]["losses"]
+            row["pitching_W"] = player_data["pitching"]["wins"]
+            row["pitching_L"] = player_data["pitching"]["losses"]
 
-            row_df["pitching_SVO"] = player_data[
+            row["pitching_SVO"] = player_data[
                 "pitching"]["saveOpportunities"]
-            row_df["pitching_SV"] = player_data["pitching"]["saves"]
-            row_df["pitching_BS"] = player_data["pitching"]["blownSaves"]
-            row_df["pitching_HLD"] = player_data["pitching"]["holds"]
+            row["pitching_SV"] = player_data["pitching"]["saves"]
+            row["pitching_BS"] = player_data["pitching"]["blownSaves"]
+            row["pitching_HLD"] = player_data["pitching"]["holds"]
 
-            row_df["pitching_IP"] = round(
+            row["pitching_IP"] = round(
                 player_data["pitching"]["outs"] / 3, 3
             )
-            row_df["pitching_IP_str"] = str(
+            row["pitching_IP_str"] = str(
                 player_data["pitching"]["inningsPitched"]
             )
 
-            row_df["pitching_R"] = player_data["pitching"]["runs"]
-            row_df["pitching_ER"] = player_data["pitching"]["earnedRuns"]
-            row_df["pitching_BF"] = player_data["pitching"]["battersFaced"]
-            row_df["pitching_AB"] = player_data["pitching"]["atBats"]
-            row_df["pitching_H"] = player_data["pitching"]["hits"]
-            row_df["pitching_2B"] = player_data["pitching"]["doubles"]
-            row_df["pitching_3B"] = player_data["pitching"]["triples"]
-            row_df["pitching_HR"] = player_data["pitching"]["homeRuns"]
-            row_df["pitching_RBI"] = player_data["pitching"]["rbi"]
-            row_df["pitching_BB"] = player_data["pitching"]["baseOnBalls"]
-            row_df["pitching_IBB"] = player_data[
+            row["pitching_R"] = player_data["pitching"]["runs"]
+            row["pitching_ER"] = player_data["pitching"]["earnedRuns"]
+            row["pitching_BF"] = player_data["pitching"]["battersFaced"]
+            row["pitching_AB"] = player_data["pitching"]["atBats"]
+            row["pitching_H"] = player_data["pitching"]["hits"]
+            row["pitching_2B"] = player_data["pitching"]["doubles"]
+            row["pitching_3B"] = player_data["pitching"]["triples"]
+            row["pitching_HR"] = player_data["pitching"]["homeRuns"]
+            row["pitching_RBI"] = player_data["pitching"]["rbi"]
+            row["pitching_BB"] = player_data["pitching"]["baseOnBalls"]
+            row["pitching_IBB"] = player_data[
                 "pitching"]["intentionalWalks"]
-            row_df["pitching_SO"] = player_data["pitching"]["strikeOuts"]
-            row_df["pitching_HBP"] = player_data["pitching"]["hitByPitch"]
-            row_df["pitching_BK"] = player_data["pitching"]["balks"]
-            row_df["pitching_WP"] = player_data["pitching"]["wildPitches"]
-
-            row_df["pitching_GO"] = player_data["pitching"]["groundOuts"]
-            row_df["pitching_AO"] = player_data["pitching"]["airOuts"]
-            row_df["pitching_SB"] = player_data["pitching"]["stolenBases"]
-            row_df["pitching_CS"] = player_data["pitching"]["caughtStealing"]
-
-            row_df["pitching_SH"] = player_data["pitching"]["sacBunts"]
-            row_df["pitching_SF"] = player_data["pitching"]["sacFlies"]
-            row_df["pitching_CI"] = player_data[
+            row["pitching_SO"] = player_data["pitching"]["strikeOuts"]
+            row["pitching_HBP"] = player_data["pitching"]["hitByPitch"]
+            row["pitching_BK"] = player_data["pitching"]["balks"]
+            row["pitching_WP"] = player_data["pitching"]["wildPitches"]
+
+            row["pitching_GO"] = player_data["pitching"]["groundOuts"]
+            row["pitching_AO"] = player_data["pitching"]["airOuts"]
+            row["pitching_SB"] = player_data["pitching"]["stolenBases"]
+            row["pitching_CS"] = player_data["pitching"]["caughtStealing"]
+
+            row["pitching_SH"] = player_data["pitching"]["sacBunts"]
+            row["pitching_SF"] = player_data["pitching"]["sacFlies"]
+            row["pitching_CI"] = player_data[
                 "pitching"]["catchersInterference"]
-            row_df["pitching_PB"] = player_data["pitching"]["passedBall"]
-            row_df["pitching_PK"] = player_data["pitching"]["pickoffs"]
+            row["pitching_PB"] = player_data["pitching"]["passedBall"]
+            row["pitching_PK"] = player_data["pitching"]["pickoffs"]
 
-            row_df["pitching_IR"] = player_data["pitching"]["inheritedRunners"]
-            row_df["pitching_IRS"] = player_data[
+            row["pitching_IR"] = player_data["pitching"]["inheritedRunners"]
+            row["pitching_IRS"] = player_data[
                 "pitching"]["inheritedRunnersScored"]
 
-            row_df["pitching_PI"] = player_data["pitching"]["numberOfPitches"]
-            row_df["pitching_PI_strikes"] = player_data["pitching"]["strikes"]
-            row_df["pitching_PI_balls"] = player_data["pitching"]["balls"]
+            row["pitching_PI"] = player_data["pitching"]["numberOfPitches"]
+            row["pitching_PI_strikes"] = player_data["pitching"]["strikes"]
+            row["pitching_PI_balls"] = player_data["pitching"]["balls"]
+
+        player_rows.append(row)
+
+    # Built once per game, since concatenating a one-row `DataFrame`
+    # for every player takes quadratic time.
+    return build_frame(player_rows)
+
+
+def _get_milb_player_game_stats_frame_or_json(
+    game_id: int, cache_data=False, cache_dir=""
+):
+    """
+    Returns a tuple containing the cached player game stats frame of a game
+    (or `None` if it isn't cached),
+    and the game's `feed/live` JSON data
+    (or `None` if the frame is cached).
+    """
+    cache = get_cache(cache_data=cache_data, cache_dir=cache_dir)
+    df = get_cached_frame(
+        cache,
+        PLAYER_GAME_STATS_FRAMES_NAMESPACE,
+        game_id,
+        PLAYER_GAME_STATS_PARSER_VERSION
+    )
 
-        game_df = pd.concat([game_df, row_df], ignore_index=True)
+    if df is not None:
+        return df, None
 
-    return game_df
+    return None, get_game_feed(game_id, BOXSCORE_PROJECTION, cache=cache)
 
 
 def get_month_milb_player_game_stats(
@@ -577,10 +542,11 @@ def get_month_milb_player_game_stats(
     cache_data: bool = False,
     cache_dir: str = "",
     save: bool = True,
+    max_concurrency: int = MAX_CONCURRENCY
 ):
     """ """
+    reset_offline_misses()
 
-    game_df = pd.DataFrame()
     stats_df = pd.DataFrame()
     sched_df = pd.DataFrame()
 
@@ -652,21 +618,67 @@ def get_month_milb_player_game_stats(
             "to avoid severe data loss!"
         )
 
-    # for game_id in tqdm(game_ids_arr):
-    for i in tqdm(range(0, len(game_ids_arr))):
-        game_id = game_ids_arr[i]
+    cache = get_cache(cache_data=cache_data, cache_dir=cache_dir)
+    game_dfs = {}
+    failures = FailureManifest()
+    progress = tqdm(total=len(game_ids_arr))
+
+    def parse_game(game_id, payload, error):
+        # Downloads happen in the background while each finished game
+        # is parsed here, one at a time.
+        progress.update(1)
+
+        if error is not None:
+            print(f"Unhandled use case. Error Details:\n{error}")
+            failures.add(game_id, error)
+            return
+
+        df, payload = payload
+
+        if df is not None:
+            game_dfs[game_id] = df
+            return
 
         try:
-            game_df = get_milb_player_game_stats(
-                game_id=game_id, cache_data=cache_data, cache_dir=cache_dir
+            game_dfs[game_id] = parse_payload(
+                cache,
+                PLAYER_GAME_STATS_FRAMES_NAMESPACE,
+                game_id,
+                PLAYER_GAME_STATS_PARSER_VERSION,
+                payload,
+                partial(_parse_milb_player_game_stats, game_id),
+                is_game_settled
             )
-            stats_df = pd.concat([stats_df, game_df], ignore_index=True)
         except Exception as e:
             print(f"Unhandled use case. Error Details:\n{e}")
-
-        # game_df = get_milb_player_game_stats(
-        #     game_id=game_id, cache_data=cache_data, cache_dir=cache_dir)
-        stats_df = pd.concat([stats_df, game_df], ignore_index=True)
+            failures.add(game_id, e)
+
+    fetch_concurrently(
+        game_ids_arr,
+        partial(
+            _get_milb_player_game_stats_frame_or_json,
+            cache_data=cache_data,
+            cache_dir=cache_dir
+        ),
+        parse_game,
+        max_concurrency=max_concurrency
+    )
+    progress.close()
+
+    # Keep the games in schedule order,
+    # regardless of the order they finished downloading.
+    game_dfs = [
+        game_dfs[game_id] for game_id in game_ids_arr if game_id in game_dfs
+    ]
+
+    # Concatenated once, since concatenating every game
+    # into the growing month takes quadratic time.
+    if len(game_dfs) > 0:
+        stats_df = pd.concat(game_dfs, ignore_index=True)
+
+    # While offline, runs with missing payloads fail
+    # instead of saving incomplete files.
+    raise_for_offline_misses()
 
     if save is True and len(stats_df) > 0:
         stats_df.to_csv(
@@ -675,6 +687,18 @@ def get_month_milb_player_game_stats(
             index=False,
         )
 
+    if save is True and len(failures) > 0:
+        failures_path = f"game_stats/player/{game_year}_{month}_" + \
+            f"{level.lower()}_player_game_stats_failures.json"
+        print(
+            f"\nCould not get player game stats for {len(failures)} " +
+            f"game(s). These game IDs have been saved to `{failures_path}`."
+        )
+        failures.save(failures_path)
+
+    print_transfer_summary()
+    print_cache_summary()
+
     return stats_df
 
 
@@ -691,7 +715,42 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--season", type=int, required=False)
     parser.add_argument("--level", type=str, required=True)
+    parser.add_argument(
+        "--max_concurrency",
+        type=int,
+        required=False,
+        default=MAX_CONCURRENCY,
+        help="The maximum number of games downloaded at the same time.",
+    )
+    parser.add_argument(
+        "--full_feed",
+        action="store_true",
+        help="Download the full `feed/live` document for each game, "
+        + "instead of only the parts used by this script."
+    )
+    parser.add_argument(
+        "--reparse",
+        action="store_true",
+        help="Parse every game again, "
+        + "instead of loading cached player game stats frames."
+    )
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        required=False,
+        help="Cache downloaded data in this folder. "
+        + "Data is always cached in `D:/` on Windows.",
+    )
+    add_rate_limit_arguments(parser)
+    add_cache_arguments(parser)
     args = parser.parse_args()
+    configure_rate_limits_from_args(args)
+    configure_cache_from_args(args)
+    set_lean_requests(not args.full_feed)
+    set_reparse(args.reparse)
+
+    if args.cache_dir is not None:
+        c_dir = args.cache_dir
 
     lg_level = args.level
     season = args.season
@@ -736,20 +795,30 @@ if __name__ == "__main__":
         end_month = 13
 
     for i in range(start_month, end_month):
-        if platform.system() == "Windows":
+        if platform.system() == "Windows" or args.cache_dir is not None:
             print(
                 f"Getting {i}/{season} player game stats data " +
                 f"in the {lg_level} level of MiLB."
             )
             df = get_month_milb_player_game_stats(
-                season, i, level=lg_level, cache_data=True, cache_dir=c_dir
+                season,
+                i,
+                level=lg_level,
+                cache_data=True,
+                cache_dir=c_dir,
+                max_concurrency=args.max_concurrency
             )
         else:
             print(
                 f"Getting {i}/{season} player game stats data " +
                 f"in the {lg_level} level of MiLB."
             )
-            df = get_month_milb_player_game_stats(season, i, level=lg_level)
+            df = get_month_milb_player_game_stats(
+                season,
+                i,
+                level=lg_level,
+                max_concurrency=args.max_concurrency
+            )
         # get_month_milb_player_game_stats(season, i, level=lg_level)
 
     if len(df) == 0:
@@ -762,20 +831,30 @@ if __name__ == "__main__":
         game_date = schedule_df["official_date"].iloc[random_int]
         game_month = int(game_date.split("-")[1])
 
-        if platform.system() == "Windows":
+        if platform.system() == "Windows" or args.cache_dir is not None:
             print(
                 f"Getting {i}/{season} player game stats data " +
                 f"in the {lg_level} level of MiLB."
             )
             df = get_month_milb_player_game_stats(
-                season, i, level=lg_level, cache_data=True, cache_dir=c_dir
+                season,
+                i,
+                level=lg_level,
+                cache_data=True,
+                cache_dir=c_dir,
+                max_concurrency=args.max_concurrency
             )
         else:
             print(
                 f"Getting {i}/{season} player game stats data " +
                 f"in the {lg_level} level of MiLB."
             )
-            df = get_month_milb_player_game_stats(season, i, level=lg_level)
+            df = get_month_milb_player_game_stats(
+                season,
+                i,
+                level=lg_level,
+                max_concurrency=args.max_concurrency
+            )
 
     # get_month_milb_player_game_stats(
     #     2023, 10, level="win", cache_data=True, cache_dir="D:/"
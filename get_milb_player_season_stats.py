@@ -1,18 +1,36 @@
 import argparse
-import json
-import time
 from datetime import datetime
+from functools import partial
 
 import numpy as np
 import pandas as pd
-import requests
 from tqdm import tqdm
 
 from get_milb_teams import get_milb_team_list
+from milb_cache import (
+    add_cache_arguments,
+    configure_cache_from_args,
+    get_cache,
+    get_or_fetch,
+    print_cache_summary
+)
+from milb_http import (
+    add_rate_limit_arguments,
+    configure_rate_limits_from_args,
+    get_payload,
+    print_transfer_summary,
+    raise_for_offline_misses,
+    reset_offline_misses
+)
 
 
 def get_milb_player_team_season_stats(
-    season: int, level: str, team_id: int, stats_type="batting"
+    season: int,
+    level: str,
+    team_id: int,
+    stats_type="batting",
+    cache_data=False,
+    cache_dir=""
 ):
     """ """
     now = datetime.now()
@@ -65,30 +83,15 @@ def get_milb_player_team_season_stats(
         f"&teamId={team_id}&stats=season&group=hitting&gameType=R" +\
         "&limit=100&offset=0&playerPool=ALL"
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_4) " +
-        "AppleWebKit/537.36 (KHTML, like Gecko) " +
-        "Chrome/83.0.4103.97 Safari/537.36"
-    }
+    cache = get_cache(cache_data=cache_data, cache_dir=cache_dir)
 
     if stats_type.lower() == "batting":
-        response = requests.get(batting_url, headers=headers)
-        time.sleep(0.1)
-
-        if response.status_code == 200:
-            pass
-        elif response.status_code == 403:
-            raise ConnectionRefusedError(
-                "\nThe MiLB API is actively refusing your connection." +
-                "\nHTTP Error Code:\t403"
-            )
-        else:
-            raise ConnectionError(
-                "\nCould not establish a connection to the MiLB API." +
-                f"\nHTTP Error Code:\t{response.code}"
-            )
-
-        json_data = json.loads(response.text)
+        json_data = get_or_fetch(
+            cache,
+            "player_season_stats",
+            f"{season}_{level_id}_{team_id}_batting",
+            partial(get_payload, batting_url)
+        )
 
         if json_data["totalSplits"] == 0:
             # If true, we don't have data.
@@ -219,23 +222,12 @@ def get_milb_player_team_season_stats(
         return game_df
 
     elif stats_type.lower() == "pitching":
-        response = requests.get(pitching_url, headers=headers)
-        time.sleep(0.1)
-
-        if response.status_code == 200:
-            pass
-        elif response.status_code == 403:
-            raise ConnectionRefusedError(
-                "The MiLB API is actively refusing your connection." +
-                "\nHTTP Error Code:\t403"
-            )
-        else:
-            raise ConnectionError(
-                "Could not establish a connection to the MiLB API." +
-                f"\nHTTP Error Code:\t{response.code}"
-            )
-
-        json_data = json.loads(response.text)
+        json_data = get_or_fetch(
+            cache,
+            "player_season_stats",
+            f"{season}_{level_id}_{team_id}_pitching",
+            partial(get_payload, pitching_url)
+        )
 
         if json_data["totalSplits"] == 0:
             # If true, we don't have data.
@@ -486,9 +478,15 @@ def get_milb_player_team_season_stats(
 
 
 def get_milb_player_season_stats(
-    season: int, level: str, stats_type="batting", save=False
+    season: int,
+    level: str,
+    stats_type="batting",
+    save=False,
+    cache_data=False,
+    cache_dir=""
 ):
     """ """
+    reset_offline_misses()
     now = datetime.now()
     game_df = pd.DataFrame()
     season_df = pd.DataFrame()
@@ -526,7 +524,9 @@ def get_milb_player_season_stats(
         )
 
     print(f"\nGetting a list of teams in the MLB API for the {season} season.")
-    teams_df = get_milb_team_list(season=season, save=False)
+    teams_df = get_milb_team_list(
+        season=season, save=False, cache_data=cache_data, cache_dir=cache_dir
+    )
 
     print(f"\nFiltering out teams that aren't in {level.upper()} baseball.")
     teams_df = teams_df.loc[teams_df["sport_id"] == level_id]
@@ -541,7 +541,9 @@ def get_milb_player_season_stats(
                 season=season,
                 level=level,
                 team_id=team_id,
-                stats_type=stats_type
+                stats_type=stats_type,
+                cache_data=cache_data,
+                cache_dir=cache_dir
             )
         except Exception:
             print(f"\nCould not get player season stats for team ID {team_id}")
@@ -555,6 +557,10 @@ def get_milb_player_season_stats(
         # )
         season_df = pd.concat([season_df, game_df], ignore_index=True)
 
+    # While offline, runs with missing payloads fail
+    # instead of saving incomplete files.
+    raise_for_offline_misses()
+
     if save is True and stats_type == "batting":
         season_df.to_csv(
             f"season_stats/player/{season}_{level.lower()}" +
@@ -568,6 +574,9 @@ def get_milb_player_season_stats(
             index=False,
         )
 
+    print_transfer_summary()
+    print_cache_summary()
+
     return season_df
 
 
@@ -607,7 +616,23 @@ if __name__ == "__main__":
         "Valid arguments are `batting` or `pitching`.",
     )
 
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        required=False,
+        help="Cache downloaded data in this folder. "
+        + "Data is always cached while `--offline` is set.",
+    )
+
+    add_rate_limit_arguments(parser)
+    add_cache_arguments(parser)
     args = parser.parse_args()
+    configure_rate_limits_from_args(args)
+    configure_cache_from_args(args)
+
+    # Offline runs can only read from the cache.
+    cache_data = args.cache_dir is not None or args.offline is True
+    cache_dir = args.cache_dir or ""
 
     season = args.season
     end_season = args.end_season
@@ -636,7 +661,12 @@ if __name__ == "__main__":
 
         for s in range(season, end_season + 1):
             get_milb_player_season_stats(
-                season=s, level=lg_level, stats_type=stats_type, save=True
+                season=s,
+                level=lg_level,
+                stats_type=stats_type,
+                save=True,
+                cache_data=cache_data,
+                cache_dir=cache_dir
             )
 
     else:
@@ -646,5 +676,10 @@ if __name__ == "__main__":
         )
 
         get_milb_player_season_stats(
-            season=season, level=lg_level, stats_type=stats_type, save=True
+            season=season,
+            level=lg_level,
+            stats_type=stats_type,
+            save=True,
+            cache_data=cache_data,
+            cache_dir=cache_dir
         )
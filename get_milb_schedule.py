@@ -1,13 +1,99 @@
+import argparse
 import json
 import os
-import time
 from datetime import datetime
-from urllib.request import urlopen
+from functools import partial
 
 import pandas as pd
-import requests
 from tqdm import tqdm
 
+from milb_cache import get_cache, get_or_fetch
+from milb_frames import build_frame
+from milb_http import (
+    add_rate_limit_arguments,
+    configure_rate_limits_from_args,
+    get_payload,
+    get_response,
+    is_offline,
+    raise_offline_error
+)
+
+SCHEDULE_URL = "https://statsapi.mlb.com/api/v1/schedule"
+
+# Release the schedule CSV files are published to.
+SCHEDULE_RELEASE_URL = "https://github.com/armstjc/milb-data-repository/" + \
+    "releases/download/schedule"
+
+# `hydrate` values for schedule requests.
+# - `minimal` only hydrates what the schedule parser reads.
+# - `full` also hydrates tickets, promotions, media, and linescores,
+#   for callers that want that raw JSON cached.
+SCHEDULE_HYDRATE_PROFILES = {
+    "minimal": "team,seriesStatus",
+    "full": "team(venue(timezone)),venue(timezone)," +
+    "game(seriesStatus,seriesSummary,tickets,promotions,sponsorships," +
+    "content(summary,media(epg))),seriesStatus,seriesSummary,linescore",
+}
+
+# The `sportId` of each MiLB level,
+# and the name of that level in schedule file names.
+MILB_LEVELS = {
+    11: "aaa",
+    12: "aa",
+    13: "a+",
+    14: "a",
+    15: "a-",
+    16: "rookie",
+    17: "winter",
+}
+
+
+def get_level_sport_ids(level: str) -> tuple:
+    """
+    Returns the `sportId`s of a MiLB level.
+    See `get_milb_schedule()` for the levels that are supported.
+    """
+    level = level.lower()
+
+    if level == "all":
+        return tuple(MILB_LEVELS.keys())
+    elif level in ("aaa", "triple-a", "triple a"):
+        return (11,)
+    elif level in ("aa", "double-a", "double a"):
+        return (12,)
+    elif level in ("a+", "high-a", "high a"):
+        return (13,)
+    elif level in ("a", "single-a", "single a"):
+        return (14,)
+    elif level in ("a-", "short-a", "short a"):
+        return (15,)
+    elif level in ("rk", "rok", "rookie"):
+        return (16,)
+    elif level in ("win", "winter"):
+        return (17,)
+    else:
+        raise ValueError(f"Unhandled MiLB level:\n\t{level}")
+
+
+def get_schedule_url(
+    season: int, sport_ids: tuple, hydrate_profile: str = "minimal"
+) -> str:
+    """
+    Returns the `api/v1/schedule` URL for a season,
+    one or more MiLB `sportId`s,
+    and a hydrate profile in `SCHEDULE_HYDRATE_PROFILES`.
+    """
+    try:
+        hydrate = SCHEDULE_HYDRATE_PROFILES[hydrate_profile]
+    except KeyError:
+        raise ValueError(f"Unhandled hydrate profile:\n\t{hydrate_profile}")
+
+    sport_id_str = "".join(f"&sportId={i}" for i in sport_ids)
+    url = f"{SCHEDULE_URL}?lang=en{sport_id_str}" + \
+        f"&hydrate={hydrate}&season={season}" + \
+        "&eventTypes=primary&scheduleTypes=games,events,xref"
+    return url
+
 
 def get_alt_schedule(season: int, level: str = "a"):
     """
@@ -17,8 +103,7 @@ def get_alt_schedule(season: int, level: str = "a"):
     due to a HTTP 500 error that pops up when
     attempting to use `get_milb_schedule()` in this specific edge case.
     """
-    schedule_df = pd.DataFrame()
-    row_df = pd.DataFrame()
+    schedule_rows = []
 
     if season >= 2010 or season <= 2014:
         pass
@@ -83,29 +168,9 @@ def get_alt_schedule(season: int, level: str = "a"):
                 + "&leagueId=&contextTeamId=milb&teamId="
             )
 
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_4) "
-            + "AppleWebKit/537.36 (KHTML, like Gecko) "
-            + "Chrome/83.0.4103.97 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers)
-
-        time.sleep(2)
-
-        if response.status_code == 200:
-            pass
-        elif response.status_code == 403:
-            raise ConnectionRefusedError(
-                "The MiLB API is actively refusing your connection."
-                + "\nHTTP Error Code:\t403"
-            )
-        else:
-            raise ConnectionError(
-                "Could not establish a connection to the MiLB API."
-                + f"\nHTTP Error Code:\t{response.code}"
-            )
+        response = get_response(url)
 
-        json_data = json.loads(response.text)
+        json_data = json.loads(response.content)
 
         for d in tqdm(json_data["dates"]):
             game_date = d["date"]
@@ -252,7 +317,7 @@ def get_alt_schedule(season: int, level: str = "a"):
                 league_level_link = i["teams"]["home"]["team"]["sport"]["link"]
                 league_level_name = i["teams"]["home"]["team"]["sport"]["name"]
 
-                row_df = pd.DataFrame(
+                schedule_rows.append(
                     {
                         "game_pk": game_id,
                         "link": game_link,
@@ -320,15 +385,9 @@ def get_alt_schedule(season: int, level: str = "a"):
                         "league_level_id": league_level_id,
                         "league_level_link": league_level_link,
                         "league_level_name": league_level_name,
-                    },
-                    index=[0],
+                    }
                 )
 
-                schedule_df = pd.concat(
-                    [schedule_df, row_df], ignore_index=True
-                )
-
-                del row_df
                 del (
                     game_id,
                     game_link,
@@ -382,11 +441,17 @@ def get_alt_schedule(season: int, level: str = "a"):
                     league_level_name,
                 )
 
-    return schedule_df
+    # Built once, since concatenating a one-row `DataFrame`
+    # for every game takes quadratic time.
+    return build_frame(schedule_rows)
 
 
 def get_milb_schedule(
-    season: int, level="AAA", cache_data=False, cache_dir=""
+    season: int,
+    level="AAA",
+    cache_data=False,
+    cache_dir="",
+    hydrate_profile: str = None
 ):
     """
     Gets and parses a list of MiLB games that happened between two dates.
@@ -419,6 +484,13 @@ def get_milb_schedule(
         to cache data if `cache_data` is set to `True`.
         This directory must exist prior to running this function!
 
+    `hydrate_profile`: (str, optional) = `None`:
+        Optional string. The hydrate profile in `SCHEDULE_HYDRATE_PROFILES`
+        used for this request.
+        Each level, season, and hydrate profile is cached separately.
+        If `None`, `"full"` is used if `cache_data` is set to `True`,
+        and `"minimal"` is used otherwise.
+
     Returns
     ----------
     """
@@ -439,221 +511,29 @@ def get_milb_schedule(
         df = get_alt_schedule(2010, "aa")
         return df
 
-    if cache_data is True and (cache_dir == "" or cache_dir is None):
-        home_dir = os.path.expanduser("~")
-
-        try:
-            os.mkdir(f"{home_dir}/.milb/")
-        except Exception:
-            print("Cached directory already exists.")
-
-        try:
-            os.mkdir(f"{home_dir}/.milb/schedule/")
-        except Exception:
-            print(
-                "Additional cached directories "
-                + "have been previously created and located."
-            )
-
-    elif cache_data is True and (cache_dir != "" or cache_dir is not None):
-        try:
-            os.mkdir(f"{cache_dir}/.milb/")
-        except Exception:
-            print("Cached directory already exists.")
-
-        try:
-            os.mkdir(f"{cache_dir}/.milb/schedule/")
-        except Exception:
-            print(
-                "Additional cached directories "
-                + "have been previously created and located."
-            )
-
-    # season = 2023
-    schedule_df = pd.DataFrame()
-    row_df = pd.DataFrame()
-
-    if cache_data is True and (cache_dir == "" or cache_dir is None):
-        try:
-            with open(f"{home_dir}/.milb/schedule/{season}.json", "r") as f:
-                json_string = f.read()
-
-            json_data = json.loads(json_string)
-            del json_string
-        except Exception:
-            url = "https://statsapi.mlb.com/api/v1/schedule?lang=en" +\
-                "&sportId=11&sportID=12&sportID=13&sportID=14&sportID=15" +\
-                "&sportID=16&hydrate=team(venue(timezone)),venue(timezone)," +\
-                "game(seriesStatus,seriesSummary," +\
-                "tickets,promotions,sponsorships," +\
-                "content(summary,media(epg))),seriesStatus,seriesSummary," +\
-                f"linescore&season={season}&eventTypes=primary" +\
-                "&scheduleTypes=games,events,xref"
-            response = urlopen(url)
-            time.sleep(2)
-
-            if response.code == 200:
-                pass
-            elif response.code == 403:
-                raise ConnectionRefusedError(
-                    "The MiLB API is actively refusing your connection."
-                    + "\nHTTP Error Code:\t403"
-                )
-            else:
-                raise ConnectionError(
-                    "Could not establish a connection to the MiLB API."
-                    + f"\nHTTP Error Code:\t{response.code}"
-                )
-
-            json_data = json.loads(response.read())
-            with open(f"{home_dir}/.milb/schedule/{season}.json", "w+") as f:
-                f.write(json.dumps(json_data, indent=2))
-
-    elif cache_data is True and (cache_dir != "" or cache_dir is not None):
-        try:
-            with open(f"{cache_data}/.milb/schedule/{season}.json", "r") as f:
-                json_string = f.read()
-
-            json_data = json.loads(json_string)
-            del json_string
-        except Exception:
-            url = "https://statsapi.mlb.com/api/v1/schedule" +\
-                "?lang=en&sportId=11&sportID=12&sportID=13&sportID=14" +\
-                "&sportID=15&sportID=16&hydrate=team(venue(timezone))," +\
-                "venue(timezone),game(seriesStatus,seriesSummary,tickets," +\
-                "promotions,sponsorships,content(summary,media(epg)))," +\
-                f"seriesStatus,seriesSummary,linescore&season={season}" +\
-                "&&eventTypes=primary&scheduleTypes=games,events,xref"
-            response = urlopen(url)
-            time.sleep(2)
-
-            if response.code == 200:
-                pass
-            elif response.code == 403:
-                raise ConnectionRefusedError(
-                    "The MiLB API is actively refusing your connection."
-                    + "\nHTTP Error Code:\t403"
-                )
-            else:
-                raise ConnectionError(
-                    "Could not establish a connection to the MiLB API."
-                    + f"\nHTTP Error Code:\t{response.code}"
-                )
+    if hydrate_profile is None and cache_data is True:
+        hydrate_profile = "full"
+    elif hydrate_profile is None:
+        hydrate_profile = "minimal"
 
-            json_data = json.loads(response.read())
-            with open(f"{cache_data}/.milb/schedule/{season}.json", "w+") as f:
-                f.write(json.dumps(json_data, indent=2))
+    sport_ids = get_level_sport_ids(level)
 
+    if level.lower() == "all":
+        level_name = "all"
     else:
-        if level.lower() == "all":
-            url = "https://statsapi.mlb.com/api/v1/schedule" +\
-                "?lang=en&sportId=11&sportID=12&sportID=13&sportID=14" +\
-                "&sportID=15&sportID=16&sportID=17&hydrate=team(venue(timezone))," +\
-                "venue(timezone),game(seriesStatus,seriesSummary,tickets," +\
-                "promotions,sponsorships,content(summary,media(epg)))," +\
-                f"seriesStatus,seriesSummary,linescore&season={season}" +\
-                "&eventTypes=primary&scheduleTypes=games,events,xref"
-        elif (
-            (level.lower() == "aaa")
-            or (level.lower() == "triple-a")
-            or (level.lower() == "triple a")
-        ):
-            url = "https://statsapi.mlb.com/api/v1/schedule" +\
-                "?lang=en&sportId=11&hydrate=team(venue(timezone))," +\
-                "venue(timezone),game(seriesStatus,seriesSummary,tickets," +\
-                "promotions,sponsorships,content(summary,media(epg)))," +\
-                f"seriesStatus,seriesSummary,linescore&season={season}" +\
-                "&eventTypes=primary&scheduleTypes=games,events,xref"
-        elif (
-            (level.lower() == "aa")
-            or (level.lower() == "double-a")
-            or (level.lower() == "double a")
-        ):
-            url = "https://statsapi.mlb.com/api/v1/schedule" +\
-                "?lang=en&sportId=12&hydrate=team(venue(timezone))," +\
-                "venue(timezone),game(seriesStatus,seriesSummary," +\
-                "tickets,promotions,sponsorships," +\
-                "content(summary,media(epg))),seriesStatus,seriesSummary," +\
-                f"linescore&season={season}&eventTypes=primary" +\
-                "&scheduleTypes=games,events,xref"
-        elif (
-            (level.lower() == "a+")
-            or (level.lower() == "high-a")
-            or (level.lower() == "high a")
-        ):
-            url = "https://statsapi.mlb.com/api/v1/schedule" +\
-                "?lang=en&sportId=13&hydrate=team(venue(timezone))," +\
-                "venue(timezone),game(seriesStatus,seriesSummary,tickets," +\
-                "promotions,sponsorships,content(summary,media(epg)))," +\
-                f"seriesStatus,seriesSummary,linescore&season={season}" +\
-                "&eventTypes=primary&scheduleTypes=games,events,xref"
-        elif (
-            (level.lower() == "a")
-            or (level.lower() == "single-a")
-            or (level.lower() == "single a")
-        ):
-            url = "https://statsapi.mlb.com/api/v1/schedule" +\
-                "?lang=en&sportId=14&hydrate=team(venue(timezone))," +\
-                "venue(timezone),game(seriesStatus,seriesSummary,tickets," +\
-                "promotions,sponsorships,content(summary,media(epg)))," +\
-                f"seriesStatus,seriesSummary,linescore&season={season}" +\
-                "&eventTypes=primary&scheduleTypes=games,events,xref"
-        elif (
-            (level.lower() == "a-")
-            or (level.lower() == "short-a")
-            or (level.lower() == "short a")
-        ):
-            url = "https://statsapi.mlb.com/api/v1/schedule" +\
-                "?lang=en&sportId=15&hydrate=team(venue(timezone))," +\
-                "venue(timezone),game(seriesStatus,seriesSummary,tickets," +\
-                "promotions,sponsorships,content(summary,media(epg)))," +\
-                f"seriesStatus,seriesSummary,linescore&season={season}" +\
-                "&eventTypes=primary&scheduleTypes=games,events,xref"
-        elif (
-            (level.lower() == "rk")
-            or (level.lower() == "rok")
-            or (level.lower() == "rookie")
-        ):
-            url = "https://statsapi.mlb.com/api/v1/schedule" +\
-                "?lang=en&sportId=16&hydrate=team(venue(timezone))," +\
-                "venue(timezone),game(seriesStatus,seriesSummary,tickets," +\
-                "promotions,sponsorships,content(summary,media(epg)))," +\
-                f"seriesStatus,seriesSummary,linescore&season={season}" +\
-                "&eventTypes=primary&scheduleTypes=games,events,xref"
-        elif (
-            (level.lower() == "win")
-            or (level.lower() == "winter")
-        ):
-            url = "https://statsapi.mlb.com/api/v1/schedule" +\
-                "?lang=en&sportId=17&hydrate=team(venue(timezone))," +\
-                "venue(timezone),game(seriesStatus,seriesSummary,tickets," +\
-                "promotions,sponsorships,content(summary,media(epg)))," +\
-                f"seriesStatus,seriesSummary,linescore&season={season}" +\
-                "&eventTypes=primary&scheduleTypes=games,events,xref"
-        else:
-            raise ValueError(f"Unhandled MiLB level:\n\t{level}")
-
-        # url = f""
-        response = urlopen(url)
-        time.sleep(2)
-
-        if response.code == 200:
-            pass
-        elif response.code == 403:
-            raise ConnectionRefusedError(
-                "The MiLB API is actively refusing your connection."
-                + "\nHTTP Error Code:\t403"
-            )
-        else:
-            raise ConnectionError(
-                "Could not establish a connection to the MiLB API."
-                + f"\nHTTP Error Code:\t{response.code}"
-            )
+        level_name = MILB_LEVELS[sport_ids[0]]
 
-        json_data = json.loads(response.read())
+    # season = 2023
+    schedule_rows = []
 
-        # with open('test.json', 'w+') as f:
-        #     f.write(json.dumps(json_data, indent=2))
+    cache = get_cache(cache_data=cache_data, cache_dir=cache_dir)
+    url = get_schedule_url(season, sport_ids, hydrate_profile)
+    json_data = get_or_fetch(
+        cache,
+        "schedule",
+        f"{season}_{level_name}_{hydrate_profile}",
+        partial(get_payload, url)
+    )
 
     for d in tqdm(json_data["dates"]):
         game_date = d["date"]
@@ -796,7 +676,7 @@ def get_milb_schedule(
             league_level_link = i["teams"]["home"]["team"]["sport"]["link"]
             league_level_name = i["teams"]["home"]["team"]["sport"]["name"]
 
-            row_df = pd.DataFrame(
+            schedule_rows.append(
                 {
                     "game_pk": game_id,
                     "link": game_link,
@@ -863,13 +743,9 @@ def get_milb_schedule(
                     "league_level_id": league_level_id,
                     "league_level_link": league_level_link,
                     "league_level_name": league_level_name,
-                },
-                index=[0],
+                }
             )
 
-            schedule_df = pd.concat([schedule_df, row_df], ignore_index=True)
-
-            del row_df
             del (
                 game_id,
                 game_link,
@@ -923,7 +799,51 @@ def get_milb_schedule(
                 league_level_name,
             )
 
-    return schedule_df
+    # Built once, since concatenating a one-row `DataFrame`
+    # for every game takes quadratic time.
+    return build_frame(schedule_rows)
+
+
+def split_milb_schedule(schedule_df: pd.DataFrame) -> dict:
+    """
+    Splits a schedule containing multiple MiLB levels
+    (such as one from `get_milb_schedule(season, "all")`)
+    into one schedule per level.
+
+    Returns
+    ----------
+    A `dict`, where each key is the name of a MiLB level in `MILB_LEVELS`,
+    and each value is a pandas `DataFrame` with the games of that level.
+    Levels without any games are left out.
+    """
+    level_dfs = {}
+
+    if len(schedule_df) == 0:
+        return level_dfs
+
+    for sport_id, level_df in schedule_df.groupby(
+        "league_level_id", sort=False
+    ):
+        if sport_id in MILB_LEVELS:
+            level_dfs[MILB_LEVELS[sport_id]] = level_df.reset_index(drop=True)
+
+    return level_dfs
+
+
+def read_schedule_csv(season: int, level_name: str) -> pd.DataFrame:
+    """
+    Reads `{season}_{level_name}_schedule.csv`
+    from the `schedule` release of this repository,
+    or from the local `schedule/` folder while offline.
+    """
+    file_name = f"{season}_{level_name}_schedule.csv"
+
+    if is_offline() is False:
+        return pd.read_csv(f"{SCHEDULE_RELEASE_URL}/{file_name}")
+    elif not os.path.exists(f"schedule/{file_name}"):
+        raise_offline_error(f"schedule/{file_name}")
+
+    return pd.read_csv(f"schedule/{file_name}")
 
 
 def load_milb_schedule(
@@ -948,10 +868,14 @@ def load_milb_schedule(
 
     """
 
-    if level.lower() == "a" and season == 2010:
+    # Schedules rebuilt by `get_alt_schedule()` are read from
+    # their saved CSV files while offline.
+    if is_offline() is True:
+        pass
+    elif level.lower() == "a" and season == 2010:
         df = get_alt_schedule(2010)
         return df
-    if level.lower() == "a" and season == 2013:
+    elif level.lower() == "a" and season == 2013:
         df = get_alt_schedule(2013)
         return df
     elif level.lower() == "a" and season == 2014:
@@ -965,148 +889,128 @@ def load_milb_schedule(
         return df
 
     if level.lower() == "aaa":
-        url = "https://github.com/armstjc/milb-data-repository/releases/" +\
-            f"download/schedule/{season}_aaa_schedule.csv"
-        df = pd.read_csv(url)
+        df = read_schedule_csv(season, "aaa")
         return df
     elif level.lower() == "aa":
-        url = "https://github.com/armstjc/milb-data-repository/releases/" +\
-            f"download/schedule/{season}_aa_schedule.csv"
-        df = pd.read_csv(url)
+        df = read_schedule_csv(season, "aa")
         return df
     elif level.lower() == "a+":
-        url = "https://github.com/armstjc/milb-data-repository/releases/" +\
-            f"download/schedule/{season}_a+_schedule.csv"
-        df = pd.read_csv(url)
+        df = read_schedule_csv(season, "a+")
         return df
     elif level.lower() == "a":
-        url = "https://github.com/armstjc/milb-data-repository/releases/" +\
-            f"download/schedule/{season}_a_schedule.csv"
-        df = pd.read_csv(url)
+        df = read_schedule_csv(season, "a")
         return df
     elif level.lower() == "rk":
-        url = "https://github.com/armstjc/milb-data-repository/releases/" +\
-            f"download/schedule/{season}_rookie_schedule.csv"
-        df = pd.read_csv(url)
+        df = read_schedule_csv(season, "rookie")
         return df
     elif (level.lower() == "win" or level.lower() == "winter"):
-        url = "https://github.com/armstjc/milb-data-repository/releases/" +\
-            f"download/schedule/{season}_winter_schedule.csv"
-        df = pd.read_csv(url)
+        df = read_schedule_csv(season, "winter")
         return df
 
 
-if __name__ == "__main__":
-    now = datetime.now()
-    for season in range(now.year - 1, now.year + 1):
-        try:
-            print(f"Getting {season} Triple-A schedules.")
-            aaa_df = get_milb_schedule(season, "aaa")
-            if len(aaa_df) > 0:
-                aaa_df.to_csv(
-                    f"schedule/{season}_aaa_schedule.csv", index=False
-                )
+def save_milb_schedules(
+    season: int, per_level: bool = False, hydrate_profile: str = "minimal"
+):
+    """
+    Downloads the schedules of every MiLB level for a season,
+    and saves them to `schedule/{season}_{level}_schedule.csv`.
 
-            del aaa_df
+    Parameters
+    ----------
+    `season` (int, mandatory):
+        The season you want MiLB schedules from.
 
-        except Exception as e:
-            print(
-                f"Could not download {season} Triple-A schedules." +
-                f"\nReason:\n{e}"
-            )
+    `per_level` (bool, optional) = `False`:
+        If `False`, the schedules of every level are downloaded
+        in a single request, and split by `league_level_id`.
+        If `True`, (or if that single request fails),
+        one request is made for each level.
 
+    `hydrate_profile` (str, optional) = `"minimal"`:
+        The hydrate profile in `SCHEDULE_HYDRATE_PROFILES`
+        used for these requests.
+    """
+    level_names = {
+        "aaa": "Triple-A",
+        "aa": "Double-A",
+        "a+": "High-A",
+        "a": "Single-A",
+        "a-": "Low-A",
+        "rookie": "Rookie Ball",
+        "winter": "winter league",
+    }
+
+    if per_level is False:
         try:
-            print(f"Getting {season} Double-A schedules.")
-            aa_df = get_milb_schedule(season, "aa")
-            if len(aa_df) > 0:
-                aa_df.to_csv(f"schedule/{season}_aa_schedule.csv", index=False)
-
-            del aa_df
-
-        except Exception as e:
-            print(
-                f"Could not download {season} Double-A schedules." +
-                f"\nReason:\n{e}"
+            print(f"Getting {season} schedules for every MiLB level.")
+            schedule_df = get_milb_schedule(
+                season, "all", hydrate_profile=hydrate_profile
             )
-
-        try:
-            print(f"Getting {season} High-A schedules.")
-            a_df = get_milb_schedule(season, "a+")
-            if len(a_df) > 0:
-                a_df.to_csv(f"schedule/{season}_a+_schedule.csv", index=False)
-
-            del a_df
-
         except Exception as e:
             print(
-                f"Could not download {season} High-A schedules." +
-                f"\nReason:\n{e}"
+                f"Could not download {season} schedules in one request." +
+                f"\nReason:\n{e}\nGetting schedules one level at a time."
             )
+            per_level = True
 
-        try:
-            if season != 2013 and season != 2014:
-                print(f"Getting {season} Single-A schedules.")
-                a_df = get_milb_schedule(season, "a")
-                if len(a_df) > 0:
-                    a_df.to_csv(
-                        f"schedule/{season}_a_schedule.csv", index=False
-                    )
-
-                del a_df
-
-        except Exception as e:
-            print(
-                f"Could not download {season} Single-A schedules." +
-                f"\nReason:\n{e}"
+    if per_level is False:
+        for level, level_df in split_milb_schedule(schedule_df).items():
+            level_df.to_csv(
+                f"schedule/{season}_{level}_schedule.csv", index=False
             )
+        return
 
-        try:
-            print(f"Getting {season} Low-A schedules.")
-            a_df = get_milb_schedule(season, "a-")
-            if len(a_df) > 0:
-                a_df.to_csv(f"schedule/{season}_a-_schedule.csv", index=False)
-
-            del a_df
-
-        except Exception as e:
-            print(
-                f"Could not download {season} Low-A schedules." +
-                f"\nReason:\n{e}"
-            )
+    for level, level_name in level_names.items():
+        if level == "a" and (season == 2013 or season == 2014):
+            continue
 
         try:
-            print(f"Getting {season} Rookie Ball schedules.")
-            rookie_df = get_milb_schedule(season, "rk")
-            if len(rookie_df) > 0:
-                rookie_df.to_csv(
-                    f"schedule/{season}_rookie_schedule.csv",
-                    index=False
+            print(f"Getting {season} {level_name} schedules.")
+            level_df = get_milb_schedule(
+                season, level, hydrate_profile=hydrate_profile
+            )
+            if len(level_df) > 0:
+                level_df.to_csv(
+                    f"schedule/{season}_{level}_schedule.csv", index=False
                 )
 
-            del rookie_df
+            del level_df
 
         except Exception as e:
             print(
-                f"Could not download {season} Rookie Ball schedules." +
+                f"Could not download {season} {level_name} schedules." +
                 f"\nReason:\n{e}"
             )
 
-        try:
-            print(f"Getting {season} winter league schedules.")
-            rookie_df = get_milb_schedule(season, "winter")
-            if len(rookie_df) > 0:
-                rookie_df.to_csv(
-                    f"schedule/{season}_winter_schedule.csv",
-                    index=False
-                )
 
-            del rookie_df
+if __name__ == "__main__":
+    now = datetime.now()
 
-        except Exception as e:
-            print(
-                f"Could not download {season} winter league schedules." +
-                f"\nReason:\n{e}"
-            )
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--per_level",
+        action="store_true",
+        help="Download the schedule of each MiLB level in its own request, "
+        + "instead of every level in a single request."
+    )
+    parser.add_argument(
+        "--hydrate_profile",
+        type=str,
+        required=False,
+        default="minimal",
+        choices=list(SCHEDULE_HYDRATE_PROFILES.keys()),
+        help="How much extra data is hydrated into each schedule request."
+    )
+    add_rate_limit_arguments(parser)
+    args = parser.parse_args()
+    configure_rate_limits_from_args(args)
+
+    for season in range(now.year - 1, now.year + 1):
+        save_milb_schedules(
+            season,
+            per_level=args.per_level,
+            hydrate_profile=args.hydrate_profile
+        )
 
     # a_df = get_milb_schedule(2010, 'a')
     # if len(a_df) > 0:
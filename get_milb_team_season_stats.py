@@ -1,20 +1,40 @@
 import argparse
-import json
-import time
 from datetime import datetime
+from functools import partial
 
 import numpy as np
 import pandas as pd
-import requests
 from tqdm import tqdm
 
 # from get_milb_teams import get_milb_team_list
+from milb_cache import (
+    add_cache_arguments,
+    configure_cache_from_args,
+    get_cache,
+    get_or_fetch,
+    print_cache_summary
+)
+from milb_http import (
+    OfflineError,
+    add_rate_limit_arguments,
+    configure_rate_limits_from_args,
+    get_payload,
+    print_transfer_summary,
+    raise_for_offline_misses,
+    reset_offline_misses
+)
 
 
 def get_milb_team_season_stats(
-    season: int, level: str, stats_type: str = "batting", save: bool = False
+    season: int,
+    level: str,
+    stats_type: str = "batting",
+    save: bool = False,
+    cache_data: bool = False,
+    cache_dir: str = ""
 ) -> pd.DataFrame:
     """ """
+    reset_offline_misses()
     now = datetime.now()
     row_df = pd.DataFrame()
     season_df = pd.DataFrame()
@@ -61,30 +81,15 @@ def get_milb_team_season_stats(
         "&group=hitting&order=desc&sortStat=onBasePlusSlugging" +\
         "&stats=season&limit=200&offset=0"
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_4) " +
-        "AppleWebKit/537.36 (KHTML, like Gecko) " +
-        "Chrome/83.0.4103.97 Safari/537.36"
-    }
+    cache = get_cache(cache_data=cache_data, cache_dir=cache_dir)
 
     if stats_type.lower() == "batting":
-        response = requests.get(batting_url, headers=headers)
-        time.sleep(0.1)
-
-        if response.status_code == 200:
-            pass
-        elif response.status_code == 403:
-            raise ConnectionRefusedError(
-                "\nThe MiLB API is actively refusing your connection." +
-                "\nHTTP Error Code:\t403"
-            )
-        else:
-            raise ConnectionError(
-                "\nCould not establish a connection to the MiLB API." +
-                f"\nHTTP Error Code:\t{response.code}"
-            )
-
-        json_data = json.loads(response.text)
+        json_data = get_or_fetch(
+            cache,
+            "team_season_stats",
+            f"{season}_{level_id}_batting",
+            partial(get_payload, batting_url)
+        )
 
         if json_data["totalSplits"] == 0:
             # If true, we don't have data.
@@ -238,23 +243,12 @@ def get_milb_team_season_stats(
         # season_df['wRC+']
 
     elif stats_type.lower() == "pitching":
-        response = requests.get(pitching_url, headers=headers)
-        time.sleep(0.1)
-
-        if response.status_code == 200:
-            pass
-        elif response.status_code == 403:
-            raise ConnectionRefusedError(
-                "The MiLB API is actively refusing your connection." +
-                "\nHTTP Error Code:\t403"
-            )
-        else:
-            raise ConnectionError(
-                "Could not establish a connection to the MiLB API." +
-                f"\nHTTP Error Code:\t{response.code}"
-            )
-
-        json_data = json.loads(response.text)
+        json_data = get_or_fetch(
+            cache,
+            "team_season_stats",
+            f"{season}_{level_id}_pitching",
+            partial(get_payload, pitching_url)
+        )
 
         if json_data["totalSplits"] == 0:
             # If true, we don't have data.
@@ -440,6 +434,10 @@ def get_milb_team_season_stats(
         season_df.replace([np.inf, -np.inf], None, inplace=True)
         season_df.dropna(subset=["season"], inplace=True)
 
+    # While offline, runs with missing payloads fail
+    # instead of saving incomplete files.
+    raise_for_offline_misses()
+
     if save is True and stats_type == "batting":
         season_df.to_csv(
             f"season_stats/team/{season}_{level.lower()}" +
@@ -453,6 +451,9 @@ def get_milb_team_season_stats(
             index=False,
         )
 
+    print_transfer_summary()
+    print_cache_summary()
+
     return season_df
 
 
@@ -493,7 +494,23 @@ if __name__ == "__main__":
         + "Valid arguments are `batting` or `pitching`.",
     )
 
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        required=False,
+        help="Cache downloaded data in this folder. "
+        + "Data is always cached while `--offline` is set.",
+    )
+
+    add_rate_limit_arguments(parser)
+    add_cache_arguments(parser)
     args = parser.parse_args()
+    configure_rate_limits_from_args(args)
+    configure_cache_from_args(args)
+
+    # Offline runs can only read from the cache.
+    cache_data = args.cache_dir is not None or args.offline is True
+    cache_dir = args.cache_dir or ""
 
     season = args.season
     end_season = args.end_season
@@ -522,8 +539,16 @@ if __name__ == "__main__":
         for s in tqdm(range(season, end_season + 1)):
             try:
                 get_milb_team_season_stats(
-                    season=s, level=lg_level, stats_type=stats_type, save=True
+                    season=s,
+                    level=lg_level,
+                    stats_type=stats_type,
+                    save=True,
+                    cache_data=cache_data,
+                    cache_dir=cache_dir
                 )
+            except OfflineError:
+                # Missing payloads can't be downloaded later in the run.
+                raise
             except Exception:
                 print(
                     f"\nCould not get {lg_level.upper()} {stats_type} " +
@@ -536,7 +561,12 @@ if __name__ == "__main__":
         )
 
         get_milb_team_season_stats(
-            season=season, level=lg_level, stats_type=stats_type, save=True
+            season=season,
+            level=lg_level,
+            stats_type=stats_type,
+            save=True,
+            cache_data=cache_data,
+            cache_dir=cache_dir
         )
 
     # get_milb_team_season_stats(
@@ -1,13 +1,21 @@
-import json
-import time
+import argparse
 from datetime import datetime
-from urllib.request import urlopen
+from functools import partial
 
 import pandas as pd
 from tqdm import tqdm
 
+from milb_cache import get_cache, get_or_fetch
+from milb_http import (
+    add_rate_limit_arguments,
+    configure_rate_limits_from_args,
+    get_payload
+)
 
-def get_milb_team_list(season: int, save=True):
+
+def get_milb_team_list(
+    season: int, save=True, cache_data=False, cache_dir=""
+):
     """
 
     """
@@ -20,23 +28,10 @@ def get_milb_team_list(season: int, save=True):
         raise ValueError(f'`season` cannot be greater than {now.year+1}.')
 
     teams_url = f"https://statsapi.mlb.com/api/v1/teams?season={season}"
-    response = urlopen(teams_url)
-    time.sleep(2)
-
-    if response.code == 200:
-        pass
-    elif response.code == 403:
-        raise ConnectionRefusedError(
-            'The MiLB API is actively refusing your connection.' +
-            '\nHTTP Error Code:\t403'
-        )
-    else:
-        raise ConnectionError(
-            'Could not establish a connection to the MiLB API.' +
-            f'\nHTTP Error Code:\t{response.code}'
-        )
-
-    json_data = json.loads(response.read())
+    cache = get_cache(cache_data=cache_data, cache_dir=cache_dir)
+    json_data = get_or_fetch(
+        cache, "teams", season, partial(get_payload, teams_url)
+    )
 
     for team in tqdm(json_data['teams']):
         team_id = team['id']
@@ -217,6 +212,12 @@ def get_milb_team_list(season: int, save=True):
 
 if __name__ == "__main__":
     now = datetime.now()
+
+    parser = argparse.ArgumentParser()
+    add_rate_limit_arguments(parser)
+    args = parser.parse_args()
+    configure_rate_limits_from_args(args)
+
     # for i in range(now.year, now.year+1):
     for i in range(2015, now.year+1):
         print(f'Getting a list of teams in the MLB API for the {i} season.')
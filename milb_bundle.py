@@ -0,0 +1,359 @@
+"""
+Portable bundles of cached payloads, used to start CI jobs warm.
+
+    python milb_bundle.py export --bundle_path milb_cache_pbp_aa.tar \\
+        --seasons 2025 --levels aa --cache_dir .
+    python milb_bundle.py import --bundle_path milb_cache_pbp_aa.tar \\
+        --cache_dir .
+
+A bundle is a single `.tar` file holding every cached payload
+of the games (and season-wide payloads, such as schedules)
+of some seasons and levels, stored as they are in the cache
+(payloads and frames are already compressed).
+Its `manifest.json` lists the size and SHA-256 hash of each payload,
+and payloads that don't match it are skipped when the bundle is imported,
+along with payloads outside the namespaces in `BUNDLE_NAMESPACES`
+or with keys that aren't a game ID or a season (see `is_valid_entry()`).
+Bundles can be imported into any cache backend.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import tarfile
+import time
+from datetime import datetime
+from io import BytesIO
+
+from tqdm import tqdm
+
+from get_milb_pbp import PBP_FRAMES_NAMESPACE
+from get_milb_player_game_stats import PLAYER_GAME_STATS_FRAMES_NAMESPACE
+from get_milb_schedule import load_milb_schedule
+from milb_cache import (
+    CacheBackend,
+    add_cache_arguments,
+    configure_cache_from_args,
+    get_cache,
+    get_meta_namespace
+)
+from milb_feed import (
+    BOXSCORE_NAMESPACE,
+    BOXSCORE_PROJECTION,
+    FULL_FEED_NAMESPACE,
+    PBP_PROJECTION
+)
+
+# Bump this whenever the layout of bundles changes.
+BUNDLE_VERSION = 1
+
+MANIFEST_NAME = "manifest.json"
+
+# Namespaces payloads can be imported into.
+# Their freshness tags (`{namespace}_meta`) can be imported too.
+BUNDLE_NAMESPACES = (
+    FULL_FEED_NAMESPACE,
+    BOXSCORE_NAMESPACE,
+    PBP_PROJECTION.name,
+    BOXSCORE_PROJECTION.name,
+    PBP_FRAMES_NAMESPACE,
+    PLAYER_GAME_STATS_FRAMES_NAMESPACE,
+    "lineups",
+    "schedule",
+    "teams",
+    "player_season_stats",
+    "team_season_stats",
+)
+
+# Keys start with a game ID or a season,
+# such as `745123`, `745123_v2`, or `2024_a+_full`.
+_KEY_PATTERN = re.compile(r"\d+(_[A-Za-z0-9+]+)*")
+
+
+def is_valid_entry(namespace: str, key: str) -> bool:
+    """
+    Returns `True` if a bundle's payload can be imported
+    under `namespace` and `key`.
+    Bundles are downloaded from releases, so anything else
+    (such as a key of `../../x`, which would be written
+    outside of the cache folder) is rejected.
+    """
+    if not isinstance(namespace, str) or not isinstance(key, str):
+        return False
+    elif namespace not in BUNDLE_NAMESPACES and namespace not in [
+        get_meta_namespace(n) for n in BUNDLE_NAMESPACES
+    ]:
+        return False
+
+    return _KEY_PATTERN.fullmatch(key) is not None
+
+
+def get_member_name(namespace: str, key: str) -> str:
+    """
+    Returns the name of a payload's file inside a bundle.
+    """
+    return f"payloads/{namespace}/{key}"
+
+
+def get_bundle_entries(
+    cache: CacheBackend, seasons: list, levels: list, namespaces: list = None
+) -> list:
+    """
+    Returns the `CacheEntry` of every payload in `cache`
+    belonging to the games of `seasons` and `levels`,
+    or keyed by one of `seasons` (such as `2024_aaa_full`).
+
+    Parameters
+    ----------
+    `cache`: (CacheBackend, mandatory):
+        The cache backend returned by `milb_cache.get_cache()`.
+
+    `seasons`: (list, mandatory):
+        The seasons you want payloads from.
+
+    `levels`: (list, mandatory):
+        The MiLB levels you want game payloads from,
+        as accepted by `load_milb_schedule()`.
+
+    `namespaces`: (list, optional) = `None`:
+        Optional namespaces to limit the bundle to.
+        Freshness tags (`{namespace}_meta`) follow their namespace.
+    """
+    game_ids = set()
+
+    for season in seasons:
+        for level in levels:
+            sched_df = load_milb_schedule(season, level)
+            game_ids.update(str(g) for g in sched_df["game_pk"].to_list())
+
+    entries = []
+
+    for entry in cache.entries():
+        namespace = entry.namespace
+
+        if namespace.endswith("_meta"):
+            namespace = namespace[:-len("_meta")]
+
+        if namespaces is not None and namespace not in namespaces:
+            continue
+
+        match = re.fullmatch(r"(\d{4})(_.*)?", entry.key)
+
+        # Frames are keyed by game ID and parser version (`745123_v2`).
+        if match is not None and int(match.group(1)) in seasons:
+            entries.append(entry)
+        elif entry.key.split("_")[0] in game_ids:
+            entries.append(entry)
+
+    return entries
+
+
+def export_bundle(
+    bundle_path: str,
+    seasons: list,
+    levels: list,
+    namespaces: list = None,
+    cache_dir: str = ""
+) -> int:
+    """
+    Saves the cached payloads returned by `get_bundle_entries()`
+    to a bundle at `bundle_path`.
+    See `get_bundle_entries()` for a description of the other parameters.
+
+    Returns
+    ----------
+    The number of payloads saved to the bundle.
+    """
+    cache = get_cache(cache_data=True, cache_dir=cache_dir)
+    entries = get_bundle_entries(cache, seasons, levels, namespaces)
+    manifest = {
+        "version": BUNDLE_VERSION,
+        "created_at": time.time(),
+        "seasons": list(seasons),
+        "levels": list(levels),
+        "payloads": [],
+    }
+
+    # The bundle is written to a temporary file,
+    # so an interrupted export never replaces a good bundle.
+    temp_path = f"{bundle_path}.tmp"
+
+    with tarfile.open(temp_path, "w") as tar:
+        for entry in tqdm(entries):
+            value = cache.get(entry.namespace, entry.key)
+
+            if value is None:
+                # Evicted since `entries()` was read.
+                continue
+
+            value = bytes(value)
+            name = get_member_name(entry.namespace, entry.key)
+            _add_member(tar, name, value)
+            manifest["payloads"].append({
+                "namespace": entry.namespace,
+                "key": entry.key,
+                "name": name,
+                "size": len(value),
+                "sha256": hashlib.sha256(value).hexdigest(),
+            })
+
+        _add_member(
+            tar, MANIFEST_NAME, json.dumps(manifest, indent=4).encode("utf-8")
+        )
+
+    os.replace(temp_path, bundle_path)
+    print(
+        f"Saved {len(manifest['payloads'])} cached payloads "
+        + f"to `{bundle_path}`."
+    )
+
+    return len(manifest["payloads"])
+
+
+def _add_member(tar: tarfile.TarFile, name: str, value: bytes):
+    info = tarfile.TarInfo(name)
+    info.size = len(value)
+    info.mtime = int(time.time())
+    tar.addfile(info, BytesIO(value))
+
+
+def import_bundle(
+    bundle_path: str, cache_dir: str = "", overwrite: bool = False
+) -> int:
+    """
+    Loads the payloads of a bundle saved by `export_bundle()` into the cache.
+
+    Parameters
+    ----------
+    `bundle_path`: (str, mandatory):
+        The bundle you want to import.
+
+    `cache_dir`: (str, optional) = `""`:
+        The `cache_dir` the PBP and player game stats scripts will use.
+
+    `overwrite`: (bool, optional) = `False`:
+        If `True`, payloads already in the cache are replaced.
+        Otherwise, they're kept, since they may be fresher.
+
+    Returns
+    ----------
+    The number of payloads loaded into the cache.
+    """
+    cache = get_cache(cache_data=True, cache_dir=cache_dir)
+    imported = 0
+    corrupt = 0
+    rejected = 0
+
+    with tarfile.open(bundle_path, "r") as tar:
+        try:
+            manifest = json.loads(tar.extractfile(MANIFEST_NAME).read())
+        except (KeyError, ValueError) as e:
+            raise ValueError(
+                f"`{bundle_path}` is not a valid cache bundle:\n\t{e}"
+            )
+
+        if manifest.get("version", 0) > BUNDLE_VERSION:
+            raise ValueError(
+                "This cache bundle was saved by a newer version "
+                + f"of this repository:\n\t{manifest['version']}"
+            )
+
+        for payload in tqdm(manifest["payloads"]):
+            namespace = payload.get("namespace")
+            key = payload.get("key")
+
+            if is_valid_entry(namespace, key) is False:
+                rejected += 1
+                continue
+            elif overwrite is False and cache.get(namespace, key) is not None:
+                continue
+
+            try:
+                value = tar.extractfile(payload["name"]).read()
+            except (KeyError, AttributeError, tarfile.TarError):
+                corrupt += 1
+                continue
+
+            if len(value) != payload["size"] or \
+                    hashlib.sha256(value).hexdigest() != payload["sha256"]:
+                corrupt += 1
+                continue
+
+            cache.put(namespace, key, value)
+            imported += 1
+
+    print(f"Loaded {imported} cached payloads from `{bundle_path}`.")
+
+    if corrupt > 0:
+        print(
+            f"Skipped {corrupt} payload(s) missing from `{bundle_path}`, "
+            + "or not matching its manifest."
+        )
+
+    if rejected > 0:
+        print(
+            f"Skipped {rejected} payload(s) in `{bundle_path}` "
+            + "with an unknown namespace, or an invalid key."
+        )
+
+    return imported
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", type=str, choices=["export", "import"])
+    parser.add_argument("--bundle_path", type=str, required=True)
+    parser.add_argument(
+        "--seasons",
+        type=int,
+        nargs="+",
+        required=False,
+        default=[datetime.now().year],
+        help="The seasons exported to the bundle.",
+    )
+    parser.add_argument(
+        "--levels",
+        type=str,
+        nargs="+",
+        required=False,
+        help="The MiLB levels whose games are exported to the bundle.",
+    )
+    parser.add_argument(
+        "--namespaces",
+        type=str,
+        nargs="*",
+        required=False,
+        default=None,
+        help="Optional cache namespaces to limit the bundle to.",
+    )
+    parser.add_argument("--cache_dir", type=str, required=False, default="")
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="Replace payloads already in the cache when importing.",
+    )
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+    configure_cache_from_args(args)
+
+    if args.command == "export":
+        if args.levels is None:
+            parser.error("`--levels` is required to export a bundle.")
+
+        export_bundle(
+            args.bundle_path,
+            args.seasons,
+            args.levels,
+            namespaces=args.namespaces,
+            cache_dir=args.cache_dir
+        )
+    elif not os.path.exists(args.bundle_path):
+        # Lets CI jobs run cold when no bundle was published yet.
+        print(f"`{args.bundle_path}` doesn't exist, so nothing was imported.")
+    else:
+        import_bundle(
+            args.bundle_path,
+            cache_dir=args.cache_dir,
+            overwrite=args.overwrite
+        )
@@ -0,0 +1,1839 @@
+"""
+Shared cache for MiLB API payloads.
+
+Every `get_*` function with a `cache_data` argument reads and writes
+its payloads through `get_or_fetch()`.
+Each payload is stored under a namespace (the endpoint it came from,
+such as `pbp`, `lineups`, or `schedule`)
+and a key (such as a game ID or a season),
+in one of the following backends:
+- `filesystem`: One file per payload,
+    at `{cache_path}/{namespace}/{key}.json`
+    (or `.parquet`, for the parsed frames in `{dataset}_frames`).
+    This is the default, and matches the layout of older `.milb` caches.
+- `sqlite`: Every payload in a single SQLite database,
+    at `{cache_path}/cache.sqlite3`.
+- `pack`: Every payload in a few large, append-only segment files,
+    at `{cache_path}/pack/`, read through `mmap`.
+- `memory`: Payloads are kept in memory until the process exits.
+
+The backend is picked with `configure_cache()`,
+`--cache_backend`, or the `MILB_CACHE_BACKEND` environment variable.
+
+The cache can be capped to a size (such as `"2G"`) with `configure_cache()`,
+`--cache_max_size`, or the `MILB_CACHE_MAX_SIZE` environment variable.
+Once the cap is exceeded, the least recently used payloads are evicted,
+except for payloads from the pinned seasons (by default, the current one).
+
+Payloads are cached as the raw bytes the API sent, compressed
+with zstd (if `zstandard` is installed) or gzip, and only decoded on read.
+Uncompressed payloads written by older versions are still read.
+
+Several processes (such as a prefetch and a few level jobs)
+can share one cache folder:
+files are written to a temporary file and renamed into place,
+and the `pack` backend serializes its writes with a lock file.
+
+Payloads that can change after they're downloaded (such as games
+that were still in progress) can be cached with a `Freshness` rule.
+The rule's tags and the download time are saved in `{namespace}_meta`,
+and stale payloads are downloaded again by `get_or_fetch()`.
+
+Cache hits, misses, stale payloads, and bytes read and written
+are counted by namespace, and printed by `print_cache_summary()`
+at the end of each run.
+Set `--cache_stats_path` or the `MILB_CACHE_STATS_PATH`
+environment variable to also save them to a JSON file.
+"""
+import atexit
+import gzip
+import json
+import mmap
+import os
+import re
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from importlib.util import find_spec
+from typing import Callable, NamedTuple
+
+from milb_http import is_offline, raise_offline_error
+
+if find_spec("zstandard") is not None:
+    import zstandard
+else:
+    zstandard = None
+
+if os.name == "nt":
+    import msvcrt
+    fcntl = None
+else:
+    import fcntl
+    msvcrt = None
+
+# Name of the backend used by `get_cache()`.
+CACHE_BACKEND = os.environ.get("MILB_CACHE_BACKEND", "filesystem")
+
+# Compression applied to cached payloads: `zstd`, `gzip`, or `none`.
+if zstandard is not None:
+    CACHE_COMPRESSION = os.environ.get("MILB_CACHE_COMPRESSION", "zstd")
+else:
+    CACHE_COMPRESSION = os.environ.get("MILB_CACHE_COMPRESSION", "gzip")
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+# Size cap of the cache, in bytes or with a suffix (such as `"2G"`),
+# or `None` for no cap.
+CACHE_MAX_SIZE = os.environ.get("MILB_CACHE_MAX_SIZE")
+
+# Payloads from these seasons are never evicted.
+PINNED_SEASONS = (datetime.now().year,)
+
+# Once the size cap is exceeded,
+# payloads are evicted until the cache is this share of the cap,
+# so evictions don't run on every write.
+EVICT_TARGET = 0.9
+
+# Evictions only compact a backend once deleted payloads
+# take up at least this share of its space,
+# since compacting rewrites every payload still cached.
+COMPACT_THRESHOLD = 0.5
+
+# Optional JSON file `print_cache_summary()` saves the cache stats to.
+CACHE_STATS_PATH = os.environ.get("MILB_CACHE_STATS_PATH")
+
+# File suffix of the payloads of the `filesystem` backend,
+# by the end of their namespace's name.
+# Payloads of every other namespace are saved as `.json` files.
+FILE_SUFFIXES = {
+    "_frames": ".parquet",
+}
+
+# Number of attempts made at renaming a temporary file into place.
+# On Windows, a file can't be replaced while another process reads it.
+REPLACE_ATTEMPTS = 5
+
+# Seconds between updates of the time a `sqlite` payload was last used,
+# so reads rarely need the database's write lock.
+USED_UPDATE_INTERVAL = 10 * 60
+
+# Temporary files older than this many seconds
+# were left behind by an interrupted write,
+# and are removed when the cache is opened.
+STALE_TEMP_AGE = 60 * 60
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+_caches = {}
+
+_cache_stats = {}
+_cache_stats_lock = threading.Lock()
+_caches_lock = threading.Lock()
+
+# `tempfile.mkstemp()` creates files only their owner can read,
+# so cached files are given the permissions `open()` would have.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def write_atomic(path: str, data: bytes):
+    """
+    Writes `data` to `path` through a temporary file in the same folder,
+    so other processes never read a partially written file.
+    """
+    folder, name = os.path.split(path)
+    fd, temp_path = tempfile.mkstemp(
+        dir=folder, prefix=f".{name}.", suffix=".tmp"
+    )
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+
+        os.chmod(temp_path, 0o666 & ~_UMASK)
+
+        for attempt in range(REPLACE_ATTEMPTS):
+            try:
+                os.replace(temp_path, path)
+                break
+            except PermissionError:
+                if attempt == REPLACE_ATTEMPTS - 1:
+                    raise
+                time.sleep(0.05 * (attempt + 1))
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def remove_stale_temp_files(folder: str):
+    """
+    Removes the temporary files `write_atomic()` left in `folder`
+    when a write was interrupted
+    (those older than `STALE_TEMP_AGE` seconds).
+    """
+    now = time.time()
+
+    try:
+        files = list(os.scandir(folder))
+    except FileNotFoundError:
+        return
+
+    for file in files:
+        if not file.name.startswith(".") or not file.name.endswith(".tmp"):
+            continue
+
+        try:
+            if now - file.stat().st_mtime > STALE_TEMP_AGE:
+                os.remove(file.path)
+        except OSError:
+            # Already removed, or still open on Windows.
+            pass
+
+
+class FileLock:
+    """
+    Advisory lock on a file, shared by every process and thread
+    using the same path, and used as a context manager.
+    A thread already holding the lock can acquire it again.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def __enter__(self):
+        self._lock.acquire()
+
+        if self._depth == 0:
+            self._file = open(self.path, "a+b")
+
+            try:
+                if fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+                else:
+                    self._lock_windows()
+            except BaseException:
+                self._file.close()
+                self._lock.release()
+                raise
+
+        self._depth += 1
+        return self
+
+    def _lock_windows(self):
+        self._file.seek(0)
+
+        while True:
+            try:
+                # `LK_LOCK` gives up after 10 seconds, so it's retried
+                # until the lock is released.
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._depth -= 1
+
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+
+            self._file.close()
+            self._file = None
+
+        self._lock.release()
+
+
+class CacheEntry(NamedTuple):
+    """
+    A payload stored in a cache backend, as listed by `entries()`.
+
+    `last_used`:
+        A number that sorts entries from least to most recently used
+        (or, for some backends, least to most recently cached).
+    """
+    namespace: str
+    key: str
+    size: int
+    last_used: float
+
+
+class CacheBackend:
+    """
+    Base class of every cache backend.
+    Payloads are stored as `bytes`,
+    under a namespace and a key (both `str`).
+    """
+
+    def get(self, namespace: str, key: str):
+        """
+        Returns the payload stored under `namespace` and `key`,
+        or `None` if nothing is stored there.
+        """
+        raise NotImplementedError
+
+    def peek(self, namespace: str, key: str):
+        """
+        Same as `get()`, but doesn't mark the payload as used,
+        so reading it doesn't change which payloads are evicted first.
+        """
+        return self.get(namespace, key)
+
+    def put(self, namespace: str, key: str, value: bytes):
+        """
+        Stores `value` under `namespace` and `key`,
+        replacing anything stored there.
+        """
+        raise NotImplementedError
+
+    def delete(self, namespace: str, key: str):
+        """
+        Removes the payload stored under `namespace` and `key`, if any.
+        """
+        raise NotImplementedError
+
+    def keys(self, namespace: str) -> list:
+        """
+        Returns every key stored in `namespace`.
+        """
+        raise NotImplementedError
+
+    def entries(self) -> list:
+        """
+        Returns a `CacheEntry` for every stored payload.
+        """
+        raise NotImplementedError
+
+    def compact(self):
+        """
+        Frees the space used by deleted payloads,
+        for backends that don't free it on their own.
+        """
+        pass
+
+    def get_dead_size(self) -> tuple:
+        """
+        Returns the number of bytes used by deleted payloads
+        that `compact()` would free,
+        and the number of bytes used by the whole backend.
+        """
+        return 0, 0
+
+
+class FileSystemCache(CacheBackend):
+    """
+    Stores each payload in its own file,
+    at `{cache_path}/{namespace}/{key}.json`,
+    or with the suffix in `FILE_SUFFIXES` for its namespace.
+    The modification time of a file is updated when it's read,
+    so it doubles as the time the payload was last used.
+    """
+
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+
+        try:
+            namespaces = [
+                n.path for n in os.scandir(cache_path) if n.is_dir()
+            ]
+        except FileNotFoundError:
+            namespaces = []
+
+        for namespace in namespaces:
+            remove_stale_temp_files(namespace)
+
+    @staticmethod
+    def _get_suffix(namespace: str) -> str:
+        for end, suffix in FILE_SUFFIXES.items():
+            if namespace.endswith(end):
+                return suffix
+        return ".json"
+
+    def _get_path(self, namespace: str, key: str) -> str:
+        suffix = self._get_suffix(namespace)
+        return f"{self.cache_path}/{namespace}/{key}{suffix}"
+
+    def get(self, namespace: str, key: str):
+        value = self.peek(namespace, key)
+
+        if value is None:
+            return None
+
+        try:
+            os.utime(self._get_path(namespace, key))
+        except OSError:
+            # Read-only caches are still readable.
+            pass
+
+        return value
+
+    def peek(self, namespace: str, key: str):
+        try:
+            with open(self._get_path(namespace, key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            if not self._rename_legacy_file(namespace, key):
+                return None
+            return self.peek(namespace, key)
+
+    def _rename_legacy_file(self, namespace: str, key: str) -> bool:
+        """
+        Renames a payload saved as `{key}.json` by older versions
+        to its namespace's suffix.
+        Returns `True` if there was such a payload.
+        """
+        if self._get_suffix(namespace) == ".json":
+            return False
+
+        try:
+            os.replace(
+                f"{self.cache_path}/{namespace}/{key}.json",
+                self._get_path(namespace, key)
+            )
+        except OSError:
+            return False
+
+        return True
+
+    def put(self, namespace: str, key: str, value: bytes):
+        os.makedirs(f"{self.cache_path}/{namespace}", exist_ok=True)
+        write_atomic(self._get_path(namespace, key), value)
+
+    def delete(self, namespace: str, key: str):
+        for path in (
+            self._get_path(namespace, key),
+            f"{self.cache_path}/{namespace}/{key}.json"
+        ):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _split_name(file_name: str, suffix: str):
+        # Older versions saved every payload as a `.json` file.
+        for s in (suffix, ".json"):
+            if file_name.endswith(s):
+                return file_name[:-len(s)]
+        return None
+
+    def keys(self, namespace: str) -> list:
+        try:
+            files = os.listdir(f"{self.cache_path}/{namespace}")
+        except FileNotFoundError:
+            return []
+
+        suffix = self._get_suffix(namespace)
+        keys = [self._split_name(f, suffix) for f in files]
+        return list(dict.fromkeys(k for k in keys if k is not None))
+
+    def entries(self) -> list:
+        entries = []
+
+        try:
+            namespaces = os.scandir(self.cache_path)
+        except FileNotFoundError:
+            return entries
+
+        for namespace in namespaces:
+            if not namespace.is_dir():
+                continue
+
+            suffix = self._get_suffix(namespace.name)
+
+            for file in os.scandir(namespace.path):
+                key = self._split_name(file.name, suffix)
+                if key is None:
+                    continue
+
+                try:
+                    stat = file.stat()
+                except FileNotFoundError:
+                    # Deleted by another process.
+                    continue
+
+                entries.append(CacheEntry(
+                    namespace.name,
+                    key,
+                    stat.st_size,
+                    stat.st_mtime
+                ))
+
+        return entries
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Stores every payload in a single SQLite database,
+    at `{cache_path}/cache.sqlite3`,
+    along with the time each payload was last used.
+
+    That time is only updated once every `USED_UPDATE_INTERVAL` seconds,
+    and updates are saved along with the next write
+    (or when the process exits), so reads never wait on other writers.
+    """
+
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        os.makedirs(cache_path, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._used = {}
+        atexit.register(self._save_used)
+
+        # Waits up to 30 seconds for other processes' writes.
+        self._connection = sqlite3.connect(
+            f"{cache_path}/cache.sqlite3",
+            timeout=30,
+            check_same_thread=False
+        )
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS payloads ("
+                + "namespace TEXT NOT NULL, "
+                + "key TEXT NOT NULL, "
+                + "value BLOB NOT NULL, "
+                + "used REAL NOT NULL DEFAULT 0, "
+                + "PRIMARY KEY (namespace, key))"
+            )
+
+            # Databases created by older versions have no `used` column.
+            columns = [
+                row[1] for row in
+                self._connection.execute("PRAGMA table_info(payloads)")
+            ]
+            if "used" not in columns:
+                self._connection.execute(
+                    "ALTER TABLE payloads "
+                    + "ADD COLUMN used REAL NOT NULL DEFAULT 0"
+                )
+            self._connection.commit()
+
+    def get(self, namespace: str, key: str):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, used FROM payloads "
+                + "WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            now = time.time()
+            if now - row[1] >= USED_UPDATE_INTERVAL:
+                self._used[(namespace, key)] = now
+
+        return bytes(row[0])
+
+    def peek(self, namespace: str, key: str):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM payloads WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+
+        return None if row is None else bytes(row[0])
+
+    def _save_used(self):
+        """
+        Saves the times payloads were last used, recorded by `get()`.
+        """
+        with self._lock:
+            if len(self._used) == 0:
+                return
+
+            try:
+                self._connection.executemany(
+                    "UPDATE payloads SET used = ? "
+                    + "WHERE namespace = ? AND key = ?",
+                    [
+                        (used, namespace, key)
+                        for (namespace, key), used in self._used.items()
+                    ]
+                )
+                self._connection.commit()
+            except sqlite3.Error:
+                # Read-only (or closed) databases are still readable.
+                try:
+                    self._connection.rollback()
+                except sqlite3.Error:
+                    pass
+
+            self._used = {}
+
+    def put(self, namespace: str, key: str, value: bytes):
+        self._save_used()
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO payloads "
+                + "(namespace, key, value, used) VALUES (?, ?, ?, ?)",
+                (namespace, key, sqlite3.Binary(value), time.time())
+            )
+            self._connection.commit()
+
+    def delete(self, namespace: str, key: str):
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM payloads WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            )
+            self._connection.commit()
+
+    def keys(self, namespace: str) -> list:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key FROM payloads WHERE namespace = ?",
+                (namespace,)
+            ).fetchall()
+
+        return [row[0] for row in rows]
+
+    def entries(self) -> list:
+        self._save_used()
+
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT namespace, key, length(value), used FROM payloads"
+            ).fetchall()
+
+        return [CacheEntry(*row) for row in rows]
+
+    def compact(self):
+        with self._lock:
+            try:
+                self._connection.execute("VACUUM")
+            except sqlite3.OperationalError:
+                # Other processes are using the database.
+                pass
+
+    def get_dead_size(self) -> tuple:
+        with self._lock:
+            page_size = self._connection.execute(
+                "PRAGMA page_size"
+            ).fetchone()[0]
+            page_count = self._connection.execute(
+                "PRAGMA page_count"
+            ).fetchone()[0]
+            free_pages = self._connection.execute(
+                "PRAGMA freelist_count"
+            ).fetchone()[0]
+
+        return free_pages * page_size, page_count * page_size
+
+
+class PackCache(CacheBackend):
+    """
+    Stores every payload in a few large, append-only segment files,
+    at `{cache_path}/pack/segment-{number}.pack`,
+    with an index of where each payload is stored,
+    at `{cache_path}/pack/index.log`.
+
+    Segments are read through `mmap`,
+    so any payload can be read without scanning the segments,
+    and a cache with tens of thousands of games
+    is only a handful of files to list, copy, or back up.
+    Replaced and deleted payloads stay in their segment
+    until `compact()` is called.
+    Compacting copies every live payload into new segments
+    (segment numbers are never reused) and replaces `index.log`,
+    which other processes see as a new generation of the pack:
+    they reload the index and reopen their segments.
+    Reads aren't recorded, so entries are evicted
+    from least to most recently cached.
+
+    Processes sharing a pack take turns writing to it
+    through a lock file, at `{cache_path}/pack.lock`,
+    and pick up each other's index entries from `index.log`.
+    """
+    SEGMENT_SIZE = 256 * 1024 * 1024
+
+    # Every record in a segment starts with this header,
+    # followed by the namespace, key, and payload,
+    # so the index can be rebuilt from the segments alone.
+    # Deleted payloads are recorded with this payload length.
+    _MAGIC = b"MLBP"
+    _RECORD_HEADER = struct.Struct("<4sHHI")
+    _TOMBSTONE = 0xFFFFFFFF
+
+    def __init__(self, cache_path: str, pack_name: str = "pack"):
+        self.cache_path = cache_path
+        self.pack_path = f"{cache_path}/{pack_name}"
+        os.makedirs(self.pack_path, exist_ok=True)
+        remove_stale_temp_files(self.pack_path)
+
+        self._lock = threading.RLock()
+        self._file_lock = FileLock(f"{cache_path}/{pack_name}.lock")
+        self._index = {}
+        self._maps = {}
+        self._segment = 0
+
+        # The `index.log` file read so far (as a `(st_dev, st_ino)` tuple),
+        # and how many of its bytes were read.
+        self._index_file = None
+        self._index_read = 0
+        self._load_index()
+
+    def _get_segment_path(self, segment: int) -> str:
+        return f"{self.pack_path}/segment-{segment:05d}.pack"
+
+    def _get_segments(self) -> list:
+        segments = []
+
+        for file in os.listdir(self.pack_path):
+            if file.startswith("segment-") and file.endswith(".pack"):
+                segments.append(int(file[len("segment-"):-len(".pack")]))
+
+        return sorted(segments)
+
+    def _load_index(self):
+        with self._lock, self._file_lock:
+            self.close()
+            self._index = {}
+            self._index_file = None
+            self._index_read = 0
+
+            segments = self._get_segments()
+            self._segment = segments[-1] if len(segments) > 0 else 0
+            index_path = f"{self.pack_path}/index.log"
+
+            if not os.path.exists(index_path) and len(segments) > 0:
+                self.rebuild_index()
+                return
+
+            try:
+                with open(index_path, "rb") as f:
+                    if f.seek(0, os.SEEK_END) > 0:
+                        f.seek(-1, os.SEEK_END)
+
+                        if f.read(1) != b"\n":
+                            # Ends the line cut short by an interrupted
+                            # write, so the next entry starts on its own line.
+                            with open(index_path, "ab") as f_append:
+                                f_append.write(b"\n")
+            except FileNotFoundError:
+                return
+
+            self._refresh_index()
+
+    def _refresh_index(self):
+        """
+        Reads the `index.log` entries written since the last read,
+        such as those written by other processes.
+        """
+        with self._lock:
+            try:
+                with open(f"{self.pack_path}/index.log", "rb") as f:
+                    stat = os.fstat(f.fileno())
+                    index_file = (stat.st_dev, stat.st_ino)
+
+                    if self._index_file is not None and (
+                        index_file != self._index_file
+                        or stat.st_size < self._index_read
+                    ):
+                        # The index was rebuilt or compacted
+                        # by another process (a new generation),
+                        # so segments mapped so far may be gone.
+                        self._load_index()
+                        return
+
+                    f.seek(self._index_read)
+                    data = f.read()
+            except FileNotFoundError:
+                return
+
+            self._index_file = index_file
+
+            # Lines still being written by another process
+            # are read once they're complete.
+            data = data[:data.rfind(b"\n") + 1]
+            self._index_read += len(data)
+
+            for line in data.decode("utf-8").splitlines():
+                fields = line.split("\t")
+
+                # Skips lines cut short by an interrupted write.
+                if len(fields) != 5:
+                    continue
+
+                namespace, key, segment, offset, length = fields
+                if int(length) < 0:
+                    self._index.pop((namespace, key), None)
+                else:
+                    self._index[(namespace, key)] = (
+                        int(segment), int(offset), int(length)
+                    )
+
+    @staticmethod
+    def _get_index_line(namespace: str, key: str, entry: tuple) -> str:
+        segment, offset, length = entry
+        return f"{namespace}\t{key}\t{segment}\t{offset}\t{length}\n"
+
+    def _write_index(self, namespace: str, key: str, entry: tuple):
+        with open(f"{self.pack_path}/index.log", "a") as f:
+            f.write(self._get_index_line(namespace, key, entry))
+
+    def _get_map(self, segment: int, end: int):
+        mm = self._maps.get(segment)
+
+        if mm is not None and len(mm) >= end:
+            return mm
+        elif mm is not None:
+            # The segment has grown since it was mapped.
+            mm.close()
+            del self._maps[segment]
+
+        try:
+            with open(self._get_segment_path(segment), "rb") as f:
+                if os.fstat(f.fileno()).st_size < end:
+                    return None
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+
+        self._maps[segment] = mm
+        return mm
+
+    def _read_entry(self, namespace: str, key: str, entry: tuple):
+        """
+        Returns the payload `entry` points to,
+        or `None` if the record there isn't for `namespace` and `key`.
+        """
+        segment, offset, length = entry
+        name = namespace.encode("utf-8") + key.encode("utf-8")
+        start = offset - len(name) - self._RECORD_HEADER.size
+        mm = self._get_map(segment, offset + length)
+
+        if mm is None or start < 0:
+            return None
+
+        header = self._RECORD_HEADER.unpack_from(mm, start)
+        expected = (
+            self._MAGIC,
+            len(namespace.encode("utf-8")),
+            len(key.encode("utf-8")),
+            length
+        )
+
+        if header != expected or \
+                mm[start + self._RECORD_HEADER.size:offset] != name:
+            return None
+
+        return mm[offset:offset + length]
+
+    def _check_generation(self):
+        """
+        Reloads the index, and reopens every segment,
+        if another process compacted or rebuilt the pack.
+        """
+        try:
+            stat = os.stat(f"{self.pack_path}/index.log")
+        except FileNotFoundError:
+            return
+
+        if self._index_file is not None and \
+                (stat.st_dev, stat.st_ino) != self._index_file:
+            self._load_index()
+
+    def get(self, namespace: str, key: str):
+        with self._lock:
+            self._check_generation()
+
+            if (namespace, key) not in self._index:
+                self._refresh_index()
+
+            entry = self._index.get((namespace, key))
+            if entry is None:
+                return None
+
+            value = self._read_entry(namespace, key, entry)
+
+            if value is None:
+                # The segments were rewritten by another process.
+                self._load_index()
+                entry = self._index.get((namespace, key))
+                if entry is not None:
+                    value = self._read_entry(namespace, key, entry)
+
+            return value
+
+    def _get_record(
+        self, namespace: str, key: str, value: bytes, value_len: int
+    ) -> bytes:
+        namespace_bytes = namespace.encode("utf-8")
+        key_bytes = key.encode("utf-8")
+        header = self._RECORD_HEADER.pack(
+            self._MAGIC, len(namespace_bytes), len(key_bytes), value_len
+        )
+        return header + namespace_bytes + key_bytes + value
+
+    def _append_record(
+        self, namespace: str, key: str, value: bytes, value_len: int
+    ) -> tuple:
+        record = self._get_record(namespace, key, value, value_len)
+
+        with self._lock, self._file_lock:
+            # Another process may have started a new segment.
+            segments = self._get_segments()
+            if len(segments) > 0:
+                self._segment = max(self._segment, segments[-1])
+
+            path = self._get_segment_path(self._segment)
+            try:
+                size = os.path.getsize(path)
+            except FileNotFoundError:
+                size = 0
+
+            if size > 0 and size + len(record) > self.SEGMENT_SIZE:
+                self._segment += 1
+                path = self._get_segment_path(self._segment)
+                size = 0
+
+            with open(path, "ab") as f:
+                f.write(record)
+
+            return (self._segment, size + len(record) - len(value))
+
+    def put(self, namespace: str, key: str, value: bytes):
+        with self._lock, self._file_lock:
+            segment, offset = self._append_record(
+                namespace, key, value, len(value)
+            )
+            entry = (segment, offset, len(value))
+            self._index[(namespace, key)] = entry
+            self._write_index(namespace, key, entry)
+
+    def delete(self, namespace: str, key: str):
+        with self._lock, self._file_lock:
+            self._refresh_index()
+
+            if self._index.pop((namespace, key), None) is not None:
+                self._append_record(namespace, key, b"", self._TOMBSTONE)
+                self._write_index(namespace, key, (-1, -1, -1))
+
+    def keys(self, namespace: str) -> list:
+        with self._lock:
+            self._refresh_index()
+            return [k for n, k in self._index if n == namespace]
+
+    def entries(self) -> list:
+        with self._lock:
+            self._refresh_index()
+            return [
+                CacheEntry(
+                    namespace,
+                    key,
+                    length,
+                    segment * self.SEGMENT_SIZE + offset
+                )
+                for (namespace, key), (segment, offset, length)
+                in self._index.items()
+            ]
+
+    def close(self):
+        """
+        Closes every memory-mapped segment.
+        """
+        with self._lock:
+            for mm in self._maps.values():
+                mm.close()
+            self._maps = {}
+
+    def rebuild_index(self):
+        """
+        Rebuilds `index.log` by scanning every segment.
+        """
+        with self._lock, self._file_lock:
+            self.close()
+            self._index = {}
+
+            for segment in self._get_segments():
+                with open(self._get_segment_path(segment), "rb") as f:
+                    data = f.read()
+
+                offset = 0
+                while offset + self._RECORD_HEADER.size <= len(data):
+                    magic, namespace_len, key_len, value_len = \
+                        self._RECORD_HEADER.unpack_from(data, offset)
+                    if magic != self._MAGIC:
+                        break
+
+                    offset += self._RECORD_HEADER.size
+                    namespace = data[offset:offset + namespace_len].decode()
+                    offset += namespace_len
+                    key = data[offset:offset + key_len].decode()
+                    offset += key_len
+
+                    if value_len == self._TOMBSTONE:
+                        self._index.pop((namespace, key), None)
+                        continue
+                    elif offset + value_len > len(data):
+                        break
+
+                    self._index[(namespace, key)] = (
+                        segment, offset, value_len
+                    )
+                    offset += value_len
+
+            index = "".join(
+                self._get_index_line(namespace, key, entry)
+                for (namespace, key), entry in self._index.items()
+            ).encode("utf-8")
+            write_atomic(f"{self.pack_path}/index.log", index)
+
+            stat = os.stat(f"{self.pack_path}/index.log")
+            self._index_file = (stat.st_dev, stat.st_ino)
+            self._index_read = len(index)
+
+    def _get_record_size(self, namespace: str, key: str, length: int):
+        return self._RECORD_HEADER.size + len(namespace.encode("utf-8")) + \
+            len(key.encode("utf-8")) + length
+
+    def get_dead_size(self) -> tuple:
+        with self._lock:
+            self._refresh_index()
+            live_size = sum(
+                self._get_record_size(namespace, key, length)
+                for (namespace, key), (_, _, length) in self._index.items()
+            )
+
+            total_size = 0
+            for segment in self._get_segments():
+                try:
+                    total_size += os.path.getsize(
+                        self._get_segment_path(segment)
+                    )
+                except FileNotFoundError:
+                    pass
+
+        return max(0, total_size - live_size), total_size
+
+    def compact(self):
+        """
+        Copies every payload still in the index into new segments,
+        and deletes the old segments,
+        dropping the space used by replaced and deleted payloads.
+        """
+        with self._lock, self._file_lock:
+            self._refresh_index()
+            old_segments = self._get_segments()
+
+            if len(old_segments) > 0:
+                self._segment = max(self._segment, old_segments[-1]) + 1
+
+            index = {}
+            f = None
+            size = 0
+
+            try:
+                # Payloads are copied from oldest to newest,
+                # so eviction order is kept.
+                for (namespace, key), entry in sorted(
+                    self._index.items(), key=lambda item: item[1][:2]
+                ):
+                    value = self._read_entry(namespace, key, entry)
+                    if value is None:
+                        continue
+
+                    record = self._get_record(
+                        namespace, key, value, len(value)
+                    )
+
+                    if f is None or (
+                        size > 0 and size + len(record) > self.SEGMENT_SIZE
+                    ):
+                        if f is not None:
+                            f.close()
+                            self._segment += 1
+
+                        f = open(self._get_segment_path(self._segment), "wb")
+                        size = 0
+
+                    f.write(record)
+                    size += len(record)
+                    index[(namespace, key)] = (
+                        self._segment, size - len(value), len(value)
+                    )
+            finally:
+                if f is not None:
+                    f.close()
+
+            # Replacing `index.log` switches every process
+            # over to the new segments.
+            data = "".join(
+                self._get_index_line(namespace, key, entry)
+                for (namespace, key), entry in index.items()
+            ).encode("utf-8")
+            write_atomic(f"{self.pack_path}/index.log", data)
+
+            self.close()
+            self._index = index
+            stat = os.stat(f"{self.pack_path}/index.log")
+            self._index_file = (stat.st_dev, stat.st_ino)
+            self._index_read = len(data)
+
+            for segment in old_segments:
+                try:
+                    os.remove(self._get_segment_path(segment))
+                except OSError:
+                    # On Windows, another process still has it mapped.
+                    # It's deleted by the next compaction.
+                    pass
+
+
+class MemoryCache(CacheBackend):
+    """
+    Keeps every payload in memory until the process exits.
+    """
+
+    def __init__(self, cache_path: str = None):
+        self.cache_path = cache_path
+        self._payloads = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str):
+        with self._lock:
+            if (namespace, key) not in self._payloads:
+                return None
+
+            self._payloads.move_to_end((namespace, key))
+            return self._payloads[(namespace, key)]
+
+    def peek(self, namespace: str, key: str):
+        with self._lock:
+            return self._payloads.get((namespace, key))
+
+    def put(self, namespace: str, key: str, value: bytes):
+        with self._lock:
+            self._payloads[(namespace, key)] = value
+            self._payloads.move_to_end((namespace, key))
+
+    def delete(self, namespace: str, key: str):
+        with self._lock:
+            self._payloads.pop((namespace, key), None)
+
+    def keys(self, namespace: str) -> list:
+        with self._lock:
+            return [k for n, k in self._payloads if n == namespace]
+
+    def entries(self) -> list:
+        with self._lock:
+            return [
+                CacheEntry(namespace, key, len(value), i)
+                for i, ((namespace, key), value)
+                in enumerate(self._payloads.items())
+            ]
+
+
+class BoundedCache(CacheBackend):
+    """
+    Wraps another cache backend,
+    evicting its least recently used payloads
+    whenever it grows past `max_size` bytes.
+    See `evict_cache()` for how payloads are picked.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        max_size: int,
+        pinned_seasons: tuple = ()
+    ):
+        self.backend = backend
+        self.cache_path = backend.cache_path
+        self.max_size = max_size
+        self.pinned_seasons = pinned_seasons
+
+        self._lock = threading.Lock()
+        self._size = None
+        self._floor = 0
+
+    def get(self, namespace: str, key: str):
+        return self.backend.get(namespace, key)
+
+    def peek(self, namespace: str, key: str):
+        return self.backend.peek(namespace, key)
+
+    def put(self, namespace: str, key: str, value: bytes):
+        self.backend.put(namespace, key, value)
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(e.size for e in self.backend.entries())
+            else:
+                # Replaced payloads are counted twice
+                # until the next eviction recounts the cache.
+                self._size += len(value)
+
+            # If pinned payloads alone exceed the cap,
+            # evictions wait until the cache grows by another 10%.
+            limit = max(self.max_size, self._floor + self.max_size // 10)
+
+            if self._size > limit:
+                self._size = evict_cache(
+                    self.backend,
+                    int(self.max_size * EVICT_TARGET),
+                    self.pinned_seasons
+                )
+                self._floor = self._size
+
+    def delete(self, namespace: str, key: str):
+        self.backend.delete(namespace, key)
+
+    def keys(self, namespace: str) -> list:
+        return self.backend.keys(namespace)
+
+    def entries(self) -> list:
+        return self.backend.entries()
+
+    def compact(self):
+        self.backend.compact()
+
+    def get_dead_size(self) -> tuple:
+        return self.backend.get_dead_size()
+
+
+CACHE_BACKENDS = {
+    "filesystem": FileSystemCache,
+    "sqlite": SQLiteCache,
+    "pack": PackCache,
+    "memory": MemoryCache,
+}
+
+
+def configure_cache(
+    backend: str = None,
+    compression: str = None,
+    max_size=None,
+    pinned_seasons: list = None
+):
+    """
+    Changes the backend used by `get_cache()`,
+    the compression applied to newly cached payloads,
+    and/or the size cap of the cache.
+
+    Parameters
+    ----------
+    `backend`: (str, optional) = `None`:
+        Optional key of `CACHE_BACKENDS`.
+
+    `compression`: (str, optional) = `None`:
+        Optional compression, either `"zstd"`, `"gzip"`, or `"none"`.
+        `"zstd"` requires the `zstandard` package.
+
+    `max_size`: (int or str, optional) = `None`:
+        Optional size cap of the cache,
+        in bytes or with a suffix (such as `"500M"` or `"2G"`).
+        `0` or `"none"` removes the cap.
+
+    `pinned_seasons`: (list, optional) = `None`:
+        Optional seasons whose payloads are never evicted.
+    """
+    global CACHE_BACKEND, CACHE_COMPRESSION, CACHE_MAX_SIZE, PINNED_SEASONS
+
+    if backend is not None and backend not in CACHE_BACKENDS:
+        raise ValueError(
+            f"Unhandled cache backend:\n\t{backend}\n"
+            + f"Supported backends:\t{', '.join(CACHE_BACKENDS.keys())}"
+        )
+    elif backend is not None:
+        CACHE_BACKEND = backend
+
+    if compression is not None and \
+            compression not in ("zstd", "gzip", "none"):
+        raise ValueError(f"Unhandled cache compression:\n\t{compression}")
+    elif compression == "zstd" and zstandard is None:
+        raise ModuleNotFoundError(
+            "zstd compression requires the `zstandard` package."
+        )
+    elif compression is not None:
+        CACHE_COMPRESSION = compression
+
+    if max_size is not None:
+        CACHE_MAX_SIZE = parse_size(max_size)
+
+    if pinned_seasons is not None:
+        PINNED_SEASONS = tuple(pinned_seasons)
+
+
+def parse_size(size):
+    """
+    Converts a cache size, such as `"500M"` or `"2G"`, into bytes.
+    Returns `None` for `None`, `0`, or `"none"` (no size cap).
+    """
+    if size is None or isinstance(size, int):
+        return size or None
+
+    match = re.fullmatch(
+        r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)B?\s*", size, re.IGNORECASE
+    )
+
+    if size.lower() == "none":
+        return None
+    elif match is None:
+        raise ValueError(f"Unhandled cache size:\n\t{size}")
+
+    power = " KMGT".index(match.group(2).upper() or " ")
+    return int(float(match.group(1)) * 1024 ** power) or None
+
+
+def compress_payload(content: bytes) -> bytes:
+    """
+    Compresses a raw payload with `CACHE_COMPRESSION`.
+    """
+    if CACHE_COMPRESSION == "zstd":
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(content)
+    elif CACHE_COMPRESSION == "gzip":
+        return gzip.compress(content, compresslevel=GZIP_LEVEL)
+    return content
+
+
+def decompress_payload(value: bytes) -> bytes:
+    """
+    Returns the raw payload of a cached value,
+    detecting its compression from its first bytes.
+    """
+    if value[:2] == _GZIP_MAGIC:
+        return gzip.decompress(value)
+    elif value[:4] == _ZSTD_MAGIC:
+        if zstandard is None:
+            raise ModuleNotFoundError(
+                "This cached payload requires the `zstandard` package."
+            )
+        return zstandard.ZstdDecompressor().decompressobj().decompress(value)
+    return value
+
+
+def add_cache_arguments(parser):
+    """
+    Adds the `--cache_backend`, `--cache_compression`,
+    `--cache_max_size`, `--cache_pinned_seasons`,
+    and `--cache_stats_path` arguments to an `argparse` parser.
+    """
+    parser.add_argument(
+        "--cache_backend",
+        type=str,
+        required=False,
+        default=CACHE_BACKEND,
+        choices=list(CACHE_BACKENDS.keys()),
+        help="Where cached MiLB API payloads are stored.",
+    )
+    parser.add_argument(
+        "--cache_compression",
+        type=str,
+        required=False,
+        default=CACHE_COMPRESSION,
+        choices=["zstd", "gzip", "none"],
+        help="Compression applied to cached MiLB API payloads.",
+    )
+    parser.add_argument(
+        "--cache_max_size",
+        type=str,
+        required=False,
+        default=CACHE_MAX_SIZE,
+        help="Size cap of the cache, such as 500M or 2G. "
+        + "The least recently used payloads are evicted past it.",
+    )
+    parser.add_argument(
+        "--cache_pinned_seasons",
+        type=int,
+        nargs="*",
+        required=False,
+        default=list(PINNED_SEASONS),
+        help="Seasons whose cached payloads are never evicted.",
+    )
+    parser.add_argument(
+        "--cache_stats_path",
+        type=str,
+        required=False,
+        default=CACHE_STATS_PATH,
+        help="Optional JSON file the cache hits, misses, "
+        + "and bytes read of the run are saved to.",
+    )
+
+
+def configure_cache_from_args(args):
+    """
+    Applies the arguments added by `add_cache_arguments()`.
+    """
+    global CACHE_STATS_PATH
+
+    CACHE_STATS_PATH = args.cache_stats_path
+    configure_cache(
+        backend=args.cache_backend,
+        compression=args.cache_compression,
+        max_size=args.cache_max_size or 0,
+        pinned_seasons=args.cache_pinned_seasons
+    )
+
+
+def get_cache_path(cache_dir: str = "") -> str:
+    """
+    Returns the `.milb` cache folder inside `cache_dir`,
+    or inside the user's home directory if `cache_dir` is `""` or `None`.
+    """
+    if cache_dir == "" or cache_dir is None:
+        cache_dir = os.path.expanduser("~")
+
+    return f"{cache_dir}/.milb"
+
+
+def get_cache(cache_data: bool = False, cache_dir: str = ""):
+    """
+    Returns the cache backend used by a `get_*` function.
+
+    Parameters
+    ----------
+    `cache_data`: (bool, optional) = `False`:
+        The `cache_data` argument of the `get_*` function.
+
+    `cache_dir`: (str, optional) = `""`:
+        The `cache_dir` argument of the `get_*` function.
+
+    Returns
+    ----------
+    A `CacheBackend` for `get_cache_path(cache_dir)`,
+    shared with every other caller using the same folder,
+    or `None` if `cache_data` is not `True`.
+    If `CACHE_MAX_SIZE` is set, the backend is wrapped in a `BoundedCache`.
+    """
+    if cache_data is not True:
+        return None
+
+    cache_path = get_cache_path(cache_dir)
+    cache_key = (CACHE_BACKEND, cache_path)
+    max_size = parse_size(CACHE_MAX_SIZE)
+
+    with _caches_lock:
+        if cache_key not in _caches:
+            _caches[cache_key] = CACHE_BACKENDS[CACHE_BACKEND](cache_path)
+
+        if max_size is None:
+            return _caches[cache_key]
+
+        bounded_key = cache_key + (max_size, PINNED_SEASONS)
+        if bounded_key not in _caches:
+            _caches[bounded_key] = BoundedCache(
+                _caches[cache_key], max_size, PINNED_SEASONS
+            )
+        return _caches[bounded_key]
+
+
+def get_entry_season(
+    cache: CacheBackend, entry: CacheEntry, meta_namespaces: tuple = None
+):
+    """
+    Returns the season a cached payload belongs to,
+    or `None` if it can't be told.
+
+    Keys starting with a season (such as `2024_aaa_full`) are read as-is.
+    Game payloads (and frames keyed like `745123_v1`) are matched
+    to the date saved in the freshness tags of their game,
+    looked up in `meta_namespaces`
+    (by default, the tags namespace of the payload itself).
+    Tags are read without marking them as used or counting them
+    in the cache stats.
+    """
+    match = re.fullmatch(r"(\d{4})(_.*)?", entry.key)
+
+    if match is not None:
+        return int(match.group(1))
+
+    if meta_namespaces is None:
+        meta_namespaces = (get_meta_namespace(entry.namespace),)
+
+    game_id = entry.key.split("_")[0]
+
+    for meta_namespace in meta_namespaces:
+        value = cache.peek(meta_namespace, game_id)
+
+        if value is None:
+            continue
+
+        try:
+            tags = json.loads(decompress_payload(value))
+        except (ValueError, OSError, EOFError):
+            continue
+
+        if isinstance(tags, dict) and tags.get("official_date") is not None:
+            return int(tags["official_date"][:4])
+
+    return None
+
+
+def evict_cache(
+    cache: CacheBackend, max_size: int, pinned_seasons: tuple = ()
+) -> int:
+    """
+    Evicts the least recently used payloads from a cache,
+    until it's no larger than `max_size` bytes.
+
+    Parameters
+    ----------
+    `cache`: (CacheBackend, mandatory):
+        The cache backend to evict payloads from.
+
+    `max_size`: (int, mandatory):
+        The size (in bytes) the cache is shrunk to.
+
+    `pinned_seasons`: (tuple, optional) = `()`:
+        Seasons whose payloads are never evicted
+        (see `get_entry_season()`).
+        If these payloads alone are larger than `max_size`,
+        the cache is left larger than `max_size`.
+
+    Returns
+    ----------
+    The size of the cache (in bytes) after evictions.
+    """
+    entries = cache.entries()
+    sizes = {(e.namespace, e.key): e.size for e in entries}
+    size = sum(sizes.values())
+    evicted = 0
+
+    # Payloads without tags of their own (such as frames and lineups)
+    # are matched to the tags of their game in any other namespace.
+    game_meta_namespaces = {}
+    for e in entries:
+        if e.namespace.endswith("_meta"):
+            game_meta_namespaces.setdefault(e.key, []).append(e.namespace)
+
+    seasons = {}
+
+    def get_season(entry: CacheEntry):
+        game_id = entry.key.split("_")[0]
+
+        if game_id not in seasons:
+            own_namespace = get_meta_namespace(entry.namespace)
+            seasons[game_id] = get_entry_season(cache, entry, sorted(
+                game_meta_namespaces.get(game_id, ()),
+                key=lambda n: n != own_namespace
+            ))
+
+        return seasons[game_id]
+
+    # Freshness tags are evicted along with their payload.
+    payloads = sorted(
+        (e for e in entries if not e.namespace.endswith("_meta")),
+        key=lambda e: e.last_used
+    )
+
+    for entry in payloads:
+        if size <= max_size:
+            break
+        elif get_season(entry) in pinned_seasons:
+            continue
+
+        meta_namespace = get_meta_namespace(entry.namespace)
+        cache.delete(entry.namespace, entry.key)
+        cache.delete(meta_namespace, entry.key)
+
+        size -= entry.size + sizes.get((meta_namespace, entry.key), 0)
+        evicted += 1
+
+    if evicted > 0:
+        dead_size, total_size = cache.get_dead_size()
+
+        if dead_size > 0 and dead_size >= total_size * COMPACT_THRESHOLD:
+            cache.compact()
+
+        print(
+            f"Evicted {evicted} cached payloads "
+            + f"to keep the cache under {max_size / 1024 ** 2:.1f} MB."
+        )
+
+    return size
+
+
+class Freshness(NamedTuple):
+    """
+    Decides how long cached payloads stay fresh.
+
+    `get_tags`:
+        Function called with a downloaded (decoded) payload,
+        returning a `dict` of JSON-serializable tags
+        that are saved next to the cached payload.
+
+    `get_ttl`:
+        Function called with the saved tags,
+        plus `fetched_at` (the UNIX time the payload was downloaded,
+        or `None` for payloads cached before tags were saved).
+        Returns the number of seconds the payload stays fresh
+        after it was downloaded, or `None` if it never goes stale.
+    """
+    get_tags: Callable
+    get_ttl: Callable
+
+
+def get_meta_namespace(namespace: str) -> str:
+    """
+    Returns the namespace the freshness tags of `namespace` are saved in.
+    """
+    return f"{namespace}_meta"
+
+
+def record_cache_stats(namespace: str, **counts):
+    """
+    Adds `counts` (such as `hits=1` or `bytes_read=1024`)
+    to the cache stats of `namespace`.
+    Counts of `{namespace}_meta` are added to `namespace`.
+    """
+    if namespace.endswith("_meta"):
+        namespace = namespace[:-len("_meta")]
+
+    with _cache_stats_lock:
+        stats = _cache_stats.setdefault(namespace, {
+            "hits": 0,
+            "stale": 0,
+            "misses": 0,
+            "downloads": 0,
+            "fetch_seconds": 0.0,
+            "bytes_read": 0,
+            "bytes_written": 0,
+        })
+
+        for name, count in counts.items():
+            stats[name] = stats.get(name, 0) + count
+
+
+def get_cache_stats() -> dict:
+    """
+    Returns the cache stats of every namespace used so far:
+    - `hits`: Fresh payloads read from the cache.
+    - `stale`: Cached payloads that were too old to be used.
+    - `misses`: Payloads that weren't cached.
+    - `downloads`: Payloads downloaded by `get_or_fetch()`.
+    - `fetch_seconds`: Time spent downloading them.
+    - `bytes_read`: Bytes read from the cache (as stored).
+    - `bytes_written`: Bytes written to the cache (as stored).
+    - `parse_seconds`: Time spent parsing payloads
+        (for the namespaces of parsed frames, see `milb_frames`).
+    """
+    with _cache_stats_lock:
+        return {
+            namespace: dict(stats)
+            for namespace, stats in _cache_stats.items()
+        }
+
+
+def reset_cache_stats():
+    """
+    Clears the numbers returned by `get_cache_stats()`.
+    """
+    with _cache_stats_lock:
+        _cache_stats.clear()
+
+
+def print_cache_summary(stats_path: str = None):
+    """
+    Prints the numbers returned by `get_cache_stats()`,
+    and saves them to `stats_path` (or `CACHE_STATS_PATH`) if set.
+    """
+    cache_stats = get_cache_stats()
+
+    for namespace, stats in cache_stats.items():
+        lookups = stats["hits"] + stats["stale"] + stats["misses"]
+        hit_rate = stats["hits"] / lookups if lookups > 0 else 0
+        summary = (
+            f"\n`{namespace}` cache: {stats['hits']} hit(s), "
+            + f"{stats['stale']} stale, {stats['misses']} miss(es) "
+            + f"({hit_rate:.1%} hit rate), "
+            + f"{stats['downloads']} download(s) "
+            + f"in {stats['fetch_seconds']:.1f}s, "
+            + f"{stats['bytes_read'] / 1_000_000:.2f} MB read, "
+            + f"{stats['bytes_written'] / 1_000_000:.2f} MB written"
+        )
+
+        if "parse_seconds" in stats:
+            summary += f", {stats['parse_seconds']:.1f}s parsing"
+
+        print(summary + ".")
+
+    if stats_path is None:
+        stats_path = CACHE_STATS_PATH
+
+    if stats_path is not None and stats_path != "":
+        with open(stats_path, "w") as f:
+            json.dump(cache_stats, f, indent=4)
+
+
+def get_cached_json(cache: CacheBackend, namespace: str, key):
+    """
+    Returns the decoded JSON payload stored under `namespace` and `key`,
+    or `None` if `cache` is `None`,
+    nothing is stored there, or the stored payload can't be decoded.
+    """
+    if cache is None:
+        return None
+
+    value = cache.get(namespace, str(key))
+
+    if value is None:
+        return None
+
+    record_cache_stats(namespace, bytes_read=len(value))
+
+    try:
+        return json.loads(decompress_payload(value))
+    except (ValueError, OSError, EOFError):
+        # Corrupt or truncated payloads are downloaded again.
+        return None
+
+
+def get_fresh_json(
+    cache: CacheBackend, namespace: str, key, freshness: Freshness = None
+):
+    """
+    Returns the decoded JSON payload stored under `namespace` and `key`,
+    or `None` if `get_cached_json()` would return `None`,
+    or if the payload is stale according to `freshness`.
+    """
+    if cache is None:
+        return None
+
+    json_data = get_cached_json(cache, namespace, key)
+
+    if json_data is None:
+        record_cache_stats(namespace, misses=1)
+        return None
+    elif freshness is None:
+        record_cache_stats(namespace, hits=1)
+        return json_data
+
+    tags = get_cached_json(cache, get_meta_namespace(namespace), key)
+
+    if tags is None:
+        # Payloads cached before tags were saved.
+        tags = dict(freshness.get_tags(json_data), fetched_at=None)
+
+    if _is_fresh(tags, freshness) is True:
+        record_cache_stats(namespace, hits=1)
+        return json_data
+
+    record_cache_stats(namespace, stale=1)
+    return None
+
+
+def _is_fresh(tags: dict, freshness: Freshness) -> bool:
+    ttl = freshness.get_ttl(tags)
+
+    if ttl is None:
+        return True
+
+    return tags["fetched_at"] is not None and \
+        time.time() - tags["fetched_at"] < ttl
+
+
+def has_fresh_payload(
+    cache: CacheBackend, namespace: str, key, freshness: Freshness = None
+) -> bool:
+    """
+    Returns `True` if `get_fresh_json()` would return a payload.
+    Only the freshness tags of the payload are read (when saved),
+    so this is much cheaper than `get_fresh_json()`.
+    """
+    if cache is None:
+        return False
+    elif freshness is None:
+        return cache.get(namespace, str(key)) is not None
+
+    tags = get_cached_json(cache, get_meta_namespace(namespace), key)
+
+    if tags is None:
+        return get_fresh_json(cache, namespace, key, freshness) is not None
+
+    return _is_fresh(tags, freshness) and \
+        cache.get(namespace, str(key)) is not None
+
+
+def get_or_fetch(
+    cache: CacheBackend,
+    namespace: str,
+    key,
+    fetch_fn,
+    freshness: Freshness = None
+):
+    """
+    Returns a JSON payload from `cache`,
+    downloading (and caching) it if it isn't cached.
+
+    Parameters
+    ----------
+    `cache`: (CacheBackend, mandatory):
+        The cache backend returned by `get_cache()`.
+        If `None`, the payload is always downloaded, and not cached.
+
+    `namespace`: (str, mandatory):
+        The endpoint the payload comes from, such as `"pbp"`.
+
+    `key`: (mandatory):
+        The ID of the payload within `namespace`,
+        such as a game ID or a season.
+
+    `fetch_fn`: (function, mandatory):
+        Function called with no arguments to download the payload,
+        such as `partial(milb_http.get_payload, url)`.
+        Must return a tuple containing the raw payload as `bytes`,
+        and the decoded JSON payload.
+        The raw payload is cached as-is (after compression).
+
+    `freshness`: (Freshness, optional) = `None`:
+        Optional rule deciding how long the cached payload stays fresh.
+        If `None`, cached payloads never go stale.
+        In offline mode, stale payloads are used as-is.
+
+    Returns
+    ----------
+    The decoded JSON payload.
+    In offline mode, an `OfflineError` is raised
+    if the payload isn't cached.
+    """
+    json_data = get_fresh_json(cache, namespace, key, freshness)
+
+    if json_data is not None:
+        return json_data
+    elif is_offline() is True:
+        if freshness is not None:
+            json_data = get_cached_json(cache, namespace, key)
+
+        if json_data is not None:
+            return json_data
+
+        raise_offline_error(f"{namespace}/{key}")
+
+    fetched_at = time.time()
+    content, json_data = fetch_fn()
+    record_cache_stats(
+        namespace, downloads=1, fetch_seconds=time.time() - fetched_at
+    )
+
+    if cache is not None:
+        value = compress_payload(content)
+        cache.put(namespace, str(key), value)
+        record_cache_stats(namespace, bytes_written=len(value))
+
+        if freshness is not None:
+            tags = dict(freshness.get_tags(json_data), fetched_at=fetched_at)
+            value = json.dumps(tags).encode("utf-8")
+            cache.put(get_meta_namespace(namespace), str(key), value)
+            record_cache_stats(namespace, bytes_written=len(value))
+
+    return json_data
@@ -0,0 +1,404 @@
+"""
+Shared access to a MiLB game's `feed/live` document.
+
+`feed/live` is a multi-megabyte JSON document, but each dataset
+in this repository only reads a small part of it.
+Each dataset declares the parts it needs as a `FeedProjection`,
+and `get_game_feed()` requests just those parts from the API
+(unless the full document is already cached).
+
+Cached game payloads are tagged with the game's state,
+so games cached before they were final are downloaded again
+(see `get_game_state_ttl()`).
+"""
+import time
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import NamedTuple
+
+from milb_cache import (
+    CacheBackend,
+    Freshness,
+    get_cached_json,
+    get_fresh_json,
+    get_or_fetch,
+    has_fresh_payload
+)
+from milb_http import get_payload, is_offline, peek_payload
+
+FEED_LIVE_URL = "https://statsapi.mlb.com/api/v1.1/game/{game_id}/feed/live"
+BOXSCORE_URL = "https://statsapi.mlb.com/api/v1/game/{game_id}/boxscore"
+
+# Cache namespaces of full `feed/live` documents,
+# and of `boxscore` endpoint responses.
+FULL_FEED_NAMESPACE = "pbp"
+BOXSCORE_NAMESPACE = "boxscore"
+
+# If set to `False`, the full `feed/live` document
+# is always downloaded (and cached).
+LEAN_REQUESTS = True
+
+# Seconds a cached game payload stays fresh, by game state.
+LIVE_TTL = 60
+PREVIEW_TTL = 15 * 60
+UNSETTLED_TTL = 6 * 60 * 60
+
+# Stat corrections can trail the final out by a day or two,
+# so final games downloaded at least this many days after the game
+# are never downloaded again.
+FINAL_SETTLE_DAYS = 3
+
+# Postponed and suspended games are "Final" for the day,
+# but are often resumed under the same game ID.
+_UNSETTLED_STATES = ("Postponed", "Suspended")
+
+
+class FeedProjection(NamedTuple):
+    """
+    The parts of the `feed/live` document a dataset needs.
+
+    `name`:
+        Cache namespace lean payloads are stored in.
+
+    `fields`:
+        Dotted paths of every `feed/live` value the dataset reads.
+        These are sent to the API through its `fields=` parameter.
+
+    `boxscore`:
+        If `True`, `liveData.boxscore` is downloaded from
+        the lighter `boxscore` endpoint, and cached separately.
+    """
+    name: str
+    fields: tuple
+    boxscore: bool = False
+
+
+# Header values shared by the PBP and box score datasets.
+_GAME_HEADER_FIELDS = (
+    "gameData.game.type",
+    "gameData.status.abstractGameState",
+    "gameData.status.detailedState",
+    "gameData.datetime.officialDate",
+) + tuple(
+    f"gameData.teams.{side}.{field}"
+    for side in ("away", "home")
+    for field in (
+        "id",
+        "name",
+        "abbreviation",
+        "parentOrgId",
+        "parentOrgName",
+        "league.id",
+        "league.name",
+        "sport.id",
+        "sport.name",
+    )
+)
+
+_PITCH_COORDINATE_FIELDS = (
+    "x0", "y0", "z0", "pX", "pZ", "pfxX", "pfxZ",
+    "vX0", "vY0", "vZ0", "aX", "aY", "aZ",
+)
+
+PBP_PROJECTION = FeedProjection(
+    name="pbp_lean",
+    fields=_GAME_HEADER_FIELDS + tuple(
+        f"liveData.plays.allPlays.{field}"
+        for field in (
+            "atBatIndex",
+            "matchup.batter.id",
+            "matchup.pitcher.id",
+            "matchup.pitcher.fullName",
+            "matchup.batSide.code",
+            "matchup.pitchHand.code",
+            "matchup.postOnFirst.id",
+            "matchup.postOnSecond.id",
+            "matchup.postOnThird.id",
+            "result.event",
+            "result.description",
+            "result.awayScore",
+            "result.homeScore",
+            "about.inning",
+            "about.halfInning",
+            "playEvents.startTime",
+            "playEvents.endTime",
+            "playEvents.isPitch",
+            "playEvents.pitchNumber",
+            "playEvents.player.id",
+            "playEvents.position.code",
+            "playEvents.details.eventType",
+            "playEvents.details.description",
+            "playEvents.details.code",
+            "playEvents.details.isInPlay",
+            "playEvents.details.type.code",
+            "playEvents.details.type.description",
+            "playEvents.count.balls",
+            "playEvents.count.strikes",
+            "playEvents.count.outs",
+            "playEvents.pitchData.startSpeed",
+            "playEvents.pitchData.zone",
+            "playEvents.pitchData.extension",
+            "playEvents.pitchData.strikeZoneTop",
+            "playEvents.pitchData.strikeZoneBottom",
+            "playEvents.pitchData.breaks.spinDirection",
+            "playEvents.pitchData.breaks.spinRate",
+            "playEvents.hitData.location",
+            "playEvents.hitData.trajectory",
+            "playEvents.hitData.totalDistance",
+            "playEvents.hitData.launchSpeed",
+            "playEvents.hitData.launchAngle",
+            "playEvents.hitData.coordinates.coordX",
+            "playEvents.hitData.coordinates.coordY",
+        )
+    ) + tuple(
+        f"liveData.plays.allPlays.playEvents.pitchData.coordinates.{field}"
+        for field in _PITCH_COORDINATE_FIELDS
+    ),
+    # The starting lineups are read from the box score players,
+    # which `fields=` can't select (see `BOXSCORE_PROJECTION`),
+    # so each game takes a lean request and a `boxscore` request.
+    # The box score is shared with the player game stats dataset.
+    boxscore=True,
+)
+
+# Players are keyed by player ID (`ID123456`) in the box score,
+# which the `fields=` parameter can't express,
+# so the box score itself comes from the `boxscore` endpoint.
+# It's cached once, and shared by every projection that needs it.
+BOXSCORE_PROJECTION = FeedProjection(
+    name="boxscore_lean",
+    fields=_GAME_HEADER_FIELDS,
+    boxscore=True,
+)
+
+
+def set_lean_requests(lean_requests: bool):
+    """
+    Turns lean (projected) `feed/live` requests on or off.
+    """
+    global LEAN_REQUESTS
+
+    LEAN_REQUESTS = lean_requests
+
+
+def get_game_state_tags(json_data: dict) -> dict:
+    """
+    Returns the freshness tags of a `feed/live` payload.
+    """
+    game_data = json_data.get("gameData", {})
+
+    return {
+        "state": game_data.get("status", {}).get("abstractGameState"),
+        "detailed_state": game_data.get("status", {}).get("detailedState"),
+        "official_date": game_data.get("datetime", {}).get("officialDate"),
+    }
+
+
+def get_game_state_ttl(tags: dict):
+    """
+    Returns the number of seconds a cached game payload stays fresh,
+    or `None` if it never goes stale.
+
+    - Live games: `LIVE_TTL`.
+    - Preview games (or unknown states): `PREVIEW_TTL`.
+    - Postponed or suspended games: `UNSETTLED_TTL`.
+    - Final games: `UNSETTLED_TTL`, until downloaded
+        at least `FINAL_SETTLE_DAYS` after the game.
+        Final games cached before tags were saved are kept as-is.
+    """
+    detailed_state = tags.get("detailed_state") or ""
+
+    if tags.get("state") == "Live":
+        return LIVE_TTL
+    elif tags.get("state") != "Final":
+        return PREVIEW_TTL
+    elif detailed_state.startswith(_UNSETTLED_STATES):
+        return UNSETTLED_TTL
+    elif tags.get("fetched_at") is None or tags.get("official_date") is None:
+        return None
+
+    settled_at = datetime.strptime(
+        tags["official_date"], "%Y-%m-%d"
+    ).replace(tzinfo=timezone.utc) + timedelta(days=FINAL_SETTLE_DAYS)
+
+    if tags["fetched_at"] >= settled_at.timestamp():
+        return None
+
+    return UNSETTLED_TTL
+
+
+GAME_STATE_FRESHNESS = Freshness(
+    get_tags=get_game_state_tags, get_ttl=get_game_state_ttl
+)
+
+
+def is_game_settled(json_data: dict) -> bool:
+    """
+    Returns `True` if a fresh `feed/live` payload will never go stale,
+    so anything parsed from it can be cached for good.
+
+    A fresh payload of a game that isn't settled
+    was downloaded less than `UNSETTLED_TTL` seconds ago,
+    so the game is settled if it was already settled by then.
+    """
+    tags = get_game_state_tags(json_data)
+    tags["fetched_at"] = time.time() - UNSETTLED_TTL
+
+    return get_game_state_ttl(tags) is None
+
+
+def get_fields_param(fields: tuple) -> str:
+    """
+    Converts a set of dotted `feed/live` paths
+    into the value of the API's `fields=` parameter.
+
+    The API keeps a value if its key (and the key of every parent)
+    is listed in `fields=`, so every key of every path is listed once.
+    """
+    keys = []
+
+    for path in fields:
+        for key in path.split("."):
+            if key not in keys:
+                keys.append(key)
+
+    return ",".join(keys)
+
+
+def get_full_feed(game_id: int, cache: CacheBackend = None) -> dict:
+    """
+    Retrieves the full `feed/live` document for a MiLB game ID.
+    See `get_game_feed()` for a description of `cache`.
+    """
+    return get_or_fetch(
+        cache,
+        FULL_FEED_NAMESPACE,
+        game_id,
+        partial(get_payload, FEED_LIVE_URL.format(game_id=game_id)),
+        freshness=GAME_STATE_FRESHNESS
+    )
+
+
+def get_lean_feed(
+    game_id: int, projection: FeedProjection, cache: CacheBackend = None
+) -> dict:
+    """
+    Retrieves the parts of the `feed/live` document
+    declared in `projection` for a MiLB game ID.
+    See `get_game_feed()` for a description of `cache`.
+
+    Returns
+    ----------
+    A `dict` shaped like the `feed/live` document,
+    containing only the parts declared in `projection`.
+    """
+    json_data = get_or_fetch(
+        cache,
+        projection.name,
+        game_id,
+        partial(
+            get_payload,
+            FEED_LIVE_URL.format(game_id=game_id),
+            params={"fields": get_fields_param(projection.fields)}
+        ),
+        freshness=GAME_STATE_FRESHNESS
+    )
+
+    if projection.boxscore is True:
+        # The box score has no game state of its own,
+        # so it's tagged with the state of the lean payload.
+        tags = get_game_state_tags(json_data)
+
+        # Downloaded payloads are shared, so they're copied, not modified.
+        json_data = dict(json_data)
+        json_data["liveData"] = dict(json_data.get("liveData", {}))
+        json_data["liveData"]["boxscore"] = get_or_fetch(
+            cache,
+            BOXSCORE_NAMESPACE,
+            game_id,
+            partial(get_payload, BOXSCORE_URL.format(game_id=game_id)),
+            freshness=Freshness(
+                get_tags=lambda _: tags, get_ttl=get_game_state_ttl
+            )
+        )
+
+    return json_data
+
+
+def get_game_feed(
+    game_id: int, projection: FeedProjection, cache: CacheBackend = None
+) -> dict:
+    """
+    Retrieves the `feed/live` data a dataset needs for a MiLB game ID.
+
+    Parameters
+    ----------
+    `game_id`: (int, mandatory):
+        The MiLB game ID you want `feed/live` data from.
+
+    `projection`: (FeedProjection, mandatory):
+        The parts of the `feed/live` document the dataset needs.
+
+    `cache`: (CacheBackend, optional) = `None`:
+        Optional cache backend returned by `milb_cache.get_cache()`.
+        If set, a fresh cached full `feed/live` document is used if present,
+        followed by fresh cached lean payloads for `projection`.
+        Anything downloaded is saved to this cache.
+
+    Returns
+    ----------
+    A `dict` shaped like the `feed/live` document.
+    It contains at least the parts declared in `projection`.
+    This `dict` may be shared with other callers,
+    so it must not be modified.
+    """
+    json_data = get_fresh_json(
+        cache, FULL_FEED_NAMESPACE, game_id, GAME_STATE_FRESHNESS
+    )
+
+    if json_data is None and is_offline() is True:
+        # Stale payloads are used as-is while offline.
+        json_data = get_cached_json(cache, FULL_FEED_NAMESPACE, game_id)
+
+    if json_data is not None:
+        return json_data
+
+    # A full document downloaded earlier in this run
+    # covers every projection.
+    payload = peek_payload(FEED_LIVE_URL.format(game_id=game_id))
+
+    if payload is not None:
+        return get_or_fetch(
+            cache,
+            FULL_FEED_NAMESPACE,
+            game_id,
+            lambda: payload,
+            freshness=GAME_STATE_FRESHNESS
+        )
+    elif LEAN_REQUESTS is True:
+        return get_lean_feed(game_id, projection, cache=cache)
+    else:
+        return get_full_feed(game_id, cache=cache)
+
+
+def is_game_feed_cached(
+    cache: CacheBackend, game_id: int, projection: FeedProjection
+) -> bool:
+    """
+    Returns `True` if `get_game_feed()` can return the `feed/live` data
+    for `projection` from `cache`, without downloading anything.
+    """
+    if has_fresh_payload(
+        cache, FULL_FEED_NAMESPACE, game_id, GAME_STATE_FRESHNESS
+    ):
+        return True
+    elif LEAN_REQUESTS is False:
+        return False
+    elif not has_fresh_payload(
+        cache, projection.name, game_id, GAME_STATE_FRESHNESS
+    ):
+        return False
+
+    return projection.boxscore is False or has_fresh_payload(
+        cache, BOXSCORE_NAMESPACE, game_id, GAME_STATE_FRESHNESS
+    )
@@ -0,0 +1,244 @@
+"""
+Cache of the DataFrames parsed from each game's payloads.
+
+Once the payloads are cached, parsing them takes far longer
+than loading the DataFrames parsed from them.
+So once a game is settled (see `milb_feed.is_game_settled()`),
+each dataset's parsed DataFrame is cached as a Parquet file,
+in the same cache as the payloads, under `{dataset}_frames`.
+
+Frames are keyed by game ID and by the version of the parser
+that produced them, so bumping a dataset's parser version
+(whenever its parser's output changes) re-parses every game.
+
+Parquet files require the `pyarrow` package.
+If it isn't installed, every game is parsed from its payloads.
+"""
+import time
+from importlib.util import find_spec
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from milb_cache import CacheBackend, record_cache_stats
+
+# If set to `True`, cached frames are ignored (but still replaced),
+# so every game is parsed from its payloads.
+REPARSE = False
+
+FRAMES_ENABLED = find_spec("pyarrow") is not None
+
+# Parquet columns have a single type, so `object` columns
+# (which can mix strings, numbers, and `None`)
+# are stored as text, and restored to `object` columns when loaded.
+# Their values are stored as `str(value)`,
+# so saved CSV files are the same either way.
+_TEXT_COLUMNS_ATTR = "milb_text_columns"
+
+
+def set_reparse(reparse: bool):
+    """
+    Turns re-parsing every game (ignoring cached frames) on or off.
+    """
+    global REPARSE
+
+    REPARSE = reparse
+
+
+def get_frame_key(key, parser_version: int) -> str:
+    """
+    Returns the cache key of a frame, such as `745123_v1`.
+    """
+    return f"{key}_v{parser_version}"
+
+
+def _to_text(value):
+    if pd.api.types.is_scalar(value) and pd.isna(value):
+        return None
+    return str(value)
+
+
+def build_frame(rows: list) -> pd.DataFrame:
+    """
+    Builds a `DataFrame` from a list of row `dict`s,
+    in a single pass over each column.
+    Columns are ordered as they're first seen,
+    and keys missing from a row are `NaN` in that row.
+
+    Columns are typed like the old one-row-`DataFrame`-per-row parsers:
+    a column keeps its inferred type if every value has the same type
+    (or if they're all numbers), and is an `object` column
+    (with `NaN` in place of `None`) otherwise,
+    so saved CSV files don't change (`1`, not `1.0`).
+    """
+    if len(rows) == 0:
+        return pd.DataFrame()
+
+    # `dict` keys keep their insertion order.
+    column_names = {}
+    for row in rows:
+        column_names.update(dict.fromkeys(row))
+
+    columns = {}
+
+    for column in column_names:
+        values = [row.get(column, np.nan) for row in rows]
+        types = set(type(row[column]) for row in rows if column in row)
+
+        if types <= {int, float} or (
+            len(types) == 1 and type(None) not in types
+        ):
+            columns[column] = pd.Series(values)
+        else:
+            columns[column] = pd.Series(
+                [np.nan if value is None else value for value in values],
+                dtype=object
+            )
+
+    return pd.DataFrame(columns)
+
+
+def get_cached_frame(
+    cache: CacheBackend, namespace: str, key, parser_version: int
+):
+    """
+    Returns the frame stored under `namespace` and `key`
+    by `parser_version`, or `None` if `cache` is `None`,
+    nothing is stored there, or the stored frame can't be read.
+    """
+    if cache is None or FRAMES_ENABLED is False or REPARSE is True:
+        return None
+
+    value = cache.get(namespace, get_frame_key(key, parser_version))
+
+    if value is None:
+        record_cache_stats(namespace, misses=1)
+        return None
+
+    try:
+        df = pd.read_parquet(BytesIO(value))
+    except Exception:
+        # Corrupt or truncated frames are parsed again.
+        record_cache_stats(namespace, misses=1)
+        return None
+
+    record_cache_stats(namespace, hits=1, bytes_read=len(value))
+
+    for column in df.attrs.pop(_TEXT_COLUMNS_ATTR, []):
+        df[column] = df[column].astype(object)
+
+    return df
+
+
+def put_frame(
+    cache: CacheBackend,
+    namespace: str,
+    key,
+    parser_version: int,
+    df: pd.DataFrame
+):
+    """
+    Stores `df` under `namespace` and `key` for `parser_version`.
+    Frames that can't be stored as Parquet files are skipped.
+    """
+    if cache is None or FRAMES_ENABLED is False:
+        return
+
+    text_columns = [c for c in df.columns if df[c].dtype == object]
+    df = df.copy()
+
+    for column in text_columns:
+        df[column] = df[column].map(_to_text)
+
+    df.attrs[_TEXT_COLUMNS_ATTR] = text_columns
+    buffer = BytesIO()
+
+    try:
+        df.to_parquet(buffer, index=False)
+    except (ValueError, TypeError):
+        # Such as column names Parquet can't store.
+        return
+
+    value = buffer.getvalue()
+    cache.put(namespace, get_frame_key(key, parser_version), value)
+    record_cache_stats(namespace, bytes_written=len(value))
+
+
+def parse_payload(
+    cache: CacheBackend,
+    namespace: str,
+    key,
+    parser_version: int,
+    payload,
+    parse_fn,
+    is_settled
+) -> pd.DataFrame:
+    """
+    Parses a game's payloads with `parse_fn`,
+    and caches the parsed frame if `is_settled(payload)` is `True`.
+    See `get_or_parse()` for a description of the parameters.
+    """
+    started_at = time.time()
+    df = parse_fn(payload)
+    record_cache_stats(namespace, parse_seconds=time.time() - started_at)
+
+    if is_settled(payload) is True and len(df) > 0:
+        put_frame(cache, namespace, key, parser_version, df)
+
+    return df
+
+
+def get_or_parse(
+    cache: CacheBackend,
+    namespace: str,
+    key,
+    parser_version: int,
+    load_fn,
+    parse_fn,
+    is_settled
+) -> pd.DataFrame:
+    """
+    Returns a game's parsed frame from `cache`,
+    loading and parsing its payloads if the frame isn't cached.
+
+    Parameters
+    ----------
+    `cache`: (CacheBackend, mandatory):
+        The cache backend returned by `milb_cache.get_cache()`.
+        If `None`, the payloads are always loaded and parsed.
+
+    `namespace`: (str, mandatory):
+        The namespace the dataset's frames are cached in,
+        such as `"pbp_frames"`.
+
+    `key`: (mandatory):
+        The game ID.
+
+    `parser_version`: (int, mandatory):
+        The version of the dataset's parser.
+
+    `load_fn`: (function, mandatory):
+        Function called with no arguments to load the game's payloads.
+
+    `parse_fn`: (function, mandatory):
+        Function called with the loaded payloads,
+        returning the parsed `DataFrame`.
+
+    `is_settled`: (function, mandatory):
+        Function called with the loaded payloads,
+        returning `True` if they will never change again.
+        Frames are only cached for settled games.
+
+    Returns
+    ----------
+    The parsed `DataFrame`.
+    """
+    df = get_cached_frame(cache, namespace, key, parser_version)
+
+    if df is not None:
+        return df
+
+    return parse_payload(
+        cache, namespace, key, parser_version, load_fn(), parse_fn, is_settled
+    )
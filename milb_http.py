@@ -0,0 +1,1085 @@
+"""
+Shared HTTP client for the MiLB data scripts.
+
+Every request made to the MLB Stats API (`statsapi.mlb.com`)
+and to the MiLB stats/schedule service (`bdfed.stitch.mlbinfra.com`)
+is routed through a single `requests.Session`,
+so TCP/TLS connections are kept alive and reused between calls
+instead of being re-established for every game, season or team.
+
+In offline mode (`set_offline()`, `--offline`,
+or the `MILB_OFFLINE` environment variable),
+no request is ever sent: everything must come from the cache
+(see `milb_cache.get_or_fetch()`) or from local CSV files,
+and whatever is missing is reported by `raise_for_offline_misses()`.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from importlib.util import find_spec
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+STATSAPI_HOST = "statsapi.mlb.com"
+BDFED_HOST = "bdfed.stitch.mlbinfra.com"
+
+# Maximum number of open connections kept (and used at once) per host.
+HOST_POOL_LIMITS = {
+    STATSAPI_HOST: 10,
+    BDFED_HOST: 4,
+}
+DEFAULT_POOL_LIMIT = 4
+
+# Steady-state requests per second allowed to each host,
+# and the number of requests that can be sent back-to-back
+# before that rate kicks in.
+HOST_RATE_LIMITS = {
+    STATSAPI_HOST: (5.0, 10),
+    BDFED_HOST: (10.0, 10),
+}
+
+# HTTP status codes that mean "slow down".
+THROTTLE_STATUS_CODES = (429, 503)
+
+# Number of times a request is retried after a transient error,
+# and the bounds (in seconds) of the exponential backoff between retries.
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+# HTTP status codes that are worth retrying.
+# HTTP 403 is not: the API is refusing this client,
+# so it's left to the circuit breaker to pause every request.
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Number of failed requests in a row (across every worker)
+# that pauses all requests to the MiLB API,
+# and the number of seconds that pause lasts (doubling every time
+# the API is still refusing connections once the pause ends).
+CIRCUIT_BREAKER_THRESHOLD = 5
+CIRCUIT_BREAKER_COOLDOWN = 30.0
+CIRCUIT_BREAKER_MAX_COOLDOWN = 300.0
+
+# Default number of payloads downloaded at the same time
+# by `fetch_concurrently()`.
+MAX_CONCURRENCY = 8
+
+# Seconds to wait when opening a connection,
+# and seconds to wait between bytes sent by the server.
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 60
+
+# Optional base URL of a local stand-in API server (see `milb_replay.py`).
+# If set, `https://{host}{path}` is requested as
+# `{API_OVERRIDE}/{host}{path}` instead.
+API_OVERRIDE = os.environ.get("MILB_API_OVERRIDE")
+
+# Optional fixture folder. If set, every successful response is saved
+# to this folder, so it can be replayed by `milb_replay.py`.
+RECORD_DIR = os.environ.get("MILB_RECORD_DIR")
+
+# Values of boolean environment variables (compared in lowercase).
+_TRUE_VALUES = ("1", "true", "yes", "on")
+_FALSE_VALUES = ("", "0", "false", "no", "off")
+
+
+def _get_bool_env(name: str) -> bool:
+    value = os.environ.get(name, "").strip().lower()
+
+    if value in _TRUE_VALUES:
+        return True
+    elif value in _FALSE_VALUES:
+        return False
+
+    raise ValueError(
+        f"Unhandled value for the `{name}` environment variable:\n\t{value}"
+        + f"\nSupported values:\t{', '.join(_TRUE_VALUES + _FALSE_VALUES[1:])}"
+    )
+
+
+# If set to `True`, no request is ever sent,
+# and `OfflineError` is raised instead.
+OFFLINE = _get_bool_env("MILB_OFFLINE")
+
+# Number of recent payloads kept in memory by `get_payload()`,
+# so back-to-back requests for the same URL share one download.
+RECENT_JSON_LIMIT = 16
+
+# Compressed encodings accepted from the server.
+# Brotli can only be decoded if `brotli` (or `brotlicffi`) is installed.
+if find_spec("brotli") is not None or find_spec("brotlicffi") is not None:
+    ACCEPT_ENCODING = "br, gzip, deflate"
+else:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_4) "
+    + "AppleWebKit/537.36 (KHTML, like Gecko) "
+    + "Chrome/83.0.4103.97 Safari/537.36",
+    "Accept-Encoding": ACCEPT_ENCODING,
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+_transfer_stats = {}
+_transfer_stats_lock = threading.Lock()
+
+_in_flight = {}
+_recent_payloads = OrderedDict()
+_single_flight_lock = threading.Lock()
+
+_offline_misses = []
+_offline_misses_lock = threading.Lock()
+
+
+class OfflineError(ConnectionError):
+    """
+    Raised instead of sending a request while offline mode is on.
+    """
+
+
+class RateLimiter:
+    """
+    Adaptive token bucket used to pace the requests sent to a single host.
+
+    Up to `burst` requests can be sent back-to-back,
+    after which requests are paced to `rate` requests per second.
+    When the host answers with a "slow down" status code
+    (HTTP 429 or HTTP 503), the rate is halved.
+    Every healthy response afterwards nudges the rate back up,
+    until it reaches the configured rate again.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        if rate <= 0:
+            raise ValueError("`rate` must be greater than 0.")
+        if burst < 1:
+            raise ValueError("`burst` must be greater than 0.")
+
+        self.max_rate = float(rate)
+        self.min_rate = self.max_rate / 32
+        self.rate = self.max_rate
+        self.burst = burst
+
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst,
+            self._tokens + ((now - self._updated) * self.rate)
+        )
+        self._updated = now
+
+    def acquire(self):
+        """
+        Blocks until a request can be sent to this host.
+        """
+        while True:
+            with self._lock:
+                self._refill()
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait_time = (1 - self._tokens) / self.rate
+
+            time.sleep(wait_time)
+
+    def slow_down(self, retry_after: float = None):
+        """
+        Halves the current rate, and empties the bucket.
+        If the host sent a `Retry-After` header, no requests are
+        allowed until that many seconds have passed.
+        """
+        with self._lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0)
+
+            if retry_after is not None and retry_after > 0:
+                self._tokens = min(self._tokens, -(retry_after * self.rate))
+
+    def speed_up(self):
+        """
+        Raises the current rate by a small step,
+        up to the configured rate.
+        """
+        if self.rate >= self.max_rate:
+            return
+
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + (self.max_rate / 20))
+
+
+class CircuitBreaker:
+    """
+    Pauses every request sent through the shared client
+    once the MiLB API starts refusing connections.
+
+    After `threshold` failed requests in a row, the breaker "opens",
+    and every worker waits `cooldown` seconds before trying again.
+    A successful request "closes" the breaker.
+    If requests are still failing once the pause ends,
+    the next pause is twice as long (up to `max_cooldown` seconds).
+    """
+
+    def __init__(
+        self,
+        threshold: int = CIRCUIT_BREAKER_THRESHOLD,
+        cooldown: float = CIRCUIT_BREAKER_COOLDOWN,
+        max_cooldown: float = CIRCUIT_BREAKER_MAX_COOLDOWN
+    ):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+
+        self._failures = 0
+        self._next_cooldown = cooldown
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """
+        Blocks while the breaker is open.
+        """
+        while True:
+            with self._lock:
+                wait_time = self._open_until - time.monotonic()
+
+            if wait_time <= 0:
+                return
+
+            time.sleep(wait_time)
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._next_cooldown = self.cooldown
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+
+            if self._failures < self.threshold:
+                return
+
+            now = time.monotonic()
+            if self._open_until > now:
+                # Another worker already opened the breaker.
+                return
+
+            print(
+                "\nThe MiLB API is refusing connections. " +
+                f"Pausing all requests for {self._next_cooldown:.0f} seconds."
+            )
+            self._open_until = now + self._next_cooldown
+            self._next_cooldown = min(
+                self.max_cooldown, self._next_cooldown * 2
+            )
+            self._failures = 0
+
+
+_circuit_breaker = CircuitBreaker()
+
+
+def get_rate_limiter(host: str):
+    """
+    Returns the `RateLimiter` used for `host`,
+    or `None` if requests to `host` are not rate limited.
+    """
+    if host not in HOST_RATE_LIMITS:
+        return None
+
+    if host not in _rate_limiters:
+        with _rate_limiters_lock:
+            if host not in _rate_limiters:
+                rate, burst = HOST_RATE_LIMITS[host]
+                _rate_limiters[host] = RateLimiter(rate, burst)
+
+    return _rate_limiters[host]
+
+
+def configure_rate_limits(rate: float = None, burst: int = None, host=None):
+    """
+    Changes the rate limits used by the shared client.
+
+    Parameters
+    ----------
+    `rate`: (float, optional) = `None`:
+        Optional number of requests per second allowed to a host.
+
+    `burst`: (int, optional) = `None`:
+        Optional number of requests that can be sent back-to-back
+        to a host before `rate` kicks in.
+
+    `host`: (str, optional) = `None`:
+        Optional host name these limits apply to.
+        If not set, these limits apply to every rate limited host.
+    """
+    hosts = list(HOST_RATE_LIMITS.keys()) if host is None else [host]
+
+    with _rate_limiters_lock:
+        for h in hosts:
+            old_rate, old_burst = HOST_RATE_LIMITS.get(h, (1.0, 1))
+            HOST_RATE_LIMITS[h] = (
+                old_rate if rate is None else rate,
+                old_burst if burst is None else burst
+            )
+            _rate_limiters.pop(h, None)
+
+
+def add_rate_limit_arguments(parser):
+    """
+    Adds the `--rate_limit`, `--burst`, and `--offline` arguments
+    to an `argparse.ArgumentParser` object.
+    """
+    parser.add_argument(
+        "--rate_limit",
+        type=float,
+        required=False,
+        help="Optional argument. " +
+        "The maximum number of requests per second sent to the MiLB API.",
+    )
+    parser.add_argument(
+        "--burst",
+        type=int,
+        required=False,
+        help="Optional argument. " +
+        "The number of requests that can be sent back-to-back " +
+        "before `--rate_limit` kicks in.",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        default=OFFLINE,
+        help="Never send a request to the MiLB API. " +
+        "Every payload must already be cached.",
+    )
+
+
+def configure_rate_limits_from_args(args):
+    """
+    Applies the `--rate_limit`, `--burst`, and `--offline` arguments
+    added by `add_rate_limit_arguments()`.
+    """
+    set_offline(args.offline)
+
+    if args.rate_limit is not None or args.burst is not None:
+        configure_rate_limits(rate=args.rate_limit, burst=args.burst)
+
+
+def _get_retry_after(response: requests.Response):
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    session.headers.update(HEADERS)
+
+    for host, pool_limit in HOST_POOL_LIMITS.items():
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_limit,
+            pool_block=True
+        )
+        session.mount(f"https://{host}", adapter)
+        session.mount(f"http://{host}", adapter)
+
+    # Anything else (GitHub release downloads, mirrors, etc.).
+    default_adapter = HTTPAdapter(
+        pool_maxsize=DEFAULT_POOL_LIMIT,
+        pool_block=True
+    )
+    session.mount("https://", default_adapter)
+    session.mount("http://", default_adapter)
+
+    if API_OVERRIDE is not None:
+        # Every host shares the stand-in server's connection pool.
+        session.mount(
+            API_OVERRIDE,
+            HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=sum(HOST_POOL_LIMITS.values()),
+                pool_block=True
+            )
+        )
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the module-level `requests.Session` shared by every script
+    in this repository, creating it on first use.
+    """
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def configure_client(
+    pool_limits: dict = None,
+    connect_timeout: float = None,
+    read_timeout: float = None
+):
+    """
+    Changes the connection pool sizes and/or timeouts
+    used by the shared client.
+
+    Parameters
+    ----------
+    `pool_limits`: (dict, optional) = `None`:
+        Optional mapping of host name to the maximum number of
+        connections kept open to that host.
+
+    `connect_timeout`: (float, optional) = `None`:
+        Optional number of seconds to wait when opening a connection.
+
+    `read_timeout`: (float, optional) = `None`:
+        Optional number of seconds to wait for the server to send data.
+    """
+    global CONNECT_TIMEOUT, READ_TIMEOUT
+
+    if pool_limits is not None:
+        HOST_POOL_LIMITS.update(pool_limits)
+
+    if connect_timeout is not None:
+        CONNECT_TIMEOUT = connect_timeout
+
+    if read_timeout is not None:
+        READ_TIMEOUT = read_timeout
+
+    # Pool sizes are fixed when an adapter is created,
+    # so the next request gets a fresh session.
+    close_client()
+
+
+def close_client():
+    """
+    Closes every pooled connection held by the shared client.
+    """
+    global _session
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def get_host(url: str) -> str:
+    """
+    Returns the host name of `url`.
+    """
+    return urlsplit(url).hostname
+
+
+def set_api_override(base_url: str = None):
+    """
+    Sends every request to a local stand-in API server
+    (see `milb_replay.py`) at `base_url`,
+    or to the real APIs again if `base_url` is `None`.
+    """
+    global API_OVERRIDE
+
+    if base_url is not None:
+        base_url = base_url.rstrip("/")
+
+    API_OVERRIDE = base_url
+    close_client()
+
+
+def set_record_dir(record_dir: str = None):
+    """
+    Saves every successful response to `record_dir`,
+    so it can be replayed by `milb_replay.py`.
+    Recording stops if `record_dir` is `None`.
+    """
+    global RECORD_DIR
+
+    RECORD_DIR = record_dir
+
+
+def set_offline(offline: bool):
+    """
+    Turns offline mode on or off.
+    """
+    global OFFLINE
+
+    OFFLINE = offline
+
+
+def is_offline() -> bool:
+    """
+    Returns `True` if offline mode is on.
+    """
+    return OFFLINE
+
+
+def raise_offline_error(key: str):
+    """
+    Records `key` (a cache key, URL, or file path)
+    as missing while offline, and raises an `OfflineError`.
+    """
+    with _offline_misses_lock:
+        if key not in _offline_misses:
+            _offline_misses.append(key)
+
+    raise OfflineError(
+        f"Offline mode is on, and this isn't cached:\n\t{key}"
+    )
+
+
+def get_offline_misses() -> list:
+    """
+    Returns everything `raise_offline_error()` was called with,
+    in the order it was first missed.
+    """
+    with _offline_misses_lock:
+        return list(_offline_misses)
+
+
+def reset_offline_misses():
+    """
+    Clears the list returned by `get_offline_misses()`.
+    """
+    with _offline_misses_lock:
+        _offline_misses.clear()
+
+
+def raise_for_offline_misses():
+    """
+    Raises an `OfflineError` listing every missing key,
+    if anything was missed while offline.
+    """
+    misses = get_offline_misses()
+
+    if len(misses) == 0:
+        return
+
+    raise OfflineError(
+        f"{len(misses)} payload(s) could not be loaded while offline:\n\t"
+        + "\n\t".join(misses)
+    )
+
+
+def get_fixture_key(url: str, params: dict = None) -> str:
+    """
+    Returns the name a response to this request is recorded under.
+    """
+    canonical_url = get_canonical_url(url, params)
+    return hashlib.sha1(canonical_url.encode("utf-8")).hexdigest()
+
+
+def _get_override_url(url: str) -> str:
+    parts = urlsplit(url)
+    override_url = f"{API_OVERRIDE}/{parts.netloc}{parts.path}"
+
+    if parts.query:
+        override_url += f"?{parts.query}"
+    return override_url
+
+
+def _record_fixture(
+    url: str, params: dict, response: requests.Response, content: bytes
+):
+    key = get_fixture_key(url, params)
+    os.makedirs(RECORD_DIR, exist_ok=True)
+
+    # The body is written first, so a fixture is only
+    # picked up for replay once both files exist.
+    with open(f"{RECORD_DIR}/{key}.body", "wb") as f:
+        f.write(content)
+
+    with open(f"{RECORD_DIR}/{key}.json", "w+") as f:
+        f.write(
+            json.dumps(
+                {
+                    "url": get_canonical_url(url, params),
+                    "status_code": response.status_code,
+                    "content_type": response.headers.get(
+                        "Content-Type", "application/json"
+                    ),
+                    "recorded": datetime.now().isoformat(timespec="seconds"),
+                },
+                indent=2
+            )
+        )
+
+
+def _send(url: str, params: dict = None) -> requests.Response:
+    rate_limiter = get_rate_limiter(get_host(url))
+
+    if rate_limiter is not None:
+        rate_limiter.acquire()
+
+    if API_OVERRIDE is None:
+        request_url = url
+    else:
+        request_url = _get_override_url(url)
+
+    response = get_session().get(
+        request_url,
+        params=params,
+        timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+        stream=True
+    )
+
+    # Reading `response.content` decompresses the body chunk by chunk
+    # as it comes off the wire, while `raw.tell()` counts the
+    # (still compressed) bytes pulled from the connection.
+    content = response.content
+    _record_transfer(
+        get_host(url),
+        wire_bytes=response.raw.tell(),
+        decoded_bytes=len(content)
+    )
+
+    if rate_limiter is not None:
+        if response.status_code in THROTTLE_STATUS_CODES:
+            rate_limiter.slow_down(_get_retry_after(response))
+        elif response.status_code == 200:
+            rate_limiter.speed_up()
+
+    if RECORD_DIR is not None and response.status_code == 200:
+        _record_fixture(url, params, response, content)
+
+    return response
+
+
+def _record_transfer(host: str, wire_bytes: int, decoded_bytes: int):
+    with _transfer_stats_lock:
+        if host not in _transfer_stats:
+            _transfer_stats[host] = {
+                "requests": 0,
+                "wire_bytes": 0,
+                "decoded_bytes": 0,
+            }
+
+        _transfer_stats[host]["requests"] += 1
+        _transfer_stats[host]["wire_bytes"] += wire_bytes
+        _transfer_stats[host]["decoded_bytes"] += decoded_bytes
+
+
+def get_transfer_stats() -> dict:
+    """
+    Returns the number of requests, the number of bytes received
+    over the wire, and the number of bytes those responses decoded to,
+    for every host contacted through the shared client.
+    """
+    with _transfer_stats_lock:
+        return {
+            host: dict(stats) for host, stats in _transfer_stats.items()
+        }
+
+
+def reset_transfer_stats():
+    """
+    Clears the numbers returned by `get_transfer_stats()`.
+    """
+    with _transfer_stats_lock:
+        _transfer_stats.clear()
+
+
+def print_transfer_summary():
+    """
+    Prints the numbers returned by `get_transfer_stats()`.
+    """
+    for host, stats in get_transfer_stats().items():
+        wire_mb = stats["wire_bytes"] / 1_000_000
+        decoded_mb = stats["decoded_bytes"] / 1_000_000
+
+        if stats["decoded_bytes"] > 0:
+            ratio = stats["wire_bytes"] / stats["decoded_bytes"]
+        else:
+            ratio = 1
+
+        print(
+            f"\n{host}: {stats['requests']} request(s), " +
+            f"{wire_mb:.2f} MB on the wire, " +
+            f"{decoded_mb:.2f} MB decoded " +
+            f"({ratio:.1%} of the decoded size)."
+        )
+
+
+def _get_backoff(attempt: int, retry_after: float = None) -> float:
+    # "Full jitter" exponential backoff,
+    # so workers that failed together don't retry together.
+    backoff = random.uniform(
+        0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+    )
+
+    if retry_after is not None:
+        backoff = max(backoff, retry_after)
+
+    return backoff
+
+
+def get_response(
+    url: str,
+    params: dict = None,
+    max_retries: int = None
+) -> requests.Response:
+    """
+    Sends a GET request through the shared client,
+    after waiting for the rate limiter of the URL's host.
+    Transient errors (dropped connections, timeouts,
+    and HTTP 429, 500, 502, 503 and 504 responses)
+    are retried with exponential backoff.
+    HTTP 403 responses are not retried, but like server errors,
+    they count towards the circuit breaker.
+
+    Parameters
+    ----------
+    `url`: (str, mandatory):
+        The URL you want to request.
+
+    `params`: (dict, optional) = `None`:
+        Optional query string parameters to add to `url`.
+
+    `max_retries`: (int, optional) = `None`:
+        Optional number of times a transient error is retried.
+        If not set, `MAX_RETRIES` is used.
+
+    Returns
+    ----------
+    A `requests.Response` object with a HTTP 200 status code.
+    If the API answers with HTTP 403, a `ConnectionRefusedError`
+    is raised right away.
+    If every attempt fails, a `ConnectionError` is raised.
+    In offline mode, an `OfflineError` is raised right away.
+    """
+    if OFFLINE is True:
+        raise_offline_error(get_canonical_url(url, params))
+
+    if max_retries is None:
+        max_retries = MAX_RETRIES
+
+    for attempt in range(max_retries + 1):
+        _circuit_breaker.wait()
+        retry_after = None
+
+        try:
+            response = _send(url, params=params)
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout
+        ) as e:
+            _circuit_breaker.record_failure()
+            error = ConnectionError(
+                "Could not establish a connection to the MiLB API."
+                + f"\nReason:\t{e}"
+            )
+        else:
+            if response.status_code == 200:
+                _circuit_breaker.record_success()
+                return response
+            elif response.status_code == 403:
+                _circuit_breaker.record_failure()
+                raise ConnectionRefusedError(
+                    "The MiLB API is actively refusing your connection."
+                    + "\nHTTP Error Code:\t403"
+                )
+            else:
+                error = ConnectionError(
+                    "Could not establish a connection to the MiLB API."
+                    + f"\nHTTP Error Code:\t{response.status_code}"
+                )
+
+                if response.status_code in THROTTLE_STATUS_CODES or \
+                        response.status_code >= 500:
+                    # The API is throttling us, or is down.
+                    _circuit_breaker.record_failure()
+
+                if response.status_code not in RETRY_STATUS_CODES:
+                    raise error
+
+                if response.status_code in THROTTLE_STATUS_CODES:
+                    retry_after = _get_retry_after(response)
+
+        if attempt < max_retries:
+            time.sleep(_get_backoff(attempt, retry_after))
+
+    raise error
+
+
+def get_canonical_url(url: str, params: dict = None) -> str:
+    """
+    Returns `url` with `params` merged into its query string,
+    and every query parameter sorted,
+    so equivalent requests have the same URL.
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+
+    if params is not None:
+        query += [(str(k), str(v)) for k, v in params.items()]
+
+    query.sort()
+    return urlunsplit(
+        (parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), "")
+    )
+
+
+def get_payload(url: str, params: dict = None) -> tuple:
+    """
+    Sends a GET request through the shared client,
+    and returns the body of the response.
+
+    Requests are single-flight, and keyed by `get_canonical_url()`.
+    If the same URL is already being downloaded by another thread,
+    this waits for that download instead of sending another request.
+    The last `RECENT_JSON_LIMIT` payloads are also reused as-is.
+
+    Returns
+    ----------
+    A tuple containing the raw (decompressed) body as `bytes`,
+    and the decoded JSON body.
+    The decoded JSON body may be shared with other callers,
+    so it must not be modified.
+    """
+    key = get_canonical_url(url, params)
+
+    with _single_flight_lock:
+        if key in _recent_payloads:
+            _recent_payloads.move_to_end(key)
+            return _recent_payloads[key]
+
+        future = _in_flight.get(key)
+        if future is None:
+            is_owner = True
+            future = Future()
+            _in_flight[key] = future
+        else:
+            is_owner = False
+
+    if is_owner is False:
+        return future.result()
+
+    try:
+        content = get_response(url, params=params).content
+        payload = (content, json.loads(content))
+    except BaseException as e:
+        with _single_flight_lock:
+            _in_flight.pop(key, None)
+        future.set_exception(e)
+        raise
+
+    with _single_flight_lock:
+        _in_flight.pop(key, None)
+
+        if RECENT_JSON_LIMIT > 0:
+            _recent_payloads[key] = payload
+            while len(_recent_payloads) > RECENT_JSON_LIMIT:
+                _recent_payloads.popitem(last=False)
+
+    future.set_result(payload)
+    return payload
+
+
+def get_json(url: str, params: dict = None):
+    """
+    Sends a GET request through the shared client,
+    and returns the decoded JSON body of the response.
+    See `get_payload()` for how requests are shared between callers.
+
+    The returned object may be shared with other callers,
+    so it must not be modified.
+    """
+    return get_payload(url, params=params)[1]
+
+
+def peek_payload(url: str, params: dict = None):
+    """
+    Returns the recent payload of `url` kept by `get_payload()`,
+    or `None` if it isn't in memory.
+    Never sends a request.
+    """
+    key = get_canonical_url(url, params)
+
+    with _single_flight_lock:
+        return _recent_payloads.get(key)
+
+
+def clear_recent_json():
+    """
+    Drops every recent payload kept by `get_payload()`.
+    """
+    with _single_flight_lock:
+        _recent_payloads.clear()
+
+
+class FailureManifest:
+    """
+    Keeps track of the keys (usually MiLB game IDs)
+    that could not be downloaded or parsed during a run,
+    so they can be re-queued later.
+    """
+
+    def __init__(self):
+        self.failures = {}
+
+    def __len__(self):
+        return len(self.failures)
+
+    def add(self, key, error: Exception):
+        self.failures[key] = f"{type(error).__name__}: {error}"
+
+    def remove(self, key):
+        self.failures.pop(key, None)
+
+    def keys(self) -> list:
+        return list(self.failures.keys())
+
+    def save(self, path: str):
+        """
+        Saves this manifest as a JSON file.
+        """
+        manifest = {
+            "created": datetime.now().isoformat(),
+            "failures": [
+                # NumPy integers (from `DataFrame` columns)
+                # can't be serialized as JSON.
+                {"key": key.item() if hasattr(key, "item") else key,
+                 "error": error}
+                for key, error in self.failures.items()
+            ]
+        }
+
+        with open(path, "w+") as f:
+            f.write(json.dumps(manifest, indent=2))
+
+    @staticmethod
+    def load_keys(path: str) -> list:
+        """
+        Returns the keys recorded in a manifest saved by `save()`.
+        """
+        with open(path, "r") as f:
+            manifest = json.loads(f.read())
+
+        return [i["key"] for i in manifest["failures"]]
+
+
+async def _fetch_all(keys, fetch_fn, max_concurrency: int):
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    async def fetch(key):
+        async with semaphore:
+            try:
+                payload = await loop.run_in_executor(executor, fetch_fn, key)
+            except Exception as e:
+                return key, None, e
+            return key, payload, None
+
+    with executor:
+        tasks = [asyncio.ensure_future(fetch(key)) for key in keys]
+
+        for task in asyncio.as_completed(tasks):
+            yield await task
+
+
+async def _fetch_passes(
+    keys, fetch_fn, handle_fn, max_concurrency: int, requeue_passes: int
+):
+    for i in range(requeue_passes + 1):
+        failed_keys = []
+        last_pass = i == requeue_passes
+
+        async for key, payload, error in _fetch_all(
+            keys, fetch_fn, max_concurrency
+        ):
+            if error is not None and not last_pass and \
+                    not isinstance(error, OfflineError):
+                # Offline misses would only be missed again.
+                failed_keys.append(key)
+            else:
+                handle_fn(key, payload, error)
+
+        if len(failed_keys) == 0:
+            return
+
+        print(
+            f"\nRe-queueing {len(failed_keys)} key(s) " +
+            "that could not be downloaded."
+        )
+        keys = failed_keys
+
+
+def fetch_concurrently(
+    keys,
+    fetch_fn,
+    handle_fn,
+    max_concurrency: int = None,
+    requeue_passes: int = 1
+):
+    """
+    Downloads the payloads for many keys (usually MiLB game IDs)
+    at the same time, and hands each payload off as soon as it arrives.
+
+    Parameters
+    ----------
+    `keys`: (iterable, mandatory):
+        The keys you want payloads for.
+
+    `fetch_fn`: (callable, mandatory):
+        Function that takes a single key, and returns the payload
+        for that key. This function is called from worker threads.
+
+    `handle_fn`: (callable, mandatory):
+        Function called as `handle_fn(key, payload, error)`
+        once the payload for a key is ready.
+        `error` is `None` if `fetch_fn` was successful,
+        otherwise it's the exception raised by `fetch_fn`
+        (and `payload` is `None`).
+        This function is always called from the calling thread,
+        one key at a time, in the order the payloads arrive.
+
+    `max_concurrency`: (int, optional) = `None`:
+        Optional maximum number of payloads downloaded at the same time.
+        If not set, `MAX_CONCURRENCY` is used.
+
+    `requeue_passes`: (int, optional) = `1`:
+        Optional number of extra passes made over the keys
+        that could not be downloaded, once every other key is done.
+        `handle_fn` is only called with an error
+        after the last pass for that key fails.
+    """
+    if max_concurrency is None:
+        max_concurrency = MAX_CONCURRENCY
+
+    if max_concurrency < 1:
+        raise ValueError("`max_concurrency` must be greater than 0.")
+
+    asyncio.run(
+        _fetch_passes(
+            list(keys),
+            fetch_fn,
+            handle_fn,
+            max_concurrency,
+            requeue_passes
+        )
+    )
@@ -0,0 +1,276 @@
+"""
+Fills the cache ahead of a run, so the PBP and player game stats scripts
+only have to parse cached payloads.
+
+    python milb_prefetch.py --seasons 2024 --levels aaa aa \\
+        --datasets pbp player_game_stats --cache_dir D:/
+
+The final games of each season and level are read from the schedule CSVs,
+and only the games missing from the cache
+(or cached before they were final) are downloaded,
+under the same rate limits as every other script.
+A prefetch can also run in the background of another script
+with `start_prefetch()`.
+"""
+import argparse
+import threading
+
+from tqdm import tqdm
+
+from get_milb_pbp import PBP_FRAMES_NAMESPACE, PBP_PARSER_VERSION
+from get_milb_player_game_stats import (
+    PLAYER_GAME_STATS_FRAMES_NAMESPACE,
+    PLAYER_GAME_STATS_PARSER_VERSION
+)
+from get_milb_schedule import load_milb_schedule
+from milb_cache import (
+    CacheBackend,
+    add_cache_arguments,
+    configure_cache_from_args,
+    get_cache,
+    print_cache_summary
+)
+from milb_feed import (
+    BOXSCORE_PROJECTION,
+    PBP_PROJECTION,
+    get_game_feed,
+    is_game_feed_cached,
+    set_lean_requests
+)
+from milb_frames import get_frame_key
+from milb_http import (
+    MAX_CONCURRENCY,
+    FailureManifest,
+    add_rate_limit_arguments,
+    configure_rate_limits_from_args,
+    fetch_concurrently,
+    print_transfer_summary
+)
+
+# The `feed/live` projection, frames namespace,
+# and parser version of each dataset that can be prefetched.
+PREFETCH_DATASETS = {
+    "pbp": (PBP_PROJECTION, PBP_FRAMES_NAMESPACE, PBP_PARSER_VERSION),
+    "player_game_stats": (
+        BOXSCORE_PROJECTION,
+        PLAYER_GAME_STATS_FRAMES_NAMESPACE,
+        PLAYER_GAME_STATS_PARSER_VERSION
+    ),
+}
+
+
+def get_final_game_ids(
+    seasons: list, levels: list, months: list = None
+) -> list:
+    """
+    Returns the IDs of every final game in the schedule CSVs
+    of `seasons` and `levels`,
+    optionally limited to the games played in `months`.
+    """
+    game_ids = []
+
+    for season in seasons:
+        for level in levels:
+            sched_df = load_milb_schedule(season, level)
+            sched_df = sched_df[
+                sched_df["status_abstract_game_state"] == "Final"
+            ]
+
+            if months is not None and len(months) > 0:
+                sched_df = sched_df[sched_df["game_month"].isin(months)]
+
+            game_ids += sched_df["game_pk"].to_list()
+
+    # Keeps the schedule order, without duplicate games.
+    return list(dict.fromkeys(game_ids))
+
+
+def get_missing_game_ids(
+    cache: CacheBackend, game_ids: list, datasets: list
+) -> list:
+    """
+    Returns the game IDs in `game_ids` that would need to be downloaded
+    by at least one of `datasets`:
+    games without a cached frame nor fresh cached payloads.
+    """
+    frame_keys = {
+        dataset: set(cache.keys(PREFETCH_DATASETS[dataset][1]))
+        for dataset in datasets
+    }
+    missing_ids = []
+
+    for game_id in game_ids:
+        for dataset in datasets:
+            projection, _, parser_version = PREFETCH_DATASETS[dataset]
+
+            if get_frame_key(game_id, parser_version) in frame_keys[dataset]:
+                continue
+            elif is_game_feed_cached(cache, game_id, projection):
+                continue
+
+            missing_ids.append(game_id)
+            break
+
+    return missing_ids
+
+
+def prefetch_games(
+    seasons: list,
+    levels: list,
+    datasets: list = None,
+    months: list = None,
+    cache_dir: str = "",
+    max_concurrency: int = MAX_CONCURRENCY,
+    show_progress: bool = True
+) -> FailureManifest:
+    """
+    Downloads the payloads of every final game missing from the cache.
+
+    Parameters
+    ----------
+    `seasons`: (list, mandatory):
+        The seasons you want to prefetch games from.
+
+    `levels`: (list, mandatory):
+        The MiLB levels you want to prefetch games from,
+        as accepted by `load_milb_schedule()`.
+
+    `datasets`: (list, optional) = `None`:
+        Optional keys of `PREFETCH_DATASETS`.
+        If not set, the payloads of every dataset are prefetched.
+
+    `months`: (list, optional) = `None`:
+        Optional months to limit the prefetch to.
+
+    `cache_dir`: (str, optional) = `""`:
+        The `cache_dir` the PBP and player game stats scripts will use.
+
+    `max_concurrency`: (int, optional) = `MAX_CONCURRENCY`:
+        The maximum number of games downloaded at the same time.
+
+    `show_progress`: (bool, optional) = `True`:
+        If set to `False`, no progress bar is shown.
+
+    Returns
+    ----------
+    A `FailureManifest` of the games that could not be downloaded.
+    """
+    if datasets is None or len(datasets) == 0:
+        datasets = list(PREFETCH_DATASETS.keys())
+
+    for dataset in datasets:
+        if dataset not in PREFETCH_DATASETS:
+            raise ValueError(
+                f"Unhandled prefetch dataset:\n\t{dataset}\n"
+                + "Supported datasets:\t"
+                + ", ".join(PREFETCH_DATASETS.keys())
+            )
+
+    cache = get_cache(cache_data=True, cache_dir=cache_dir)
+    game_ids = get_final_game_ids(seasons, levels, months=months)
+    missing_ids = get_missing_game_ids(cache, game_ids, datasets)
+    failures = FailureManifest()
+
+    print(
+        f"{len(missing_ids)} of {len(game_ids)} final games "
+        + "are missing from the cache."
+    )
+
+    def fetch_game(game_id):
+        for dataset in datasets:
+            get_game_feed(game_id, PREFETCH_DATASETS[dataset][0], cache=cache)
+
+    progress = tqdm(total=len(missing_ids), disable=not show_progress)
+
+    def handle_game(game_id, payload, error):
+        progress.update(1)
+
+        if error is not None:
+            failures.add(game_id, error)
+
+    fetch_concurrently(
+        missing_ids,
+        fetch_game,
+        handle_game,
+        max_concurrency=max_concurrency
+    )
+    progress.close()
+
+    if len(failures) > 0:
+        print(f"Could not prefetch {len(failures)} game(s).")
+
+    return failures
+
+
+def start_prefetch(*args, **kwargs) -> threading.Thread:
+    """
+    Runs `prefetch_games()` in a background thread,
+    and returns the thread.
+    Takes the same parameters as `prefetch_games()`,
+    except for `show_progress`.
+    """
+    kwargs["show_progress"] = False
+    thread = threading.Thread(
+        target=prefetch_games, args=args, kwargs=kwargs, daemon=True
+    )
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seasons", type=int, nargs="+", required=True)
+    parser.add_argument("--levels", type=str, nargs="+", required=True)
+    parser.add_argument(
+        "--datasets",
+        type=str,
+        nargs="*",
+        required=False,
+        default=list(PREFETCH_DATASETS.keys()),
+        choices=list(PREFETCH_DATASETS.keys()),
+    )
+    parser.add_argument(
+        "--months", type=int, nargs="*", required=False, default=None
+    )
+    parser.add_argument("--cache_dir", type=str, required=False, default="")
+    parser.add_argument(
+        "--max_concurrency",
+        type=int,
+        required=False,
+        default=MAX_CONCURRENCY,
+        help="The maximum number of games downloaded at the same time.",
+    )
+    parser.add_argument(
+        "--full_feed",
+        action="store_true",
+        help="Download the full `feed/live` document for each game, "
+        + "instead of only the parts used by the scripts."
+    )
+    parser.add_argument(
+        "--failures_path",
+        type=str,
+        required=False,
+        help="Optional JSON file the games that could not be prefetched "
+        + "are saved to."
+    )
+    add_rate_limit_arguments(parser)
+    add_cache_arguments(parser)
+    args = parser.parse_args()
+    configure_rate_limits_from_args(args)
+    configure_cache_from_args(args)
+    set_lean_requests(not args.full_feed)
+
+    failures = prefetch_games(
+        args.seasons,
+        args.levels,
+        datasets=args.datasets,
+        months=args.months,
+        cache_dir=args.cache_dir,
+        max_concurrency=args.max_concurrency
+    )
+
+    if args.failures_path is not None and len(failures) > 0:
+        failures.save(args.failures_path)
+
+    print_transfer_summary()
+    print_cache_summary()
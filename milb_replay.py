@@ -0,0 +1,364 @@
+"""
+Records real MiLB API responses to a fixture folder,
+and replays them from a local stand-in API server,
+so the fetch engine and every `get_*` function
+can be tested and benchmarked on a disconnected machine.
+
+Recording:
+    python milb_replay.py record --fixture_dir fixtures \\
+        --seasons 2024 --game_ids 745123 745124
+
+    Any script can also be recorded by setting `MILB_RECORD_DIR`:
+    MILB_RECORD_DIR=fixtures python get_milb_pbp.py --level aaa
+
+Replaying:
+    python milb_replay.py serve --fixture_dir fixtures --port 8750 \\
+        --latency 0.05 --error_rate 0.01 --throttle_rate 0.01
+
+    MILB_API_OVERRIDE=http://127.0.0.1:8750 python get_milb_pbp.py \\
+        --level aaa
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from get_milb_pbp import get_milb_game_pbp
+from get_milb_player_game_stats import get_milb_player_game_stats
+from get_milb_schedule import get_milb_schedule
+from get_milb_teams import get_milb_team_list
+from milb_http import get_fixture_key, set_record_dir
+
+DEFAULT_PORT = 8750
+
+
+class FixtureStore:
+    """
+    The recorded responses in a fixture folder,
+    loaded into memory so disk reads don't skew benchmarks.
+    """
+
+    def __init__(self, fixture_dir: str):
+        self.fixtures = {}
+        self._gzip_bodies = {}
+        self._gzip_lock = threading.Lock()
+
+        for file in os.listdir(fixture_dir):
+            if not file.endswith(".json"):
+                continue
+
+            key = file[:-len(".json")]
+            try:
+                with open(f"{fixture_dir}/{file}", "r") as f:
+                    meta = json.loads(f.read())
+
+                with open(f"{fixture_dir}/{key}.body", "rb") as f:
+                    body = f.read()
+            except Exception as e:
+                print(f"Skipping fixture {key}.\nReason:\t{e}")
+                continue
+
+            self.fixtures[key] = (meta["content_type"], body)
+
+    def __len__(self):
+        return len(self.fixtures)
+
+    def get(self, key: str, use_gzip: bool = False):
+        """
+        Returns the content type and body of a recorded response,
+        or `None` if nothing was recorded under `key`.
+        """
+        try:
+            content_type, body = self.fixtures[key]
+        except KeyError:
+            return None
+
+        if use_gzip is False:
+            return content_type, body
+
+        with self._gzip_lock:
+            if key not in self._gzip_bodies:
+                self._gzip_bodies[key] = gzip.compress(body, compresslevel=6)
+            return content_type, self._gzip_bodies[key]
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """
+    Answers `GET /{host}{path}?{query}`
+    with the response recorded for `https://{host}{path}?{query}`.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.latency + server.random.uniform(0, server.jitter))
+
+        roll = server.random.random()
+        if roll < server.throttle_rate:
+            self._send_error(
+                429, {"Retry-After": f"{server.retry_after:g}"}
+            )
+            return
+        elif roll < server.throttle_rate + server.error_rate:
+            self._send_error(500)
+            return
+
+        key = get_fixture_key(f"https:/{self.path}")
+        use_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+        fixture = server.store.get(key, use_gzip=use_gzip)
+
+        if fixture is None:
+            self._send_error(404)
+            return
+
+        content_type, body = fixture
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if use_gzip is True:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status_code: int, headers: dict = None):
+        body = json.dumps({"status_code": status_code}).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose is True:
+            super().log_message(format, *args)
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """
+    Local stand-in for `statsapi.mlb.com` and `bdfed.stitch.mlbinfra.com`.
+    See `start_replay_server()` for a description of the parameters.
+    """
+    daemon_threads = True
+
+    def __init__(
+        self,
+        store: FixtureStore,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: int = None,
+        verbose: bool = False
+    ):
+        super().__init__((host, port), ReplayHandler)
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.verbose = verbose
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_replay_server(
+    fixture_dir: str,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    throttle_rate: float = 0.0,
+    retry_after: float = 1.0,
+    seed: int = None,
+    verbose: bool = False
+) -> ReplayServer:
+    """
+    Starts a local stand-in API server in a background thread.
+
+    Parameters
+    ----------
+    `fixture_dir`: (str, mandatory):
+        The folder responses were recorded to.
+
+    `host`: (str, optional) = `"127.0.0.1"`:
+        The address the server listens on.
+
+    `port`: (int, optional) = `8750`:
+        The port the server listens on.
+        If set to `0`, a free port is picked.
+
+    `latency`: (float, optional) = `0.0`:
+        Seconds added before every response.
+
+    `jitter`: (float, optional) = `0.0`:
+        Up to this many extra seconds are randomly added
+        before every response.
+
+    `error_rate`: (float, optional) = `0.0`:
+        Share of requests (between `0.0` and `1.0`)
+        answered with an HTTP 500 error.
+
+    `throttle_rate`: (float, optional) = `0.0`:
+        Share of requests (between `0.0` and `1.0`)
+        answered with an HTTP 429 error.
+
+    `retry_after`: (float, optional) = `1.0`:
+        `Retry-After` header sent with HTTP 429 errors.
+
+    `seed`: (int, optional) = `None`:
+        Optional random seed, so injected delays and errors
+        are reproducible between runs.
+
+    `verbose`: (bool, optional) = `False`:
+        If set to `True`, every request is logged.
+
+    Returns
+    ----------
+    The running `ReplayServer`.
+    Point the scripts at it with `set_api_override(server.base_url)`,
+    or the `MILB_API_OVERRIDE` environment variable,
+    and stop it with `server.shutdown()`.
+    """
+    store = FixtureStore(fixture_dir)
+    server = ReplayServer(
+        store,
+        host=host,
+        port=port,
+        latency=latency,
+        jitter=jitter,
+        error_rate=error_rate,
+        throttle_rate=throttle_rate,
+        retry_after=retry_after,
+        seed=seed,
+        verbose=verbose
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def record_fixtures(
+    fixture_dir: str,
+    seasons: list = None,
+    game_ids: list = None
+):
+    """
+    Records the responses needed to replay a set of seasons and games.
+
+    Parameters
+    ----------
+    `fixture_dir`: (str, mandatory):
+        The folder responses are recorded to.
+
+    `seasons`: (list, optional) = `None`:
+        Seasons to record the schedule and team list of.
+
+    `game_ids`: (list, optional) = `None`:
+        MiLB game IDs to record the PBP and box score data of.
+    """
+    set_record_dir(fixture_dir)
+
+    try:
+        for season in seasons or []:
+            print(f"Recording the {season} schedule and team list.")
+            get_milb_schedule(season, "all")
+            get_milb_team_list(season, save=False)
+
+        for game_id in game_ids or []:
+            print(f"Recording game ID {game_id}.")
+            get_milb_game_pbp(game_id)
+            get_milb_player_game_stats(game_id)
+    finally:
+        set_record_dir(None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser(
+        "record",
+        help="Record real API responses to a fixture folder."
+    )
+    record_parser.add_argument("--fixture_dir", type=str, required=True)
+    record_parser.add_argument(
+        "--seasons", type=int, nargs="*", required=False, default=[]
+    )
+    record_parser.add_argument(
+        "--game_ids", type=int, nargs="*", required=False, default=[]
+    )
+
+    serve_parser = subparsers.add_parser(
+        "serve",
+        help="Replay a fixture folder from a local stand-in API server."
+    )
+    serve_parser.add_argument("--fixture_dir", type=str, required=True)
+    serve_parser.add_argument(
+        "--host", type=str, required=False, default="127.0.0.1"
+    )
+    serve_parser.add_argument(
+        "--port", type=int, required=False, default=DEFAULT_PORT
+    )
+    serve_parser.add_argument(
+        "--latency", type=float, required=False, default=0.0
+    )
+    serve_parser.add_argument(
+        "--jitter", type=float, required=False, default=0.0
+    )
+    serve_parser.add_argument(
+        "--error_rate", type=float, required=False, default=0.0
+    )
+    serve_parser.add_argument(
+        "--throttle_rate", type=float, required=False, default=0.0
+    )
+    serve_parser.add_argument(
+        "--retry_after", type=float, required=False, default=1.0
+    )
+    serve_parser.add_argument("--seed", type=int, required=False)
+    serve_parser.add_argument("--verbose", action="store_true")
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record_fixtures(
+            args.fixture_dir, seasons=args.seasons, game_ids=args.game_ids
+        )
+    elif args.command == "serve":
+        server = start_replay_server(
+            args.fixture_dir,
+            host=args.host,
+            port=args.port,
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            throttle_rate=args.throttle_rate,
+            retry_after=args.retry_after,
+            seed=args.seed,
+            verbose=args.verbose
+        )
+        print(
+            f"Replaying {len(server.store)} recorded responses "
+            + f"at {server.base_url}"
+            + f"\nSet MILB_API_OVERRIDE={server.base_url} to use them."
+        )
+
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            server.shutdown()